@@ -0,0 +1,236 @@
+"""
+Chunked Energy Yield Engine
+
+This module evaluates long weather histories (e.g. a year of 1-minute
+data) through the vectorized panel and array models:
+- Fixed-size chunks, so memory is bounded by the chunk size
+- Maximum power point power for every interval of every chunk
+- Running energy aggregates and per-period energy totals
+
+Author: Energy Yield Engine
+Date: 2026-10-18
+"""
+
+import numpy as np
+from typing import Iterable, Iterator, Optional, Tuple
+from simulation_io import open_series
+
+
+def array_chunks(temperature, irradiance, chunk_size: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Split temperature and irradiance series into fixed-size chunks
+
+    Only one chunk is materialized at a time, so the inputs may be
+    memory-mapped arrays larger than the available memory.
+
+    Parameters:
+    -----------
+    temperature : array_like, float or str
+        Cell temperature series (°C), a constant, or the path of a .npy or
+        raw float64 file to memory-map
+    irradiance : array_like or str
+        Solar irradiance series (W/m²) or the path of a file to memory-map
+    chunk_size : int
+        Number of intervals per chunk
+
+    Yields:
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        Temperature and irradiance of one chunk
+    """
+    temperature = open_series(temperature)
+    irradiance = open_series(irradiance)
+
+    n = len(irradiance)
+    constant_temperature = np.ndim(temperature) == 0
+
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        G = np.asarray(irradiance[start:stop], dtype=float)
+        if constant_temperature:
+            T = np.full(G.shape, float(temperature))
+        else:
+            T = np.asarray(temperature[start:stop], dtype=float)
+        yield T, G
+
+
+class EnergyYieldEngine:
+    """
+    Streaming energy yield calculation on top of SolarPanel/SolarArray
+
+    Each chunk of weather data is evaluated with one call to the model's
+    ``find_mpp_batch``; only running aggregates are kept between chunks.
+    """
+
+    def __init__(self, model, dt: float = 60.0, chunk_size: int = 10080,
+                 tol: float = 1e-3):
+        """
+        Initialize Energy Yield Engine
+
+        Parameters:
+        -----------
+        model : SolarPanel or SolarArray
+            Model providing ``find_mpp_batch``
+        dt : float
+            Length of one weather interval (s)
+        chunk_size : int
+            Number of intervals evaluated per chunk (default: one week of
+            1-minute data)
+        tol : float
+            Voltage tolerance of the MPP search (V)
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        self.model = model
+        self.dt = dt
+        self.chunk_size = chunk_size
+        self.tol = tol
+        self.reset()
+
+    def reset(self):
+        """Reset running aggregates"""
+        self.n_intervals = 0
+        self.energy = 0.0          # Wh
+        self.peak_power = 0.0      # W
+        self.producing_intervals = 0
+
+    def iter_results(self, chunks: Iterable[Tuple[np.ndarray, np.ndarray]]) -> Iterator[dict]:
+        """
+        Evaluate a stream of weather chunks
+
+        Parameters:
+        -----------
+        chunks : iterable of (temperature, irradiance) arrays
+            Weather data, one chunk per item, e.g. from ``array_chunks``
+            or a chunked file reader
+
+        Yields:
+        -------
+        dict
+            Per-interval MPP voltage, current and power of the chunk, the
+            chunk energy and the running aggregates
+        """
+        for T, G in chunks:
+            T = np.asarray(T, dtype=float)
+            G = np.asarray(G, dtype=float)
+
+            v_mpp, i_mpp, p_mpp = self.model.find_mpp_batch(T, G, self.tol)
+            p_mpp = np.asarray(p_mpp)
+
+            start = self.n_intervals
+            chunk_energy = float(np.sum(p_mpp)) * self.dt / 3600.0
+
+            self.n_intervals += p_mpp.size
+            self.energy += chunk_energy
+            if p_mpp.size:
+                self.peak_power = max(self.peak_power, float(np.max(p_mpp)))
+            self.producing_intervals += int(np.count_nonzero(p_mpp > 0))
+
+            yield {
+                'start': start,
+                'v_mpp': v_mpp,
+                'i_mpp': i_mpp,
+                'p_mpp': p_mpp,
+                'energy': chunk_energy,
+                'cumulative_energy': self.energy,
+            }
+
+    def iter_arrays(self, temperature, irradiance) -> Iterator[dict]:
+        """
+        Evaluate temperature and irradiance series chunk by chunk
+
+        Parameters:
+        -----------
+        temperature : array_like, float or str
+            Cell temperature series (°C), a constant or a file path
+        irradiance : array_like or str
+            Solar irradiance series (W/m²) or a file path
+
+        Yields:
+        -------
+        dict
+            Chunk results, see ``iter_results``
+        """
+        return self.iter_results(array_chunks(temperature, irradiance, self.chunk_size))
+
+    def run(self, temperature, irradiance=None,
+            period: Optional[int] = None) -> dict:
+        """
+        Compute the energy yield of a whole weather history
+
+        Parameters:
+        -----------
+        temperature : array_like, float or iterable of chunks
+            Cell temperature series (°C) or a constant; if ``irradiance``
+            is None, an iterable of (temperature, irradiance) chunks
+        irradiance : array_like or str, optional
+            Solar irradiance series (W/m²) or a file path
+        period : int, optional
+            Number of intervals per reporting period (e.g. 1440 for daily
+            totals of 1-minute data)
+
+        Returns:
+        --------
+        dict
+            Total energy (Wh), mean and peak power (W), number of intervals,
+            producing hours and, with ``period``, the energy per period (Wh)
+        """
+        self.reset()
+
+        if irradiance is None:
+            results = self.iter_results(temperature)
+        else:
+            results = self.iter_arrays(temperature, irradiance)
+
+        period_energy = np.zeros(0)
+        for chunk in results:
+            if period is None:
+                continue
+
+            # Add interval energies to their periods; periods may span chunks
+            p = chunk['p_mpp'].ravel()
+            idx = (chunk['start'] + np.arange(p.size)) // period
+            needed = int(idx[-1]) + 1 if p.size else 0
+            if needed > period_energy.size:
+                period_energy = np.concatenate(
+                    [period_energy, np.zeros(needed - period_energy.size)])
+            np.add.at(period_energy, idx, p * self.dt / 3600.0)
+
+        summary = {
+            'energy': self.energy,
+            'mean_power': self.energy * 3600.0 / (self.n_intervals * self.dt)
+                          if self.n_intervals else 0.0,
+            'peak_power': self.peak_power,
+            'n_intervals': self.n_intervals,
+            'producing_hours': self.producing_intervals * self.dt / 3600.0,
+        }
+        if period is not None:
+            summary['period_energy'] = period_energy
+
+        return summary
+
+
+if __name__ == "__main__":
+    # Example usage: one synthetic year of 1-minute data
+    from solar_panel import SolarArray, create_standard_panel
+
+    print("Energy Yield Engine")
+    print("=" * 50)
+
+    minutes = np.arange(365 * 1440)
+    hour = (minutes % 1440) / 60.0
+    day = minutes // 1440
+
+    season = 0.75 + 0.25 * np.cos(2 * np.pi * (day - 172) / 365.0)
+    irradiance = np.clip(1000.0 * season * np.sin(np.pi * (hour - 6.0) / 12.0), 0, None)
+    temperature = 15.0 + 0.03 * irradiance
+
+    array = SolarArray(create_standard_panel('generic'), N_series=4, N_parallel=3)
+    engine = EnergyYieldEngine(array, dt=60.0)
+    summary = engine.run(temperature, irradiance, period=1440)
+
+    print(f"\nAnnual energy: {summary['energy'] / 1000:.1f} kWh")
+    print(f"Peak power: {summary['peak_power']:.1f} W")
+    print(f"Best day: {summary['period_energy'].max() / 1000:.2f} kWh")
+    print(f"Worst day: {summary['period_energy'].min() / 1000:.2f} kWh")
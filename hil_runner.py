@@ -0,0 +1,461 @@
+"""
+Soft Real-Time Hardware-in-the-Loop Runner
+
+This module drives an MPPT controller from a fixed-rate loop, the way it
+would run on a power stage, and accounts for timing:
+- Plants: the SolarPanel model, or a power stage behind a TCP socket
+- Local socket stand-in server serving the panel model
+- Per-tick wake-up latency, jitter, deadline misses and skipped ticks
+- Histogram of controller update cost
+
+Author: HIL Runner
+Date: 2026-10-18
+"""
+
+import socket
+import struct
+import threading
+import time
+import numpy as np
+from typing import Optional, Tuple
+from mppt_simulation import BoostConverter
+
+
+# Socket protocol: the client sends the duty cycle, the plant answers with
+# the PV voltage and current, all little-endian float64
+_REQUEST = struct.Struct('<d')
+_RESPONSE = struct.Struct('<dd')
+
+# Update cost histogram bin edges (µs)
+COST_BINS_US = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, np.inf)
+
+
+class ModelPlant:
+    """
+    PV panel behind the simulator's boost converter model
+
+    Conditions may be constants or functions of the plant time, which
+    advances by ``dt`` per step. The cell temperature of the last step is
+    kept in ``last_temperature`` for model-based controllers.
+    """
+
+    def __init__(self, panel, temperature=25.0, irradiance=1000.0,
+                 dt: float = 1e-3, converter: Optional[BoostConverter] = None):
+        """
+        Initialize Model Plant
+
+        Parameters:
+        -----------
+        panel : SolarPanel, SolarArray or ShadedSolarArray
+            Solar panel or array model
+        temperature : float or callable
+            Cell temperature (°C), constant or function of time
+        irradiance : float or callable
+            Solar irradiance (W/m²), constant or function of time
+        dt : float
+            Plant time advanced per step (s)
+        converter : BoostConverter, optional
+            Converter model mapping duty cycle to PV voltage
+        """
+        self.panel = panel
+        self.temperature = temperature
+        self.irradiance = irradiance
+        self.dt = dt
+        self.converter = BoostConverter() if converter is None else converter
+        self.reset()
+
+    def reset(self):
+        """Restart plant time and the warm start"""
+        self.t = 0.0
+        self._last_current = None
+        self.last_temperature = None
+
+    def step(self, duty_cycle: float) -> Tuple[float, float]:
+        """
+        Apply a duty cycle and measure the PV operating point
+
+        Parameters:
+        -----------
+        duty_cycle : float
+            Converter duty cycle (0-1)
+
+        Returns:
+        --------
+        Tuple[float, float]
+            PV voltage (V) and current (A)
+        """
+        T = self.temperature(self.t) if callable(self.temperature) else self.temperature
+        G = self.irradiance(self.t) if callable(self.irradiance) else self.irradiance
+
+        voltage = self.converter.get_input_voltage(duty_cycle, self.panel.V_oc)
+        current = self.panel.get_current(voltage, T, G, initial_guess=self._last_current)
+        self._last_current = current
+        self.last_temperature = T
+        self.t += self.dt
+
+        return voltage, current
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    """Receive exactly ``size`` bytes, or b'' if the peer closed"""
+    data = b''
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            return b''
+        data += chunk
+    return data
+
+
+class SocketPlant:
+    """
+    Power stage reached over TCP
+
+    Each step sends the duty cycle and waits for the measured voltage and
+    current, so the round trip is part of the tick like a real ADC/PWM
+    interface would be.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 5555,
+                 timeout: float = 1.0):
+        """
+        Connect to a power stage
+
+        Parameters:
+        -----------
+        host : str
+            Server address
+        port : int
+            Server port
+        timeout : float
+            Socket timeout (s)
+        """
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def step(self, duty_cycle: float) -> Tuple[float, float]:
+        """
+        Apply a duty cycle and measure the PV operating point
+
+        Parameters:
+        -----------
+        duty_cycle : float
+            Converter duty cycle (0-1)
+
+        Returns:
+        --------
+        Tuple[float, float]
+            PV voltage (V) and current (A)
+        """
+        self.sock.sendall(_REQUEST.pack(duty_cycle))
+        data = _recv_exact(self.sock, _RESPONSE.size)
+        if not data:
+            raise ConnectionError("Power stage closed the connection")
+        return _RESPONSE.unpack(data)
+
+    def close(self):
+        """Close the connection"""
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class PlantServer:
+    """
+    Local stand-in for a power stage, serving a plant over TCP
+
+    Runs in a background thread and answers one client at a time using
+    the SocketPlant protocol.
+    """
+
+    def __init__(self, plant, host: str = '127.0.0.1', port: int = 0):
+        """
+        Initialize Plant Server
+
+        Parameters:
+        -----------
+        plant : ModelPlant
+            Plant answering the requests
+        host : str
+            Address to listen on
+        port : int
+            Port to listen on, 0 for any free port
+        """
+        self.plant = plant
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind((host, port))
+        self._server.listen(1)
+        self._server.settimeout(0.1)
+        self._stop = threading.Event()
+        self._thread = None
+        self._conn = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Host and port the server listens on"""
+        return self._server.getsockname()
+
+    def start(self) -> 'PlantServer':
+        """Start serving in a background thread"""
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the listening socket"""
+        self._stop.set()
+        conn = self._conn
+        if conn is not None:
+            # Wake up the blocking receive of the serving thread
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self._thread is not None:
+            self._thread.join()
+        self._server.close()
+
+    def _serve(self):
+        while not self._stop.is_set():
+            try:
+                conn, _ = self._server.accept()
+            except socket.timeout:
+                continue
+
+            with conn:
+                conn.settimeout(None)
+                conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                self._conn = conn
+                try:
+                    while not self._stop.is_set():
+                        data = _recv_exact(conn, _REQUEST.size)
+                        if not data:
+                            break
+                        (duty_cycle,) = _REQUEST.unpack(data)
+                        conn.sendall(_RESPONSE.pack(*self.plant.step(duty_cycle)))
+                except OSError:
+                    pass
+                finally:
+                    self._conn = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class HILRunner:
+    """
+    Fixed-rate controller loop with deadline accounting
+
+    Tick k is scheduled at ``k / rate`` after the start. Each tick reads the
+    plant, updates the controller and applies the new duty cycle on the
+    next read. The loop sleeps until shortly before the next deadline and
+    spins for the rest, which keeps wake-up latency in the microsecond
+    range on an idle machine. A tick that ends after the next scheduled
+    start is a deadline miss; scheduled starts that have already passed
+    are skipped rather than run back to back.
+    """
+
+    def __init__(self, controller, plant, rate: float = 1000.0,
+                 spin_time: float = 200e-6):
+        """
+        Initialize HIL Runner
+
+        Parameters:
+        -----------
+        controller : MPPTController
+            Controller under test
+        plant : ModelPlant or SocketPlant
+            Plant providing ``step(duty_cycle) -> (voltage, current)``
+        rate : float
+            Tick rate (Hz), e.g. 1000-10000
+        spin_time : float
+            Time before each deadline spent busy-waiting instead of
+            sleeping (s)
+        """
+        self.controller = controller
+        self.plant = plant
+        self.rate = rate
+        self.period = 1.0 / rate
+        self.spin_time = spin_time
+
+    def run(self, duration: float = 1.0) -> dict:
+        """
+        Run the loop for a fixed wall-clock duration
+
+        Parameters:
+        -----------
+        duration : float
+            Run time (s)
+
+        Returns:
+        --------
+        dict
+            Timing report, see ``summarize``
+        """
+        max_ticks = int(np.floor(duration * self.rate + 1e-9))
+        period_ns = int(round(self.period * 1e9))
+        spin_ns = int(self.spin_time * 1e9)
+
+        # Preallocated per-tick records (ns)
+        scheduled = np.empty(max_ticks, dtype=np.int64)
+        started = np.empty(max_ticks, dtype=np.int64)
+        io_done = np.empty(max_ticks, dtype=np.int64)
+        finished = np.empty(max_ticks, dtype=np.int64)
+        power = np.empty(max_ticks)
+
+        controller = self.controller
+        plant_step = self.plant.step
+
+        # Model-based controllers read the cell temperature, like in
+        # MPPTSimulator, when the plant reports it
+        set_temperature = None
+        if controller.uses_temperature and hasattr(self.plant, 'last_temperature'):
+            set_temperature = controller.set_temperature
+        clock = time.perf_counter_ns
+
+        t0 = clock() + period_ns
+        slot = 0
+        n = 0
+        while slot < max_ticks:
+            deadline = t0 + slot * period_ns
+
+            # Sleep, then spin up to the scheduled start
+            remaining = deadline - clock() - spin_ns
+            if remaining > 0:
+                time.sleep(remaining * 1e-9)
+            while clock() < deadline:
+                pass
+
+            start = clock()
+            voltage, current = plant_step(controller.duty_cycle)
+            io_end = clock()
+            if set_temperature is not None:
+                set_temperature(self.plant.last_temperature)
+            controller.update(voltage, current)
+            end = clock()
+
+            scheduled[n] = deadline
+            started[n] = start
+            io_done[n] = io_end
+            finished[n] = end
+            power[n] = voltage * current
+            n += 1
+
+            # Next slot that has not started yet
+            slot = max(slot + 1, (end - t0) // period_ns + 1)
+
+        return self.summarize(scheduled[:n], started[:n], io_done[:n],
+                              finished[:n], power[:n], max_ticks)
+
+    def summarize(self, scheduled, started, io_done, finished, power,
+                  slots: int) -> dict:
+        """
+        Timing statistics of a run
+
+        Parameters:
+        -----------
+        scheduled, started, io_done, finished : np.ndarray
+            Per-tick scheduled start, actual start, end of plant I/O and end
+            of the controller update (ns)
+        power : np.ndarray
+            PV power per tick (W)
+        slots : int
+            Number of scheduled ticks in the run
+
+        Returns:
+        --------
+        dict
+            Tick counts, deadline misses and skipped ticks, wake-up latency
+            and jitter statistics (µs), plant I/O and update cost statistics
+            (µs), the update cost histogram and the mean power (W)
+        """
+        latency = (started - scheduled) / 1e3
+        io_cost = (io_done - started) / 1e3
+        update_cost = (finished - io_done) / 1e3
+        tick_cost = (finished - started) / 1e3
+
+        # Jitter: deviation of the interval between consecutive starts from
+        # the scheduled interval
+        interval_error = (np.diff(started) - np.diff(scheduled)) / 1e3
+        misses = int(np.count_nonzero(finished > scheduled + int(round(self.period * 1e9))))
+        counts, _ = np.histogram(update_cost, bins=COST_BINS_US)
+
+        def stats(x):
+            if not len(x):
+                return {'mean': np.nan, 'p50': np.nan, 'p99': np.nan, 'max': np.nan}
+            return {'mean': float(np.mean(x)), 'p50': float(np.percentile(x, 50)),
+                    'p99': float(np.percentile(x, 99)), 'max': float(np.max(x))}
+
+        return {
+            'rate': self.rate,
+            'ticks': len(started),
+            'skipped_ticks': slots - len(started),
+            'deadline_misses': misses,
+            'miss_rate': misses / len(started) if len(started) else 0.0,
+            'latency_us': stats(latency),
+            'jitter_us': {'std': float(np.std(interval_error)) if len(interval_error) else np.nan,
+                          'max': float(np.max(np.abs(interval_error))) if len(interval_error) else np.nan},
+            'plant_io_us': stats(io_cost),
+            'update_cost_us': stats(update_cost),
+            'tick_cost_us': stats(tick_cost),
+            'update_cost_histogram': {'edges_us': COST_BINS_US, 'counts': counts},
+            'mean_power': float(np.mean(power)) if len(power) else 0.0,
+        }
+
+
+def print_report(report: dict):
+    """
+    Print a timing report
+
+    Parameters:
+    -----------
+    report : dict
+        Result of ``HILRunner.run``
+    """
+    print(f"  Rate: {report['rate']:.0f} Hz, ticks: {report['ticks']}, "
+          f"skipped: {report['skipped_ticks']}")
+    print(f"  Deadline misses: {report['deadline_misses']} "
+          f"({report['miss_rate'] * 100:.2f}%)")
+    for key, label in (('latency_us', 'Wake-up latency'), ('plant_io_us', 'Plant I/O'),
+                       ('update_cost_us', 'Update cost')):
+        s = report[key]
+        print(f"  {label}: mean {s['mean']:.1f} µs, p99 {s['p99']:.1f} µs, max {s['max']:.1f} µs")
+    print(f"  Jitter: std {report['jitter_us']['std']:.1f} µs, "
+          f"max {report['jitter_us']['max']:.1f} µs")
+
+    edges = report['update_cost_histogram']['edges_us']
+    for lo, hi, count in zip(edges[:-1], edges[1:], report['update_cost_histogram']['counts']):
+        if count:
+            print(f"    {lo:>6} - {hi:<6} µs: {count}")
+    print(f"  Mean power: {report['mean_power']:.2f} W")
+
+
+if __name__ == "__main__":
+    # Example usage: qualify InCond at 1 kHz against the model and a socket plant
+    from solar_panel import create_standard_panel
+    from mppt_controller import create_mppt_controller
+
+    print("Hardware-in-the-Loop Runner")
+    print("=" * 50)
+
+    panel = create_standard_panel('generic')
+
+    print("\nModel plant:")
+    runner = HILRunner(create_mppt_controller('InCond', step_size=0.005),
+                       ModelPlant(panel), rate=1000.0)
+    print_report(runner.run(duration=1.0))
+
+    print("\nSocket plant (local stand-in):")
+    with PlantServer(ModelPlant(panel)) as server:
+        with SocketPlant(*server.address) as plant:
+            runner = HILRunner(create_mppt_controller('InCond', step_size=0.005),
+                               plant, rate=1000.0)
+            print_report(runner.run(duration=1.0))
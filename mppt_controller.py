@@ -5,18 +5,77 @@ This module implements various MPPT algorithms for solar panel systems:
 - Perturb and Observe (P&O)
 - Incremental Conductance (InCond)
 - Constant Voltage (CV)
+- Fuzzy Logic
+- Global-peak scan for partial shading (GlobalScan)
+- Variable step P&O and InCond with convergence metrics
+- Optional telemetry counters (reversals, holds, saturations, convergence)
+- Model predictive control on the panel model (MPC)
+- Vectorized banks of controllers updated in lock-step
 
 Author: MPPT Controller Implementation
 Date: 2025-11-05
 """
 
+import math
+import functools
 import numpy as np
 from typing import Tuple, Optional
 
 
+def _get_state_fields(obj, fields) -> dict:
+    """Plain Python (JSON serializable) copies of the named attributes"""
+    state = {}
+    for name in fields:
+        value = getattr(obj, name)
+        if isinstance(value, np.ndarray):
+            value = value.tolist()
+        elif isinstance(value, np.generic):
+            value = value.item()
+        elif isinstance(value, list):
+            value = list(value)
+        state[name] = value
+    return state
+
+
+def _set_state_fields(obj, state: dict, fields):
+    """Restore the named attributes, arrays are filled in place"""
+    for name in fields:
+        current = getattr(obj, name)
+        if isinstance(current, np.ndarray):
+            current[...] = state[name]
+        elif isinstance(current, list):
+            setattr(obj, name, list(state[name]))
+        else:
+            setattr(obj, name, state[name])
+
+
+def _with_telemetry(update):
+    """
+    Wrap a controller class's ``update`` so that it feeds ``self.telemetry``
+
+    Only the outermost call records, so an ``update`` that calls
+    ``super().update`` counts once. With telemetry disabled the wrapper
+    costs one attribute check.
+    """
+    @functools.wraps(update)
+    def update_with_telemetry(self, voltage, current):
+        if self.telemetry is None or type(self).update is not update_with_telemetry:
+            return update(self, voltage, current)
+        return self._telemetry_update(update, voltage, current)
+
+    return update_with_telemetry
+
+
 class MPPTController:
     """Base class for MPPT controllers"""
 
+    # Attributes that change during operation, see get_state
+    _state_fields = ('v_prev', 'p_prev', 'i_prev', 'duty_cycle', 'v_ref')
+    # Sub-objects with their own get_state/set_state
+    _state_children = ()
+    # Model-based controllers that read the cell temperature
+    uses_temperature = False
+
     def __init__(self, algorithm: str = 'P&O'):
         """
         Initialize MPPT Controller
@@ -32,6 +91,12 @@ class MPPTController:
         self.i_prev = 0.0
         self.duty_cycle = 0.5  # Initial duty cycle (50%)
         self.v_ref = 0.0
+        self.telemetry = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if 'update' in cls.__dict__:
+            cls.update = _with_telemetry(cls.__dict__['update'])
 
     def reset(self):
         """Reset controller state"""
@@ -40,6 +105,152 @@ class MPPTController:
         self.i_prev = 0.0
         self.duty_cycle = 0.5
 
+    def set_temperature(self, temperature: float):
+        """
+        Cell temperature input, ignored by model-free controllers
+
+        Parameters:
+        -----------
+        temperature : float
+            Cell temperature (°C)
+        """
+
+    def run_trajectory(self, plant, temperature, irradiance) -> dict:
+        """
+        Run the controller against a plant over a whole condition profile
+
+        Tight loop over preallocated arrays, equivalent to calling the plant
+        and ``update`` once per step.
+
+        Parameters:
+        -----------
+        plant : callable
+            ``plant(duty_cycle, temperature, irradiance) -> (voltage, current)``,
+            the PV operating point reached with the commanded duty cycle
+        temperature : float or array_like
+            Cell temperature per step (°C)
+        irradiance : float or array_like
+            Solar irradiance per step (W/m²)
+
+        Returns:
+        --------
+        dict
+            Arrays of PV voltage (V), current (A) and power (W) per step and
+            the duty cycle commanded after each step
+        """
+        T, G = np.broadcast_arrays(np.asarray(temperature, dtype=float),
+                                   np.asarray(irradiance, dtype=float))
+        if T.ndim != 1:
+            raise ValueError("temperature and irradiance must be 1-D profiles")
+
+        n_steps = len(T)
+        duty_cycle = np.empty(n_steps)
+        voltage = np.empty(n_steps)
+        current = np.empty(n_steps)
+
+        update = self.update
+        set_temperature = self.set_temperature if self.uses_temperature else None
+
+        for k, (T_k, G_k) in enumerate(zip(T.tolist(), G.tolist())):
+            v, i = plant(self.duty_cycle, T_k, G_k)
+            if set_temperature is not None:
+                set_temperature(T_k)
+            duty_cycle[k] = update(v, i)
+            voltage[k] = v
+            current[k] = i
+
+        return {
+            'voltage': voltage,
+            'current': current,
+            'power': voltage * current,
+            'duty_cycle': duty_cycle,
+        }
+
+    def get_state(self) -> dict:
+        """
+        Snapshot of the controller state
+
+        Only values that change during operation are included, not the
+        configuration; restore the snapshot with ``set_state`` on a
+        controller created with the same parameters.
+
+        Returns:
+        --------
+        dict
+            JSON serializable controller state
+        """
+        state = {'algorithm': self.algorithm}
+        state.update(_get_state_fields(self, self._state_fields))
+        for name in self._state_children:
+            state[name] = getattr(self, name).get_state()
+        return state
+
+    def set_state(self, state: dict):
+        """
+        Restore a snapshot taken with ``get_state``
+
+        Parameters:
+        -----------
+        state : dict
+            Controller state
+        """
+        if state.get('algorithm') != self.algorithm:
+            raise ValueError(f"Cannot restore {state.get('algorithm')} state "
+                             f"into a {self.algorithm} controller")
+
+        _set_state_fields(self, state, self._state_fields)
+        for name in self._state_children:
+            getattr(self, name).set_state(state[name])
+
+    def enable_telemetry(self, dt: float = 1.0, settle_count: int = 4,
+                         disturbance_threshold: float = 0.05) -> 'ControllerTelemetry':
+        """
+        Count step directions, reversals, holds, saturations and convergence
+
+        Every controller class's ``update`` records into ``self.telemetry``
+        when it is set; the controller stays picklable.
+
+        Parameters:
+        -----------
+        dt : float
+            Update interval (s) for convergence times
+        settle_count : int
+            Consecutive oscillating updates that count as converged
+        disturbance_threshold : float
+            Relative power change that restarts convergence
+
+        Returns:
+        --------
+        ControllerTelemetry
+            Counters, also available as ``self.telemetry``
+        """
+        self.telemetry = ControllerTelemetry(getattr(self, 'd_min', 0.1),
+                                             getattr(self, 'd_max', 0.9),
+                                             dt, settle_count, disturbance_threshold)
+        return self.telemetry
+
+    def disable_telemetry(self):
+        """Stop recording telemetry"""
+        self.telemetry = None
+
+    def _telemetry_update(self, update, voltage: float, current: float) -> float:
+        """Run the unwrapped ``update`` and record it, see ``_with_telemetry``"""
+        duty_prev = self.duty_cycle
+        duty_cycle = update(self, voltage, current)
+        self.telemetry.record(voltage * current, duty_prev, duty_cycle)
+        return duty_cycle
+
+    def get_telemetry(self) -> Optional[dict]:
+        """
+        Telemetry counters, see ``ControllerTelemetry.get_counters``
+
+        Returns:
+        --------
+        dict or None
+            Counters, or None if telemetry is disabled
+        """
+        return None if self.telemetry is None else self.telemetry.get_counters()
+
 
 class PerturbAndObserve(MPPTController):
     """
@@ -194,182 +405,335 @@ class IncrementalConductance(MPPTController):
         return self.duty_cycle
 
 
-class ConstantVoltage(MPPTController):
-    """
-    Constant Voltage (CV) MPPT Algorithm
+def _variable_step(slope: float, scaling: float, step_min: float, step_max: float) -> float:
+    """Duty cycle step proportional to |dP/dV|, limited to [step_min, step_max]"""
+    return min(max(scaling * abs(slope), step_min), step_max)
 
-    Simple algorithm that maintains voltage at a fixed percentage
-    of open-circuit voltage (typically 76-78% of Voc)
+
+def _at_duty_limit(duty_cycle: float, d_min: float = 0.1, d_max: float = 0.9) -> bool:
+    """True if the duty cycle sits at one of the P&O/InCond clip limits"""
+    return duty_cycle <= d_min + 1e-12 or duty_cycle >= d_max - 1e-12
+
+
+class ConvergenceMonitor:
+    """
+    Settle detector and convergence time metric for MPPT controllers
+
+    The controller counts as settled once the requested step has stayed at
+    or below ``settle_threshold`` for ``settle_count`` consecutive updates.
+    A relative power change above ``disturbance_threshold`` while settled
+    marks a disturbance (e.g. an irradiance step), and so does a slow drift
+    of the MPP that keeps the requested step above the threshold for
+    ``settle_count`` updates. The number of updates from the disturbance
+    until the controller settles again is recorded as its convergence time.
+    Start-up is counted as the first disturbance.
+
+    Samples taken with the duty cycle at its limit count as large steps: a
+    controller pinned at the clip limit has a constant step and power but
+    is not tracking.
     """
 
-    def __init__(self, v_ref: float = None, v_oc: float = None, ratio: float = 0.76):
+    _state_fields = ('settled', 'steps', 'p_prev', 'disturbances', 'convergence_steps',
+                     '_disturbance_step', '_quiet_start', '_drift_start')
+
+    def __init__(self, settle_threshold: float, settle_count: int = 5,
+                 disturbance_threshold: float = 0.05, dt: float = 1.0):
         """
-        Initialize Constant Voltage controller
+        Initialize Convergence Monitor
 
         Parameters:
         -----------
-        v_ref : float, optional
-            Reference voltage (V)
-        v_oc : float, optional
-            Open circuit voltage (V)
-        ratio : float
-            Ratio of Voc to use as reference (default 0.76)
+        settle_threshold : float
+            Largest step (duty cycle) that counts as settled
+        settle_count : int
+            Number of consecutive small steps required to settle
+        disturbance_threshold : float
+            Relative power change that marks a disturbance
+        dt : float
+            Update interval (s) used to report convergence times in seconds
         """
-        super().__init__('CV')
-
-        if v_ref is not None:
-            self.v_ref = v_ref
-        elif v_oc is not None:
-            self.v_ref = v_oc * ratio
-        else:
-            raise ValueError("Either v_ref or v_oc must be provided")
+        self.settle_threshold = settle_threshold
+        self.settle_count = settle_count
+        self.disturbance_threshold = disturbance_threshold
+        self.dt = dt
+        self.reset()
 
-        self.Kp = 0.05  # Proportional gain for voltage regulation
+    def reset(self):
+        """Reset monitor state and metrics"""
+        self.settled = False
+        self.steps = 0
+        self.p_prev = 0.0
+        self.disturbances = 0
+        self.convergence_steps = []
+        self._disturbance_step = 0
+        self._quiet_start = None
+        self._drift_start = None
 
-    def update(self, voltage: float, current: float) -> float:
+    def update(self, power: float, step: float, saturated: bool = False) -> bool:
         """
-        Update duty cycle to maintain constant voltage
+        Register one controller update
 
         Parameters:
         -----------
-        voltage : float
-            Current PV voltage (V)
-        current : float
-            Current PV current (A)
+        power : float
+            Measured PV power (W)
+        step : float
+            Step requested by the controller (duty cycle)
+        saturated : bool
+            The power was measured with the duty cycle at its limit
 
         Returns:
         --------
-        float
-            Updated duty cycle (0-1)
+        bool
+            True if the controller is settled
         """
-        # Simple proportional controller
-        error = self.v_ref - voltage
-        self.duty_cycle += self.Kp * error
+        self.steps += 1
+        if saturated:
+            step = math.inf
+
+        if self.settled:
+            if step > self.settle_threshold:
+                if self._drift_start is None:
+                    self._drift_start = self.steps
+            else:
+                self._drift_start = None
+
+            if abs(power - self.p_prev) > self.disturbance_threshold * self.p_prev:
+                self._unsettle(self.steps)
+            elif self._drift_start is not None and \
+                    self.steps - self._drift_start + 1 >= self.settle_count:
+                self._unsettle(self._drift_start)
+
+        if not self.settled:
+            if step <= self.settle_threshold:
+                if self._quiet_start is None:
+                    self._quiet_start = self.steps
+                if self.steps - self._quiet_start + 1 >= self.settle_count:
+                    self.settled = True
+                    self.convergence_steps.append(self._quiet_start - self._disturbance_step)
+            else:
+                self._quiet_start = None
 
-        # Limit duty cycle
-        self.duty_cycle = np.clip(self.duty_cycle, 0.1, 0.9)
+        self.p_prev = power
+        return self.settled
 
-        return self.duty_cycle
+    def get_state(self) -> dict:
+        """JSON serializable snapshot of the monitor state"""
+        return _get_state_fields(self, self._state_fields)
 
+    def set_state(self, state: dict):
+        """Restore a snapshot taken with ``get_state``"""
+        _set_state_fields(self, state, self._state_fields)
 
-class FuzzyLogicMPPT(MPPTController):
-    """
-    Fuzzy Logic MPPT Algorithm
+    def _unsettle(self, step: int):
+        """Register a disturbance that started at update ``step``"""
+        self.settled = False
+        self.disturbances += 1
+        self._disturbance_step = step
+        self._quiet_start = None
+        self._drift_start = None
 
-    Uses fuzzy logic to determine the optimal duty cycle adjustment
-    based on error (E) and change in error (CE)
+    def get_metrics(self) -> dict:
+        """
+        Convergence metrics
+
+        Returns:
+        --------
+        dict
+            Settled flag, number of disturbances, per-disturbance convergence
+            times in updates and seconds, and their mean and last values
+        """
+        steps = np.asarray(self.convergence_steps, dtype=float)
+        return {
+            'settled': self.settled,
+            'disturbances': self.disturbances,
+            'convergence_steps': list(self.convergence_steps),
+            'convergence_times': [float(s) for s in steps * self.dt],
+            'mean_convergence_time': float(np.mean(steps)) * self.dt if steps.size else None,
+            'last_convergence_time': float(steps[-1]) * self.dt if steps.size else None,
+        }
+
+
+class ControllerTelemetry:
     """
+    Aggregate counters of an MPPT controller's duty cycle decisions
+
+    Counts duty cycle steps up and down, direction reversals, holds
+    (unchanged duty cycle inside the limits, i.e. "at MPP" decisions of
+    InCond) and saturations at the duty cycle limits. Convergence is
+    tracked with a ConvergenceMonitor that treats holds and runs of at most
+    ``OSCILLATION_RUN`` steps in one direction as settled behaviour, as in
+    the oscillation of a tracker around the MPP; a tracker that is still
+    climbing keeps moving in one direction for longer.
+    """
+
+    # Longest run of steps in one direction that still counts as oscillation
+    OSCILLATION_RUN = 2
 
-    def __init__(self, step_size: float = 0.01):
+    def __init__(self, d_min: float = 0.1, d_max: float = 0.9, dt: float = 1.0,
+                 settle_count: int = 4, disturbance_threshold: float = 0.05):
         """
-        Initialize Fuzzy Logic MPPT controller
+        Initialize Controller Telemetry
 
         Parameters:
         -----------
-        step_size : float
-            Base step size for adjustments
+        d_min : float
+            Lower duty cycle limit
+        d_max : float
+            Upper duty cycle limit
+        dt : float
+            Update interval (s) for convergence times
+        settle_count : int
+            Consecutive oscillating updates that count as converged
+        disturbance_threshold : float
+            Relative power change that restarts convergence
         """
-        super().__init__('Fuzzy')
-        self.step_size = step_size
+        self.d_min = d_min
+        self.d_max = d_max
+        self.monitor = ConvergenceMonitor(0.5, settle_count, disturbance_threshold, dt)
+        self.reset()
 
-    def fuzzy_membership(self, x: float) -> dict:
+    def reset(self):
+        """Reset all counters"""
+        self.updates = 0
+        self.moves_up = 0
+        self.moves_down = 0
+        self.reversals = 0
+        self.holds = 0
+        self.saturations_low = 0
+        self.saturations_high = 0
+        self._direction = 0
+        self._run = 0
+        self.monitor.reset()
+
+    def record(self, power: float, duty_prev: float, duty_cycle: float):
         """
-        Calculate fuzzy membership values
+        Register one controller update
 
         Parameters:
         -----------
-        x : float
-            Input value
-
-        Returns:
-        --------
-        dict
-            Membership values for each fuzzy set
+        power : float
+            Measured PV power (W)
+        duty_prev : float
+            Duty cycle before the update
+        duty_cycle : float
+            Duty cycle after the update
         """
-        memberships = {}
+        self.updates += 1
 
-        # Define membership functions (triangular)
-        if x < -0.5:
-            memberships['NB'] = 1.0  # Negative Big
-            memberships['NS'] = 0.0
-            memberships['ZE'] = 0.0
-            memberships['PS'] = 0.0
-            memberships['PB'] = 0.0
-        elif x < -0.1:
-            memberships['NB'] = (-0.1 - x) / 0.4
-            memberships['NS'] = (x + 0.5) / 0.4
-            memberships['ZE'] = 0.0
-            memberships['PS'] = 0.0
-            memberships['PB'] = 0.0
-        elif x < 0.1:
-            memberships['NB'] = 0.0
-            memberships['NS'] = (0.1 - x) / 0.2
-            memberships['ZE'] = 1.0 - abs(x) / 0.1
-            memberships['PS'] = (x + 0.1) / 0.2
-            memberships['PB'] = 0.0
-        elif x < 0.5:
-            memberships['NB'] = 0.0
-            memberships['NS'] = 0.0
-            memberships['ZE'] = 0.0
-            memberships['PS'] = (0.5 - x) / 0.4
-            memberships['PB'] = (x - 0.1) / 0.4
+        saturated = True
+        if duty_cycle <= self.d_min + 1e-12:
+            self.saturations_low += 1
+        elif duty_cycle >= self.d_max - 1e-12:
+            self.saturations_high += 1
         else:
-            memberships['NB'] = 0.0
-            memberships['NS'] = 0.0
-            memberships['ZE'] = 0.0
-            memberships['PS'] = 0.0
-            memberships['PB'] = 1.0
+            saturated = False
 
-        return memberships
+        if duty_cycle != duty_prev:
+            direction = 1 if duty_cycle > duty_prev else -1
+            if direction > 0:
+                self.moves_up += 1
+            else:
+                self.moves_down += 1
 
-    def fuzzy_inference(self, E: float, CE: float) -> float:
-        """
-        Fuzzy inference for duty cycle change
+            if direction == self._direction:
+                self._run += 1
+            else:
+                if self._direction:
+                    self.reversals += 1
+                self._run = 1
+            self._direction = direction
+            quiet = self._run <= self.OSCILLATION_RUN
+        else:
+            quiet = not saturated
+            if quiet:
+                self.holds += 1
 
-        Parameters:
-        -----------
-        E : float
-            Error (normalized dP/dV)
-        CE : float
-            Change in error
+        self.monitor.update(power, 0.0 if quiet else 1.0)
+
+    def get_counters(self) -> dict:
+        """
+        Counter values
 
         Returns:
         --------
-        float
-            Duty cycle change
+        dict
+            Number of updates, steps up and down, reversals and reversal
+            rate, holds, saturations at the lower and upper duty cycle
+            limit, and the convergence metrics of ConvergenceMonitor
         """
-        # Get memberships
-        E_memberships = self.fuzzy_membership(E)
-        CE_memberships = self.fuzzy_membership(CE)
-
-        # Simplified rule base (example)
-        output = 0.0
-        total_weight = 0.0
+        counters = {
+            'updates': self.updates,
+            'moves_up': self.moves_up,
+            'moves_down': self.moves_down,
+            'reversals': self.reversals,
+            'reversal_rate': self.reversals / self.updates if self.updates else 0.0,
+            'holds': self.holds,
+            'saturations_low': self.saturations_low,
+            'saturations_high': self.saturations_high,
+        }
+        counters.update(self.monitor.get_metrics())
+        return counters
+
+
+class VariableStepPerturbAndObserve(PerturbAndObserve):
+    """
+    Variable Step Perturb and Observe MPPT Algorithm
+
+    The perturbation is proportional to |dP/dV|: large far from the MPP
+    for fast convergence after irradiance steps, small near the MPP to
+    reduce steady-state oscillation. Once settled the step is held at
+    ``step_min`` until the next disturbance. The direction follows the sign
+    of dP/dV with the boost converter convention of InCond: left of the MPP
+    the duty cycle decreases to raise the PV voltage.
+    """
 
-        # Rule: If E is ZE and CE is ZE, then output is ZE
-        weight = min(E_memberships.get('ZE', 0), CE_memberships.get('ZE', 0))
-        output += weight * 0.0
-        total_weight += weight
+    _state_fields = MPPTController._state_fields + ('step_size',)
+    _state_children = ('monitor',)
 
-        # Rule: If E is PS and CE is PS, then output is PB
-        weight = min(E_memberships.get('PS', 0), CE_memberships.get('PS', 0))
-        output += weight * self.step_size * 2
-        total_weight += weight
+    def __init__(self, step_min: float = 0.001, step_max: float = 0.05,
+                 scaling: float = 0.002, settle_count: int = 5,
+                 disturbance_threshold: float = 0.05, dt: float = 1.0,
+                 v_max: float = 50.0, v_min: float = 10.0):
+        """
+        Initialize Variable Step P&O controller
 
-        # Rule: If E is NS and CE is NS, then output is NB
-        weight = min(E_memberships.get('NS', 0), CE_memberships.get('NS', 0))
-        output += weight * (-self.step_size * 2)
-        total_weight += weight
+        Parameters:
+        -----------
+        step_min : float
+            Smallest duty cycle step
+        step_max : float
+            Largest duty cycle step
+        scaling : float
+            Step per unit of |dP/dV| (duty cycle per W/V)
+        settle_count : int
+            Consecutive small steps required to count as settled
+        disturbance_threshold : float
+            Relative power change that restarts convergence
+        dt : float
+            Update interval (s) for convergence times
+        v_max : float
+            Maximum voltage limit (V)
+        v_min : float
+            Minimum voltage limit (V)
+        """
+        super().__init__(step_size=step_max, v_max=v_max, v_min=v_min)
+        self.algorithm = 'VS-P&O'
+        self.step_min = step_min
+        self.step_max = step_max
+        self.scaling = scaling
+        self.monitor = ConvergenceMonitor(2 * step_min, settle_count,
+                                          disturbance_threshold, dt)
 
-        # Defuzzification
-        if total_weight > 0:
-            return output / total_weight
-        else:
-            return 0.0
+    def reset(self):
+        """Reset controller state and convergence metrics"""
+        super().reset()
+        self.step_size = self.step_max
+        self.monitor.reset()
 
     def update(self, voltage: float, current: float) -> float:
         """
-        Update duty cycle using fuzzy logic
+        Update duty cycle with a step proportional to |dP/dV|
 
         Parameters:
         -----------
@@ -384,23 +748,26 @@ class FuzzyLogicMPPT(MPPTController):
             Updated duty cycle (0-1)
         """
         power = voltage * current
-
-        # Calculate normalized error and change in error
         dP = power - self.p_prev
         dV = voltage - self.v_prev
+        if abs(dV) < 1e-6:
+            dV = 1e-6
 
-        E = dP / (dV + 1e-6) if abs(dV) > 1e-6 else 0
-        CE = E - (self.p_prev / (self.v_prev + 1e-6))
-
-        # Normalize
-        E = np.clip(E / 100, -1, 1)
-        CE = np.clip(CE / 100, -1, 1)
+        slope = dP / dV
+        step = _variable_step(slope, self.scaling, self.step_min, self.step_max)
+        if self.monitor.update(power, step, _at_duty_limit(self.duty_cycle)):
+            step = self.step_min
+        self.step_size = step
 
-        # Get duty cycle change from fuzzy inference
-        delta_D = self.fuzzy_inference(E, CE)
+        if dP != 0:
+            if slope > 0:
+                # Left of MPP - increase voltage (decrease duty cycle for boost converter)
+                self.duty_cycle -= step
+            else:
+                # Right of MPP - decrease voltage (increase duty cycle)
+                self.duty_cycle += step
 
-        # Update duty cycle
-        self.duty_cycle += delta_D
+        # Limit duty cycle
         self.duty_cycle = np.clip(self.duty_cycle, 0.1, 0.9)
 
         # Update previous values
@@ -409,15 +776,1409 @@ class FuzzyLogicMPPT(MPPTController):
 
         return self.duty_cycle
 
+    def get_convergence_metrics(self) -> dict:
+        """Convergence metrics, see ``ConvergenceMonitor.get_metrics``"""
+        return self.monitor.get_metrics()
 
-def create_mppt_controller(algorithm: str = 'P&O', **kwargs) -> MPPTController:
+
+class VariableStepIncrementalConductance(IncrementalConductance):
     """
-    Factory function to create MPPT controller
+    Variable Step Incremental Conductance MPPT Algorithm
 
-    Parameters:
-    -----------
-    algorithm : str
-        Algorithm type: 'P&O', 'InCond', 'CV', 'Fuzzy'
+    Same decision rule as InCond with a step proportional to
+    |dP/dV| = |I + V dI/dV|, bounded and held at ``step_min`` once settled.
+    """
+
+    _state_fields = MPPTController._state_fields + ('step_size',)
+    _state_children = ('monitor',)
+
+    def __init__(self, step_min: float = 0.001, step_max: float = 0.05,
+                 scaling: float = 0.002, tolerance: float = 1e-3,
+                 settle_count: int = 5, disturbance_threshold: float = 0.05,
+                 dt: float = 1.0):
+        """
+        Initialize Variable Step Incremental Conductance controller
+
+        Parameters:
+        -----------
+        step_min : float
+            Smallest duty cycle step
+        step_max : float
+            Largest duty cycle step
+        scaling : float
+            Step per unit of |dP/dV| (duty cycle per W/V)
+        tolerance : float
+            Tolerance for MPP detection
+        settle_count : int
+            Consecutive small steps required to count as settled
+        disturbance_threshold : float
+            Relative power change that restarts convergence
+        dt : float
+            Update interval (s) for convergence times
+        """
+        super().__init__(step_size=step_max, tolerance=tolerance)
+        self.algorithm = 'VS-InCond'
+        self.step_min = step_min
+        self.step_max = step_max
+        self.scaling = scaling
+        self.monitor = ConvergenceMonitor(2 * step_min, settle_count,
+                                          disturbance_threshold, dt)
+
+    def reset(self):
+        """Reset controller state and convergence metrics"""
+        super().reset()
+        self.step_size = self.step_max
+        self.monitor.reset()
+
+    def update(self, voltage: float, current: float) -> float:
+        """
+        Update duty cycle with a step proportional to |dP/dV|
+
+        Parameters:
+        -----------
+        voltage : float
+            Current PV voltage (V)
+        current : float
+            Current PV current (A)
+
+        Returns:
+        --------
+        float
+            Updated duty cycle (0-1)
+        """
+        dV = voltage - self.v_prev
+        if abs(dV) < 1e-6:
+            dV = 1e-6
+
+        slope = current + voltage * (current - self.i_prev) / dV
+        step = _variable_step(slope, self.scaling, self.step_min, self.step_max)
+        if self.monitor.update(voltage * current, step, _at_duty_limit(self.duty_cycle)):
+            step = self.step_min
+        self.step_size = step
+
+        return super().update(voltage, current)
+
+    def get_convergence_metrics(self) -> dict:
+        """Convergence metrics, see ``ConvergenceMonitor.get_metrics``"""
+        return self.monitor.get_metrics()
+
+
+class ConstantVoltage(MPPTController):
+    """
+    Constant Voltage (CV) MPPT Algorithm
+
+    Simple algorithm that maintains voltage at a fixed percentage
+    of open-circuit voltage (typically 76-78% of Voc)
+    """
+
+    def __init__(self, v_ref: float = None, v_oc: float = None, ratio: float = 0.76):
+        """
+        Initialize Constant Voltage controller
+
+        Parameters:
+        -----------
+        v_ref : float, optional
+            Reference voltage (V)
+        v_oc : float, optional
+            Open circuit voltage (V)
+        ratio : float
+            Ratio of Voc to use as reference (default 0.76)
+        """
+        super().__init__('CV')
+
+        if v_ref is not None:
+            self.v_ref = v_ref
+        elif v_oc is not None:
+            self.v_ref = v_oc * ratio
+        else:
+            raise ValueError("Either v_ref or v_oc must be provided")
+
+        self.Kp = 0.05  # Proportional gain for voltage regulation
+
+    def update(self, voltage: float, current: float) -> float:
+        """
+        Update duty cycle to maintain constant voltage
+
+        Parameters:
+        -----------
+        voltage : float
+            Current PV voltage (V)
+        current : float
+            Current PV current (A)
+
+        Returns:
+        --------
+        float
+            Updated duty cycle (0-1)
+        """
+        # Simple proportional controller
+        error = self.v_ref - voltage
+        self.duty_cycle += self.Kp * error
+
+        # Limit duty cycle
+        self.duty_cycle = np.clip(self.duty_cycle, 0.1, 0.9)
+
+        return self.duty_cycle
+
+
+def _fuzzy_membership_array(x: np.ndarray) -> dict:
+    """
+    Vectorized version of ``FuzzyLogicMPPT.fuzzy_membership``
+
+    Parameters:
+    -----------
+    x : np.ndarray
+        Input values
+
+    Returns:
+    --------
+    dict
+        Membership arrays for each fuzzy set
+    """
+    zero = np.zeros_like(x)
+    r1 = x < -0.5
+    r2 = ~r1 & (x < -0.1)
+    r3 = ~r1 & ~r2 & (x < 0.1)
+    r4 = ~r1 & ~r2 & ~r3 & (x < 0.5)
+    r5 = x >= 0.5
+
+    return {
+        'NB': np.where(r1, 1.0, np.where(r2, (-0.1 - x) / 0.4, zero)),
+        'NS': np.where(r2, (x + 0.5) / 0.4, np.where(r3, (0.1 - x) / 0.2, zero)),
+        'ZE': np.where(r3, 1.0 - np.abs(x) / 0.1, zero),
+        'PS': np.where(r3, (x + 0.1) / 0.2, np.where(r4, (0.5 - x) / 0.4, zero)),
+        'PB': np.where(r4, (x - 0.1) / 0.4, np.where(r5, 1.0, zero)),
+    }
+
+
+def _fuzzy_rule_weights(E, CE, step_size) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Weighted rule outputs and total rule weight of the fuzzy rule base
+
+    The duty cycle change is ``output / total_weight`` where the total
+    weight is positive, and zero elsewhere.
+
+    Parameters:
+    -----------
+    E : array_like
+        Error (normalized dP/dV)
+    CE : array_like
+        Change in error
+    step_size : float or array_like
+        Base step size for adjustments
+
+    Returns:
+    --------
+    Tuple[np.ndarray, np.ndarray]
+        Sum of weighted rule outputs and sum of rule weights
+    """
+    E_memberships = _fuzzy_membership_array(np.asarray(E, dtype=float))
+    CE_memberships = _fuzzy_membership_array(np.asarray(CE, dtype=float))
+
+    # Rule base of FuzzyLogicMPPT: ZE/ZE -> ZE, PS/PS -> PB, NS/NS -> NB
+    w_ze = np.minimum(E_memberships['ZE'], CE_memberships['ZE'])
+    w_pb = np.minimum(E_memberships['PS'], CE_memberships['PS'])
+    w_nb = np.minimum(E_memberships['NS'], CE_memberships['NS'])
+
+    output = w_ze * 0.0 + w_pb * step_size * 2 + w_nb * (-step_size * 2)
+    total_weight = w_ze + w_pb + w_nb
+
+    return output, total_weight
+
+
+class FuzzyLookupTable:
+    """
+    Compiled control surface of the fuzzy rule base
+
+    The weighted rule output and the total rule weight are both continuous
+    and piecewise linear in (E, CE), so they are tabulated on a uniform grid
+    over [-1, 1]² and bilinearly interpolated; their ratio is the duty cycle
+    change. Interpolating the two parts separately keeps the jumps of the
+    ratio where all rules switch off.
+
+    With the default resolution of 0.01 the output matches the rule-based
+    inference within 0.25 * step_size, and within 1e-8 * step_size on more
+    than 99.9 % of the input plane; the larger deviations sit in the few
+    cells where the rule weights fade out. Exactly on the membership
+    breakpoints (E or CE at 0, ±0.1 or ±0.5) the rule base itself jumps
+    between a rounding-level rule weight and no active rule, and the table
+    takes the exact value. ``max_error`` reports the deviation measured at
+    the cell centres when the table is built.
+    """
+
+    def __init__(self, step_size: float = 0.01, resolution: float = 0.01):
+        """
+        Compile the fuzzy rule base
+
+        Parameters:
+        -----------
+        step_size : float
+            Base step size for adjustments
+        resolution : float
+            Grid spacing in E and CE; 0.1 should be a multiple of it so the
+            membership breakpoints fall on grid lines
+        """
+        self.step_size = step_size
+        self.resolution = resolution
+        self.n = int(round(2.0 / resolution)) + 1
+
+        # Snap the nodes so breakpoints such as -0.1 are hit exactly
+        self.grid = np.round(np.linspace(-1.0, 1.0, self.n), 12)
+        self.output, self.weight = _fuzzy_rule_weights(
+            self.grid[:, None], self.grid[None, :], step_size)
+
+        # Bilinear coefficients per cell, c0 + c1*wx + c2*wy + c3*wx*wy for
+        # the output (columns 0-3) and the weight (columns 4-7)
+        coeffs = []
+        for tab in (self.output, self.weight):
+            f00, f01 = tab[:-1, :-1], tab[:-1, 1:]
+            f10, f11 = tab[1:, :-1], tab[1:, 1:]
+            coeffs += [f00, f10 - f00, f01 - f00, f11 - f10 - f01 + f00]
+        self._coeffs = np.stack([c.ravel() for c in coeffs])
+        self._coeff_list = self._coeffs.T.tolist()
+
+        # Deviation from the rule base at the cell centres
+        mid = (self.grid[:-1] + self.grid[1:]) / 2
+        output, weight = _fuzzy_rule_weights(mid[:, None], mid[None, :], step_size)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            exact = np.where(weight > 0, output / weight, 0.0)
+        self.max_error = float(np.max(np.abs(self(mid[:, None], mid[None, :]) - exact)))
+
+    def __call__(self, E, CE):
+        """
+        Duty cycle change from the compiled surface
+
+        Parameters:
+        -----------
+        E : float or array_like
+            Error (normalized dP/dV), clipped to [-1, 1]
+        CE : float or array_like
+            Change in error, clipped to [-1, 1]
+
+        Returns:
+        --------
+        float or np.ndarray
+            Duty cycle change
+        """
+        h = self.resolution
+        last = self.n - 2
+
+        if not isinstance(E, np.ndarray) and not isinstance(CE, np.ndarray):
+            x = float(E)
+            y = float(CE)
+            x = 0.0 if x <= -1.0 else (2.0 if x >= 1.0 else x + 1.0)
+            y = 0.0 if y <= -1.0 else (2.0 if y >= 1.0 else y + 1.0)
+            x /= h
+            y /= h
+            i = int(x)
+            j = int(y)
+            if i > last:
+                i = last
+            if j > last:
+                j = last
+            wx = x - i
+            wy = y - j
+
+            o0, o1, o2, o3, w0, w1, w2, w3 = self._coeff_list[i * (last + 1) + j]
+            weight = w0 + w1 * wx + (w2 + w3 * wx) * wy
+            if weight <= 1e-12:
+                return 0.0
+            return (o0 + o1 * wx + (o2 + o3 * wx) * wy) / weight
+
+        x = (np.clip(np.asarray(E, dtype=float), -1.0, 1.0) + 1.0) / h
+        y = (np.clip(np.asarray(CE, dtype=float), -1.0, 1.0) + 1.0) / h
+        i = np.minimum(x.astype(np.intp), last)
+        j = np.minimum(y.astype(np.intp), last)
+        wx, wy = x - i, y - j
+
+        cell = i * (last + 1) + j
+        o0, o1, o2, o3, w0, w1, w2, w3 = [np.take(c, cell) for c in self._coeffs]
+        output = o0 + o1 * wx + (o2 + o3 * wx) * wy
+        weight = w0 + w1 * wx + (w2 + w3 * wx) * wy
+
+        return np.divide(output, weight, out=np.zeros_like(output),
+                         where=weight > 1e-12)
+
+
+class FuzzyLogicMPPT(MPPTController):
+    """
+    Fuzzy Logic MPPT Algorithm
+
+    Uses fuzzy logic to determine the optimal duty cycle adjustment
+    based on error (E) and change in error (CE)
+    """
+
+    def __init__(self, step_size: float = 0.01, use_lookup_table: bool = False,
+                 table_resolution: float = 0.01):
+        """
+        Initialize Fuzzy Logic MPPT controller
+
+        Parameters:
+        -----------
+        step_size : float
+            Base step size for adjustments
+        use_lookup_table : bool
+            Evaluate the rule base through a compiled FuzzyLookupTable
+        table_resolution : float
+            Grid spacing of the lookup table in E and CE
+        """
+        super().__init__('Fuzzy')
+        self.step_size = step_size
+        self.lookup_table = (FuzzyLookupTable(step_size, table_resolution)
+                             if use_lookup_table else None)
+
+    def fuzzy_membership(self, x: float) -> dict:
+        """
+        Calculate fuzzy membership values
+
+        Parameters:
+        -----------
+        x : float
+            Input value
+
+        Returns:
+        --------
+        dict
+            Membership values for each fuzzy set
+        """
+        memberships = {}
+
+        # Define membership functions (triangular)
+        if x < -0.5:
+            memberships['NB'] = 1.0  # Negative Big
+            memberships['NS'] = 0.0
+            memberships['ZE'] = 0.0
+            memberships['PS'] = 0.0
+            memberships['PB'] = 0.0
+        elif x < -0.1:
+            memberships['NB'] = (-0.1 - x) / 0.4
+            memberships['NS'] = (x + 0.5) / 0.4
+            memberships['ZE'] = 0.0
+            memberships['PS'] = 0.0
+            memberships['PB'] = 0.0
+        elif x < 0.1:
+            memberships['NB'] = 0.0
+            memberships['NS'] = (0.1 - x) / 0.2
+            memberships['ZE'] = 1.0 - abs(x) / 0.1
+            memberships['PS'] = (x + 0.1) / 0.2
+            memberships['PB'] = 0.0
+        elif x < 0.5:
+            memberships['NB'] = 0.0
+            memberships['NS'] = 0.0
+            memberships['ZE'] = 0.0
+            memberships['PS'] = (0.5 - x) / 0.4
+            memberships['PB'] = (x - 0.1) / 0.4
+        else:
+            memberships['NB'] = 0.0
+            memberships['NS'] = 0.0
+            memberships['ZE'] = 0.0
+            memberships['PS'] = 0.0
+            memberships['PB'] = 1.0
+
+        return memberships
+
+    def fuzzy_inference(self, E: float, CE: float) -> float:
+        """
+        Fuzzy inference for duty cycle change
+
+        Parameters:
+        -----------
+        E : float
+            Error (normalized dP/dV)
+        CE : float
+            Change in error
+
+        Returns:
+        --------
+        float
+            Duty cycle change
+        """
+        if self.lookup_table is not None:
+            return self.lookup_table(E, CE)
+
+        # Get memberships
+        E_memberships = self.fuzzy_membership(E)
+        CE_memberships = self.fuzzy_membership(CE)
+
+        # Simplified rule base (example)
+        output = 0.0
+        total_weight = 0.0
+
+        # Rule: If E is ZE and CE is ZE, then output is ZE
+        weight = min(E_memberships.get('ZE', 0), CE_memberships.get('ZE', 0))
+        output += weight * 0.0
+        total_weight += weight
+
+        # Rule: If E is PS and CE is PS, then output is PB
+        weight = min(E_memberships.get('PS', 0), CE_memberships.get('PS', 0))
+        output += weight * self.step_size * 2
+        total_weight += weight
+
+        # Rule: If E is NS and CE is NS, then output is NB
+        weight = min(E_memberships.get('NS', 0), CE_memberships.get('NS', 0))
+        output += weight * (-self.step_size * 2)
+        total_weight += weight
+
+        # Defuzzification
+        if total_weight > 0:
+            return output / total_weight
+        else:
+            return 0.0
+
+    def update(self, voltage: float, current: float) -> float:
+        """
+        Update duty cycle using fuzzy logic
+
+        Parameters:
+        -----------
+        voltage : float
+            Current PV voltage (V)
+        current : float
+            Current PV current (A)
+
+        Returns:
+        --------
+        float
+            Updated duty cycle (0-1)
+        """
+        power = voltage * current
+
+        # Calculate normalized error and change in error
+        dP = power - self.p_prev
+        dV = voltage - self.v_prev
+
+        E = dP / (dV + 1e-6) if abs(dV) > 1e-6 else 0
+        CE = E - (self.p_prev / (self.v_prev + 1e-6))
+
+        # Normalize (scalar np.clip would cost more than the table lookup)
+        E = min(max(E / 100, -1.0), 1.0)
+        CE = min(max(CE / 100, -1.0), 1.0)
+
+        # Get duty cycle change from fuzzy inference
+        delta_D = self.fuzzy_inference(E, CE)
+
+        # Update duty cycle
+        self.duty_cycle = min(max(self.duty_cycle + delta_D, 0.1), 0.9)
+
+        # Update previous values
+        self.v_prev = voltage
+        self.p_prev = power
+
+        return self.duty_cycle
+
+
+class GlobalScanMPPT(MPPTController):
+    """
+    Global-peak MPPT Algorithm for multi-peak P-V curves
+
+    Under partial shading the P-V curve has several local maxima, and hill
+    climbing algorithms lock onto whichever one is closest. This controller
+    periodically sweeps the duty cycle over a coarse grid (the scan budget),
+    moves to the best point seen and hands over to a local tracker until
+    the next scan. A scan is also started early when the tracked power
+    drops suddenly, e.g. when the shading pattern changes.
+
+    Scan cost and benefit are accumulated in energy units (W times ``dt``):
+    the energy lost while sweeping below the power held before the scan,
+    and the energy recovered afterwards above that same power.
+    """
+
+    _state_fields = MPPTController._state_fields + (
+        '_scan_index', '_scan_powers', '_steps_since_scan', '_p_reference',
+        'scans', 'scan_steps', 'energy_lost_scanning', 'energy_recovered')
+    _state_children = ('local',)
+
+    def __init__(self, scan_points: int = 20, scan_period: int = 500,
+                 local_algorithm: str = 'InCond', step_size: float = 0.005,
+                 d_min: float = 0.1, d_max: float = 0.9,
+                 rescan_threshold: float = 0.3, dt: float = 1.0):
+        """
+        Initialize Global Scan MPPT controller
+
+        Parameters:
+        -----------
+        scan_points : int
+            Scan budget, number of duty cycles visited per scan
+        scan_period : int
+            Number of tracking updates between scans
+        local_algorithm : str
+            Local tracker used between scans ('P&O', 'InCond', 'Fuzzy')
+        step_size : float
+            Step size of the local tracker
+        d_min : float
+            Lowest scanned duty cycle
+        d_max : float
+            Highest scanned duty cycle
+        rescan_threshold : float
+            Relative power drop between updates that triggers a new scan
+        dt : float
+            Update interval (s) used to convert power to energy
+        """
+        super().__init__('GlobalScan')
+        self.scan_points = scan_points
+        self.scan_period = scan_period
+        self.rescan_threshold = rescan_threshold
+        self.dt = dt
+        self.scan_duties = np.linspace(d_min, d_max, scan_points)
+        self.local = create_mppt_controller(local_algorithm, step_size=step_size)
+        self.reset()
+
+    def reset(self):
+        """Reset controller state and scan metrics"""
+        super().reset()
+        self.local.reset()
+
+        # Scan state, start with a scan
+        self._scan_index = None
+        self._scan_powers = np.zeros(self.scan_points)
+        self._steps_since_scan = self.scan_period
+        self._p_reference = 0.0
+
+        # Metrics
+        self.scans = 0
+        self.scan_steps = 0
+        self.energy_lost_scanning = 0.0
+        self.energy_recovered = 0.0
+
+    def update(self, voltage: float, current: float) -> float:
+        """
+        Update duty cycle, scanning or tracking locally
+
+        Parameters:
+        -----------
+        voltage : float
+            Current PV voltage (V)
+        current : float
+            Current PV current (A)
+
+        Returns:
+        --------
+        float
+            Updated duty cycle (0-1)
+        """
+        power = voltage * current
+
+        if self._scan_index is not None:
+            # This measurement belongs to the scan point commanded last time
+            self._scan_powers[self._scan_index] = power
+            self.energy_lost_scanning += max(self._p_reference - power, 0.0) * self.dt
+            self.scan_steps += 1
+            self._scan_index += 1
+
+            if self._scan_index < self.scan_points:
+                self.duty_cycle = self.scan_duties[self._scan_index]
+            else:
+                # Scan finished, continue locally from the best point
+                best = int(np.argmax(self._scan_powers))
+                self._scan_index = None
+                self._steps_since_scan = 0
+                self.local.reset()
+                self.local.duty_cycle = self.scan_duties[best]
+                self.duty_cycle = self.local.duty_cycle
+        else:
+            self.energy_recovered += max(power - self._p_reference, 0.0) * self.dt
+            self._steps_since_scan += 1
+
+            dropped = power < (1 - self.rescan_threshold) * self.p_prev
+            if self._steps_since_scan >= self.scan_period or dropped:
+                # Start a scan, measured against the power held right now
+                self.scans += 1
+                self._p_reference = power
+                self._scan_index = 0
+                self.duty_cycle = self.scan_duties[0]
+            else:
+                self.duty_cycle = self.local.update(voltage, current)
+
+        # Update previous values
+        self.v_prev = voltage
+        self.p_prev = power
+
+        return self.duty_cycle
+
+    def get_scan_metrics(self) -> dict:
+        """
+        Energy balance of the scans
+
+        Returns:
+        --------
+        dict
+            Number of scans and scan updates, energy lost while scanning,
+            energy recovered after scans and their difference (W·s with
+            ``dt`` in seconds)
+        """
+        return {
+            'scans': self.scans,
+            'scan_steps': self.scan_steps,
+            'energy_lost_scanning': self.energy_lost_scanning,
+            'energy_recovered': self.energy_recovered,
+            'net_energy_gain': self.energy_recovered - self.energy_lost_scanning,
+        }
+
+
+class ModelPredictiveMPPT(MPPTController):
+    """
+    Model Predictive MPPT Algorithm
+
+    Instead of perturbing one step at a time, the controller inverts the
+    panel model: the single diode equation is linear in the photocurrent,
+    so one (V, I) measurement and the cell temperature give the irradiance
+    in closed form. The MPP voltage at the estimated conditions is read
+    from a precomputed MPP surface and the converter is commanded straight
+    to the corresponding duty cycle. Each update costs one exponential and
+    one table lookup.
+    """
+
+    _state_fields = MPPTController._state_fields + ('temperature', 'g_estimate', 'v_target')
+    uses_temperature = True
+
+    def __init__(self, panel, mpp_surface=None, temperature: float = 25.0,
+                 v_array: Optional[float] = None, voltage_gain: float = 1.8,
+                 d_min: float = 0.1, d_max: float = 0.9,
+                 min_irradiance: float = 1.0):
+        """
+        Initialize Model Predictive MPPT controller
+
+        Parameters:
+        -----------
+        panel : SolarPanel
+            Panel model of the plant
+        mpp_surface : MPPSurface, optional
+            Precomputed MPP surface of the panel; built if not given
+        temperature : float
+            Cell temperature estimate (°C), see ``set_temperature``
+        v_array : float, optional
+            Converter reference voltage (V), default ``panel.V_oc``
+        voltage_gain : float
+            Converter gain, V = v_array * (1 - D) * voltage_gain
+        d_min : float
+            Minimum duty cycle
+        d_max : float
+            Maximum duty cycle
+        min_irradiance : float
+            Below this estimated irradiance (W/m²) the duty cycle is held
+        """
+        super().__init__('MPC')
+        if mpp_surface is None:
+            from solar_panel import MPPSurface
+            mpp_surface = MPPSurface(panel)
+
+        self.panel = panel
+        self.mpp_surface = mpp_surface
+        self.temperature = temperature
+        self.v_array = panel.V_oc if v_array is None else v_array
+        self.voltage_gain = voltage_gain
+        self.d_min = d_min
+        self.d_max = d_max
+        self.min_irradiance = min_irradiance
+        self.g_estimate = 0.0
+        self.v_target = 0.0
+
+    def set_temperature(self, temperature: float):
+        """
+        Update the cell temperature estimate, e.g. from a module sensor
+
+        Parameters:
+        -----------
+        temperature : float
+            Cell temperature (°C)
+        """
+        self.temperature = temperature
+
+    def estimate_irradiance(self, voltage: float, current: float) -> float:
+        """
+        Irradiance that explains one (V, I) measurement
+
+        Parameters:
+        -----------
+        voltage : float
+            PV voltage (V)
+        current : float
+            PV current (A)
+
+        Returns:
+        --------
+        float
+            Estimated irradiance (W/m²), not below zero
+        """
+        panel = self.panel
+        nV_t, I_ph_nom, I_0 = panel.operating_condition(self.temperature, panel.G_nom)
+
+        V_d = voltage + current * panel.R_s
+        I_ph = current + I_0 * (math.exp(min(V_d / nV_t, 700.0)) - 1) + V_d / panel.R_sh
+
+        return max(panel.G_nom * I_ph / I_ph_nom, 0.0)
+
+    def update(self, voltage: float, current: float) -> float:
+        """
+        Update duty cycle to the predicted MPP
+
+        Parameters:
+        -----------
+        voltage : float
+            Current PV voltage (V)
+        current : float
+            Current PV current (A)
+
+        Returns:
+        --------
+        float
+            Updated duty cycle (0-1)
+        """
+        self.g_estimate = self.estimate_irradiance(voltage, current)
+
+        if self.g_estimate >= self.min_irradiance:
+            v_mpp, _, _ = self.mpp_surface.query(self.temperature, self.g_estimate)
+            self.v_target = v_mpp
+            self.duty_cycle = 1 - v_mpp / (self.v_array * self.voltage_gain)
+
+        # Limit duty cycle
+        self.duty_cycle = min(max(self.duty_cycle, self.d_min), self.d_max)
+
+        # Update previous values
+        self.v_prev = voltage
+        self.i_prev = current
+        self.p_prev = voltage * current
+
+        return self.duty_cycle
+
+
+class BankTelemetry:
+    """
+    Per-channel telemetry counters of a controller bank
+
+    Vectorized counterpart of ControllerTelemetry: the same counters and
+    convergence rule, kept as one array entry per channel. Convergence
+    times are accumulated as count, total and last value per channel.
+    """
+
+    def __init__(self, n_channels: int, d_min: float = 0.1, d_max: float = 0.9,
+                 dt: float = 1.0, settle_count: int = 4,
+                 disturbance_threshold: float = 0.05):
+        """
+        Initialize Bank Telemetry
+
+        Parameters:
+        -----------
+        n_channels : int
+            Number of channels
+        d_min : float
+            Lower duty cycle limit
+        d_max : float
+            Upper duty cycle limit
+        dt : float
+            Update interval (s) for convergence times
+        settle_count : int
+            Consecutive oscillating updates that count as converged
+        disturbance_threshold : float
+            Relative power change that restarts convergence
+        """
+        self.n_channels = n_channels
+        self.d_min = d_min
+        self.d_max = d_max
+        self.dt = dt
+        self.settle_count = settle_count
+        self.disturbance_threshold = disturbance_threshold
+        self.reset()
+
+    def reset(self):
+        """Reset all counters"""
+        n = self.n_channels
+        self.updates = 0
+        self.moves_up = np.zeros(n, dtype=int)
+        self.moves_down = np.zeros(n, dtype=int)
+        self.reversals = np.zeros(n, dtype=int)
+        self.holds = np.zeros(n, dtype=int)
+        self.saturations_low = np.zeros(n, dtype=int)
+        self.saturations_high = np.zeros(n, dtype=int)
+        self.disturbances = np.zeros(n, dtype=int)
+        self.convergences = np.zeros(n, dtype=int)
+        self.convergence_steps_total = np.zeros(n, dtype=int)
+        self.last_convergence_steps = np.full(n, -1)
+        self.settled = np.zeros(n, dtype=bool)
+        self._direction = np.zeros(n, dtype=int)
+        self._run = np.zeros(n, dtype=int)
+        self._p_prev = np.zeros(n)
+        self._quiet_run = np.zeros(n, dtype=int)
+        self._loud_run = np.zeros(n, dtype=int)
+        self._disturbance_step = np.zeros(n, dtype=int)
+
+    def record(self, power: np.ndarray, duty_prev: np.ndarray, duty_cycle: np.ndarray):
+        """
+        Register one bank update
+
+        Parameters:
+        -----------
+        power : np.ndarray
+            Measured PV power per channel (W)
+        duty_prev : np.ndarray
+            Duty cycles before the update
+        duty_cycle : np.ndarray
+            Duty cycles after the update
+        """
+        self.updates += 1
+        step = self.updates
+
+        low = duty_cycle <= self.d_min + 1e-12
+        high = duty_cycle >= self.d_max - 1e-12
+        self.saturations_low += low
+        self.saturations_high += high & ~low
+
+        direction = np.sign(duty_cycle - duty_prev).astype(int)
+        moved = direction != 0
+        reversal = moved & (direction == -self._direction)
+        hold = ~moved & ~(low | high)
+        self.moves_up += direction > 0
+        self.moves_down += direction < 0
+        self.reversals += reversal
+        self.holds += hold
+        self._run = np.where(moved, np.where(direction == self._direction, self._run + 1, 1),
+                             self._run)
+        self._direction = np.where(moved, direction, self._direction)
+        quiet = hold | (moved & (self._run <= ControllerTelemetry.OSCILLATION_RUN))
+
+        # Disturbances: power jump or sustained one-way movement while settled
+        self._loud_run = np.where(self.settled & ~quiet, self._loud_run + 1, 0)
+        jump = self.settled & (np.abs(power - self._p_prev) > self.disturbance_threshold * self._p_prev)
+        drift = self.settled & ~jump & (self._loud_run >= self.settle_count)
+        disturbed = jump | drift
+        self.disturbances += disturbed
+        self._disturbance_step = np.where(jump, step, np.where(
+            drift, step - self._loud_run + 1, self._disturbance_step))
+        self.settled &= ~disturbed
+        self._loud_run[disturbed] = 0
+
+        # Convergence: settle_count consecutive oscillating updates
+        self._quiet_run = np.where(~self.settled & quiet, self._quiet_run + 1, 0)
+        converged = self._quiet_run >= self.settle_count
+        if converged.any():
+            steps = step - self._quiet_run[converged] + 1 - self._disturbance_step[converged]
+            self.convergences[converged] += 1
+            self.convergence_steps_total[converged] += steps
+            self.last_convergence_steps[converged] = steps
+            self.settled |= converged
+            self._quiet_run[converged] = 0
+
+        self._p_prev = np.array(power, dtype=float)
+
+    def get_counters(self) -> dict:
+        """
+        Counter values
+
+        Returns:
+        --------
+        dict
+            Number of updates and per-channel arrays of steps up and down,
+            reversals and reversal rate, holds, saturations, disturbances,
+            settled flags, and mean and last convergence time (s, NaN if
+            the channel has not converged)
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean_steps = np.where(self.convergences > 0,
+                                  self.convergence_steps_total / self.convergences, np.nan)
+        last_steps = np.where(self.last_convergence_steps >= 0,
+                              self.last_convergence_steps, np.nan)
+
+        return {
+            'updates': self.updates,
+            'moves_up': self.moves_up.copy(),
+            'moves_down': self.moves_down.copy(),
+            'reversals': self.reversals.copy(),
+            'reversal_rate': self.reversals / max(self.updates, 1),
+            'holds': self.holds.copy(),
+            'saturations_low': self.saturations_low.copy(),
+            'saturations_high': self.saturations_high.copy(),
+            'settled': self.settled.copy(),
+            'disturbances': self.disturbances.copy(),
+            'mean_convergence_time': mean_steps * self.dt,
+            'last_convergence_time': last_steps * self.dt,
+        }
+
+
+class MPPTControllerBank:
+    """
+    Base class for banks of MPPT controllers
+
+    A bank holds the state of N independent controllers of the same
+    algorithm in arrays and updates all channels with one vectorized
+    call. Each channel follows exactly the same rules as the scalar
+    controller class of that algorithm.
+    """
+
+    def __init__(self, n_channels: int, algorithm: str = 'P&O'):
+        """
+        Initialize MPPT Controller Bank
+
+        Parameters:
+        -----------
+        n_channels : int
+            Number of controllers in the bank
+        algorithm : str
+            MPPT algorithm to use ('P&O', 'InCond', 'CV', 'Fuzzy')
+        """
+        self.algorithm = algorithm
+        self.n_channels = n_channels
+        self.v_prev = np.zeros(n_channels)
+        self.p_prev = np.zeros(n_channels)
+        self.i_prev = np.zeros(n_channels)
+        self.duty_cycle = np.full(n_channels, 0.5)  # Initial duty cycle (50%)
+        self.v_ref = np.zeros(n_channels)
+        self.telemetry = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if 'update' in cls.__dict__:
+            cls.update = _with_telemetry(cls.__dict__['update'])
+
+    def reset(self):
+        """Reset controller state of all channels"""
+        self.v_prev[:] = 0.0
+        self.p_prev[:] = 0.0
+        self.i_prev[:] = 0.0
+        self.duty_cycle[:] = 0.5
+
+    def run_trajectory(self, plant, temperature, irradiance) -> dict:
+        """
+        Run all channels against a plant over a whole condition profile
+
+        Parameters:
+        -----------
+        plant : callable
+            ``plant(duty_cycles, temperature, irradiance) -> (voltages, currents)``
+            for one step of all channels
+        temperature : float or array_like
+            Cell temperature (°C), per step (n_steps,) or per step and
+            channel (n_steps, n_channels)
+        irradiance : float or array_like
+            Solar irradiance (W/m²), same shapes as temperature
+
+        Returns:
+        --------
+        dict
+            Arrays of shape (n_steps, n_channels) of PV voltage (V), current
+            (A), power (W) and the duty cycle commanded after each step
+        """
+        T, G = np.broadcast_arrays(np.asarray(temperature, dtype=float),
+                                   np.asarray(irradiance, dtype=float))
+        if T.ndim not in (1, 2):
+            raise ValueError("temperature and irradiance must have shape "
+                             "(n_steps,) or (n_steps, n_channels)")
+
+        shape = (len(T), self.n_channels)
+        duty_cycle = np.empty(shape)
+        voltage = np.empty(shape)
+        current = np.empty(shape)
+
+        update = self.update
+        for k in range(len(T)):
+            v, i = plant(self.duty_cycle.copy(), T[k], G[k])
+            duty_cycle[k] = update(v, i)
+            voltage[k] = v
+            current[k] = i
+
+        return {
+            'voltage': voltage,
+            'current': current,
+            'power': voltage * current,
+            'duty_cycle': duty_cycle,
+        }
+
+    def get_state(self) -> dict:
+        """
+        Snapshot of the state of all channels
+
+        Returns:
+        --------
+        dict
+            JSON serializable bank state, one list entry per channel
+        """
+        state = {'algorithm': self.algorithm, 'n_channels': self.n_channels}
+        state.update(_get_state_fields(self, MPPTController._state_fields))
+        return state
+
+    def set_state(self, state: dict):
+        """
+        Restore a snapshot taken with ``get_state``
+
+        Parameters:
+        -----------
+        state : dict
+            Bank state
+        """
+        if state.get('algorithm') != self.algorithm or state.get('n_channels') != self.n_channels:
+            raise ValueError(f"Cannot restore {state.get('algorithm')} state of "
+                             f"{state.get('n_channels')} channels into a {self.algorithm} "
+                             f"bank of {self.n_channels} channels")
+
+        _set_state_fields(self, state, MPPTController._state_fields)
+
+    def enable_telemetry(self, dt: float = 1.0, settle_count: int = 4,
+                         disturbance_threshold: float = 0.05) -> BankTelemetry:
+        """
+        Per-channel telemetry, see ``MPPTController.enable_telemetry``
+
+        Parameters:
+        -----------
+        dt : float
+            Update interval (s) for convergence times
+        settle_count : int
+            Consecutive oscillating updates that count as converged
+        disturbance_threshold : float
+            Relative power change that restarts convergence
+
+        Returns:
+        --------
+        BankTelemetry
+            Counters, also available as ``self.telemetry``
+        """
+        self.telemetry = BankTelemetry(self.n_channels, dt=dt, settle_count=settle_count,
+                                       disturbance_threshold=disturbance_threshold)
+        return self.telemetry
+
+    def disable_telemetry(self):
+        """Stop recording telemetry"""
+        self.telemetry = None
+
+    def _telemetry_update(self, update, voltage: np.ndarray, current: np.ndarray) -> np.ndarray:
+        """Run the unwrapped ``update`` and record it, see ``_with_telemetry``"""
+        duty_prev = self.duty_cycle.copy()
+        duty_cycle = update(self, voltage, current)
+        self.telemetry.record(np.asarray(voltage, dtype=float) * current, duty_prev, duty_cycle)
+        return duty_cycle
+
+    def get_telemetry(self) -> Optional[dict]:
+        """
+        Telemetry counters, see ``BankTelemetry.get_counters``
+
+        Returns:
+        --------
+        dict or None
+            Counters, or None if telemetry is disabled
+        """
+        return None if self.telemetry is None else self.telemetry.get_counters()
+
+
+class PerturbAndObserveBank(MPPTControllerBank):
+    """Bank of Perturb and Observe (P&O) controllers"""
+
+    def __init__(self, n_channels: int, step_size=0.01, v_max: float = 50.0,
+                 v_min: float = 10.0):
+        """
+        Initialize P&O controller bank
+
+        Parameters:
+        -----------
+        n_channels : int
+            Number of controllers in the bank
+        step_size : float or array_like
+            Perturbation step size (duty cycle change), per channel or shared
+        v_max : float
+            Maximum voltage limit (V)
+        v_min : float
+            Minimum voltage limit (V)
+        """
+        super().__init__(n_channels, 'P&O')
+        self.step_size = np.broadcast_to(np.asarray(step_size, dtype=float), (n_channels,))
+        self.v_max = v_max
+        self.v_min = v_min
+
+    def update(self, voltage: np.ndarray, current: np.ndarray) -> np.ndarray:
+        """
+        Update duty cycles of all channels based on P&O algorithm
+
+        Parameters:
+        -----------
+        voltage : np.ndarray
+            PV voltage per channel (V)
+        current : np.ndarray
+            PV current per channel (A)
+
+        Returns:
+        --------
+        np.ndarray
+            Updated duty cycles (0-1)
+        """
+        voltage = np.asarray(voltage, dtype=float)
+        power = voltage * current
+
+        # Calculate changes
+        dP = power - self.p_prev
+        dV = voltage - self.v_prev
+
+        # Same direction when power and voltage moved together, no change
+        # when power did not change
+        direction = np.where((dP > 0) == (dV > 0), 1.0, -1.0)
+        self.duty_cycle += np.where(dP != 0, direction * self.step_size, 0.0)
+
+        # Limit duty cycle
+        np.clip(self.duty_cycle, 0.1, 0.9, out=self.duty_cycle)
+
+        # Update previous values
+        self.v_prev[:] = voltage
+        self.p_prev[:] = power
+
+        return self.duty_cycle.copy()
+
+
+class IncrementalConductanceBank(MPPTControllerBank):
+    """Bank of Incremental Conductance (InCond) controllers"""
+
+    def __init__(self, n_channels: int, step_size=0.01, tolerance=1e-3):
+        """
+        Initialize Incremental Conductance controller bank
+
+        Parameters:
+        -----------
+        n_channels : int
+            Number of controllers in the bank
+        step_size : float or array_like
+            Step size for duty cycle adjustment, per channel or shared
+        tolerance : float or array_like
+            Tolerance for MPP detection, per channel or shared
+        """
+        super().__init__(n_channels, 'InCond')
+        self.step_size = np.broadcast_to(np.asarray(step_size, dtype=float), (n_channels,))
+        self.tolerance = np.broadcast_to(np.asarray(tolerance, dtype=float), (n_channels,))
+
+    def update(self, voltage: np.ndarray, current: np.ndarray) -> np.ndarray:
+        """
+        Update duty cycles of all channels based on Incremental Conductance
+
+        Parameters:
+        -----------
+        voltage : np.ndarray
+            PV voltage per channel (V)
+        current : np.ndarray
+            PV current per channel (A)
+
+        Returns:
+        --------
+        np.ndarray
+            Updated duty cycles (0-1)
+        """
+        voltage = np.asarray(voltage, dtype=float)
+        current = np.asarray(current, dtype=float)
+
+        # Calculate changes
+        dV = voltage - self.v_prev
+        dI = current - self.i_prev
+
+        # Avoid division by zero
+        dV = np.where(np.abs(dV) < 1e-6, 1e-6, dV)
+
+        # Calculate conductances
+        inc_cond = dI / dV
+        with np.errstate(divide='ignore', invalid='ignore'):
+            inst_cond = np.where(voltage != 0, -current / voltage, 0.0)
+
+        # At MPP no change, left of MPP increase voltage (decrease duty
+        # cycle), right of MPP decrease voltage (increase duty cycle)
+        at_mpp = np.abs(inc_cond - inst_cond) < self.tolerance
+        step = np.where(inc_cond > inst_cond, -self.step_size, self.step_size)
+        self.duty_cycle += np.where(at_mpp, 0.0, step)
+
+        # Limit duty cycle
+        np.clip(self.duty_cycle, 0.1, 0.9, out=self.duty_cycle)
+
+        # Update previous values
+        self.v_prev[:] = voltage
+        self.i_prev[:] = current
+
+        return self.duty_cycle.copy()
+
+
+class ConstantVoltageBank(MPPTControllerBank):
+    """Bank of Constant Voltage (CV) controllers"""
+
+    def __init__(self, n_channels: int, v_ref=None, v_oc=None, ratio=0.76):
+        """
+        Initialize Constant Voltage controller bank
+
+        Parameters:
+        -----------
+        n_channels : int
+            Number of controllers in the bank
+        v_ref : float or array_like, optional
+            Reference voltage per channel (V)
+        v_oc : float or array_like, optional
+            Open circuit voltage per channel (V)
+        ratio : float or array_like
+            Ratio of Voc to use as reference (default 0.76)
+        """
+        super().__init__(n_channels, 'CV')
+
+        if v_ref is not None:
+            self.v_ref[:] = v_ref
+        elif v_oc is not None:
+            self.v_ref[:] = np.asarray(v_oc, dtype=float) * ratio
+        else:
+            raise ValueError("Either v_ref or v_oc must be provided")
+
+        self.Kp = 0.05  # Proportional gain for voltage regulation
+
+    def update(self, voltage: np.ndarray, current: np.ndarray) -> np.ndarray:
+        """
+        Update duty cycles of all channels to maintain constant voltage
+
+        Parameters:
+        -----------
+        voltage : np.ndarray
+            PV voltage per channel (V)
+        current : np.ndarray
+            PV current per channel (A)
+
+        Returns:
+        --------
+        np.ndarray
+            Updated duty cycles (0-1)
+        """
+        # Simple proportional controller
+        error = self.v_ref - voltage
+        self.duty_cycle += self.Kp * error
+
+        # Limit duty cycle
+        np.clip(self.duty_cycle, 0.1, 0.9, out=self.duty_cycle)
+
+        return self.duty_cycle.copy()
+
+
+class FuzzyLogicMPPTBank(MPPTControllerBank):
+    """Bank of Fuzzy Logic MPPT controllers"""
+
+    def __init__(self, n_channels: int, step_size=0.01, use_lookup_table: bool = False,
+                 table_resolution: float = 0.01):
+        """
+        Initialize Fuzzy Logic MPPT controller bank
+
+        Parameters:
+        -----------
+        n_channels : int
+            Number of controllers in the bank
+        step_size : float or array_like
+            Base step size for adjustments, per channel or shared; must be
+            shared when using the lookup table
+        use_lookup_table : bool
+            Evaluate the rule base through a compiled FuzzyLookupTable
+        table_resolution : float
+            Grid spacing of the lookup table in E and CE
+        """
+        super().__init__(n_channels, 'Fuzzy')
+        self.step_size = np.broadcast_to(np.asarray(step_size, dtype=float), (n_channels,))
+
+        self.lookup_table = None
+        if use_lookup_table:
+            if np.ndim(step_size) != 0:
+                raise ValueError("The fuzzy lookup table needs a shared step_size")
+            self.lookup_table = FuzzyLookupTable(float(step_size), table_resolution)
+
+    def fuzzy_inference(self, E: np.ndarray, CE: np.ndarray) -> np.ndarray:
+        """
+        Fuzzy inference for duty cycle change of all channels
+
+        Parameters:
+        -----------
+        E : np.ndarray
+            Error (normalized dP/dV)
+        CE : np.ndarray
+            Change in error
+
+        Returns:
+        --------
+        np.ndarray
+            Duty cycle change
+        """
+        if self.lookup_table is not None:
+            return self.lookup_table(E, CE)
+
+        output, total_weight = _fuzzy_rule_weights(E, CE, self.step_size)
+
+        # Defuzzification
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(total_weight > 0, output / total_weight, 0.0)
+
+    def update(self, voltage: np.ndarray, current: np.ndarray) -> np.ndarray:
+        """
+        Update duty cycles of all channels using fuzzy logic
+
+        Parameters:
+        -----------
+        voltage : np.ndarray
+            PV voltage per channel (V)
+        current : np.ndarray
+            PV current per channel (A)
+
+        Returns:
+        --------
+        np.ndarray
+            Updated duty cycles (0-1)
+        """
+        voltage = np.asarray(voltage, dtype=float)
+        power = voltage * current
+
+        # Calculate normalized error and change in error
+        dP = power - self.p_prev
+        dV = voltage - self.v_prev
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            E = np.where(np.abs(dV) > 1e-6, dP / (dV + 1e-6), 0.0)
+            CE = E - (self.p_prev / (self.v_prev + 1e-6))
+
+        # Normalize
+        E = np.clip(E / 100, -1, 1)
+        CE = np.clip(CE / 100, -1, 1)
+
+        # Update duty cycle
+        self.duty_cycle += self.fuzzy_inference(E, CE)
+        np.clip(self.duty_cycle, 0.1, 0.9, out=self.duty_cycle)
+
+        # Update previous values
+        self.v_prev[:] = voltage
+        self.p_prev[:] = power
+
+        return self.duty_cycle.copy()
+
+
+def create_mppt_controller_bank(algorithm: str = 'P&O', n_channels: int = 1,
+                                **kwargs) -> MPPTControllerBank:
+    """
+    Factory function to create a bank of MPPT controllers
+
+    Parameters:
+    -----------
+    algorithm : str
+        Algorithm type: 'P&O', 'InCond', 'CV', 'Fuzzy'
+    n_channels : int
+        Number of controllers in the bank
+    **kwargs
+        Additional parameters for specific algorithms, scalars or
+        per-channel arrays
+
+    Returns:
+    --------
+    MPPTControllerBank
+        Configured controller bank
+    """
+    banks = {
+        'P&O': PerturbAndObserveBank,
+        'InCond': IncrementalConductanceBank,
+        'CV': ConstantVoltageBank,
+        'Fuzzy': FuzzyLogicMPPTBank
+    }
+
+    if algorithm not in banks:
+        raise ValueError(f"Unknown algorithm: {algorithm}. Available: {list(banks.keys())}")
+
+    return banks[algorithm](n_channels, **kwargs)
+
+
+def create_mppt_controller(algorithm: str = 'P&O', **kwargs) -> MPPTController:
+    """
+    Factory function to create MPPT controller
+
+    Parameters:
+    -----------
+    algorithm : str
+        Algorithm type: 'P&O', 'InCond', 'CV', 'Fuzzy', 'GlobalScan',
+        'VS-P&O', 'VS-InCond', 'MPC' (requires ``panel``)
     **kwargs
         Additional parameters for specific algorithms
 
@@ -430,7 +2191,11 @@ def create_mppt_controller(algorithm: str = 'P&O', **kwargs) -> MPPTController:
         'P&O': PerturbAndObserve,
         'InCond': IncrementalConductance,
         'CV': ConstantVoltage,
-        'Fuzzy': FuzzyLogicMPPT
+        'Fuzzy': FuzzyLogicMPPT,
+        'GlobalScan': GlobalScanMPPT,
+        'VS-P&O': VariableStepPerturbAndObserve,
+        'VS-InCond': VariableStepIncrementalConductance,
+        'MPC': ModelPredictiveMPPT
     }
 
     if algorithm not in algorithms:
@@ -448,6 +2213,9 @@ if __name__ == "__main__":
     print("- Incremental Conductance (InCond)")
     print("- Constant Voltage (CV)")
     print("- Fuzzy Logic (Fuzzy)")
+    print("- Global Scan for partial shading (GlobalScan)")
+    print("- Variable Step P&O / InCond (VS-P&O, VS-InCond)")
+    print("- Model Predictive Control (MPC)")
     print("\nExample:")
     print("  mppt = create_mppt_controller('P&O', step_size=0.01)")
     print("  duty_cycle = mppt.update(voltage, current)")
@@ -8,11 +8,60 @@ Author: MPPT Simulation
 Date: 2025-11-05
 """
 
+import os
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.gridspec import GridSpec
+from collections import OrderedDict
 from mppt_controller import create_mppt_controller, PerturbAndObserve, IncrementalConductance
-from solar_panel import SolarPanel, SolarArray, create_standard_panel
+from typing import Iterator, Optional, Tuple
+from solar_panel import SolarPanel, SolarArray, MPPSurface, create_standard_panel
+from simulation_io import open_series, allocate_arrays, flush_arrays, RingBuffer
+from weather_profiles import profile_arrays, sample_function, sine_cloud_profile
+
+
+# Per-step quantities recorded by run_simulation and iter_simulation
+HISTORY_FIELDS = ('time', 'voltage', 'current', 'power', 'duty_cycle', 'efficiency')
+
+
+def _headless() -> bool:
+    """True if plots should not be shown (MPPT_HEADLESS=1)"""
+    return os.environ.get('MPPT_HEADLESS', '').lower() in ('1', 'true', 'yes')
+
+
+def _pyplot():
+    """
+    Import matplotlib.pyplot on first use
+
+    Plotting is only needed by ``plot_results`` and the demos, so batch
+    jobs importing this module never load matplotlib. In headless mode the
+    non-interactive Agg backend is selected.
+    """
+    import matplotlib
+    if _headless():
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def default_output_dir() -> str:
+    """Directory for demo plots: MPPT_OUTPUT_DIR, or the working directory"""
+    return os.environ.get('MPPT_OUTPUT_DIR', '.')
+
+
+def _finish_figure(plt, fig, save_path: Optional[str], show: Optional[bool]):
+    """Save the figure if requested, then show it or release it"""
+    if save_path:
+        directory = os.path.dirname(save_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        fig.savefig(save_path, dpi=300, bbox_inches='tight')
+        print(f"Plot saved to {save_path}")
+
+    if show is None:
+        show = not _headless()
+    if show:
+        plt.show()
+    else:
+        plt.close(fig)
 
 
 class BoostConverter:
@@ -63,11 +112,135 @@ class BoostConverter:
         return v_operating
 
 
+class AveragedBoostConverter:
+    """
+    Averaged state-space boost converter model
+
+    States are the PV-side capacitor voltage v_pv (C_in), the inductor
+    current i_L and the output capacitor voltage v_out (C_out), which feeds
+    a battery V_bat through the resistance R_bat:
+
+        C_in  dv_pv/dt  = i_pv(v_pv) - i_L
+        L     di_L/dt   = v_pv - (1 - D) v_out - R_L i_L
+        C_out dv_out/dt = (1 - D) i_L - (v_out - V_bat) / R_bat
+
+    Each step is integrated with backward Euler substeps (stable for the
+    stiff PV and battery branches). The PV current is linearized once per
+    step, i_pv(v) = i_0 + g (v - v_0), so a substep is a closed-form 3x3
+    elimination made of arithmetic only: states may be floats for one
+    channel or arrays for many channels at once.
+    """
+
+    def __init__(self, V_bat: float = 48.0, L: float = 1e-3, C_in: float = 220e-6,
+                 C_out: float = 1e-3, R_L: float = 0.05, R_bat: float = 0.1,
+                 max_substep: float = 1e-3, efficiency: float = 0.95):
+        """
+        Initialize Averaged Boost Converter
+
+        Parameters:
+        -----------
+        V_bat : float
+            Battery voltage (V)
+        L : float
+            Inductance (H)
+        C_in : float
+            PV-side capacitance (F)
+        C_out : float
+            Output capacitance (F)
+        R_L : float
+            Inductor series resistance (Ω)
+        R_bat : float
+            Battery connection resistance (Ω)
+        max_substep : float
+            Longest backward Euler substep (s)
+        efficiency : float
+            Converter efficiency (0-1), reported only
+        """
+        self.V_bat = V_bat
+        self.L = L
+        self.C_in = C_in
+        self.C_out = C_out
+        self.R_L = R_L
+        self.R_bat = R_bat
+        self.max_substep = max_substep
+        self.efficiency = efficiency
+        self.reset()
+
+    def reset(self, duty_cycle=0.5, i_pv=0.0):
+        """
+        Set the states to the steady state of a duty cycle
+
+        Parameters:
+        -----------
+        duty_cycle : float or np.ndarray
+            Duty cycle per channel (0-1)
+        i_pv : float or np.ndarray
+            PV current per channel (A); zero starts from an idle converter
+        """
+        a = 1 - duty_cycle
+        self.i_L = i_pv + 0 * a     # Broadcast to the channel shape
+        self.v_out = self.V_bat + self.R_bat * a * self.i_L
+        self.v_pv = a * self.v_out + self.R_L * self.i_L
+
+    def step(self, duty_cycle, i_pv, g_pv, dt: float):
+        """
+        Advance the converter by dt with a linearized PV current
+
+        Parameters:
+        -----------
+        duty_cycle : float or np.ndarray
+            Duty cycle per channel, held over the step (0-1)
+        i_pv : float or np.ndarray
+            PV current at the present v_pv (A)
+        g_pv : float or np.ndarray
+            PV slope dI/dV at the present v_pv (A/V), zero or negative
+        dt : float
+            Step length (s)
+
+        Returns:
+        --------
+        float or np.ndarray
+            PV voltage at the end of the step (V)
+        """
+        n_sub = max(1, int(np.ceil(dt / self.max_substep - 1e-9)))
+        h = dt / n_sub
+        a = 1 - duty_cycle
+
+        # i_pv(v) = i_c + g v with the linearization point folded in
+        i_c = i_pv - g_pv * self.v_pv
+
+        # Substep-invariant coefficients
+        c_in = self.C_in / h
+        c1 = c_in - g_pv
+        c3 = self.C_out / h + 1 / self.R_bat
+        l_h = self.L / h
+        b_out = self.V_bat / self.R_bat
+        den = l_h + self.R_L + 1 / c1 + a * a / c3
+
+        v, i, u = self.v_pv, self.i_L, self.v_out
+        for _ in range(n_sub):
+            # v' = A1 - i'/c1, u' = A3 + a i'/c3, then the inductor equation
+            A1 = (c_in * v + i_c) / c1
+            A3 = (self.C_out / h * u + b_out) / c3
+            i = (l_h * i + A1 - a * A3) / den
+            v = A1 - i / c1
+            u = A3 + a * i / c3
+
+        self.v_pv, self.i_L, self.v_out = v, i, u
+        return v
+
+
 class MPPTSimulator:
     """MPPT System Simulator"""
 
     def __init__(self, panel: SolarPanel, mppt_algorithm: str = 'P&O',
-                 load_voltage: float = 48.0):
+                 load_voltage: float = 48.0,
+                 mpp_surface: Optional[MPPSurface] = None,
+                 reference_cache_size: int = 1024,
+                 reference_quantum: Tuple[float, float] = (0.01, 0.01),
+                 mppt_options: Optional[dict] = None,
+                 converter_model: str = 'static',
+                 converter_options: Optional[dict] = None):
         """
         Initialize MPPT Simulator
 
@@ -79,24 +252,66 @@ class MPPTSimulator:
             MPPT algorithm to use
         load_voltage : float
             Load/battery voltage (V)
+        mpp_surface : MPPSurface, optional
+            Precomputed MPP surface of the panel used as the tracking
+            efficiency reference instead of solving for the MPP every step
+        reference_cache_size : int
+            Number of quantized (T, G) conditions whose reference MPP power
+            is kept in an LRU cache when no MPP surface is given
+        reference_quantum : Tuple[float, float]
+            Quantization step of temperature (°C) and irradiance (W/m²) for
+            the reference cache; the MPP is solved at the quantized condition
+        mppt_options : dict, optional
+            Controller parameters passed to ``create_mppt_controller``,
+            overriding the simulator defaults (e.g. ``{'step_size': 0.01}``)
+        converter_model : str
+            'static' maps the duty cycle directly to the PV voltage;
+            'averaged' integrates the AveragedBoostConverter dynamics
+        converter_options : dict, optional
+            Parameters of AveragedBoostConverter; V_bat defaults to
+            ``load_voltage``
         """
         self.panel = panel
-        self.converter = BoostConverter(V_out=load_voltage)
+        self.mpp_surface = mpp_surface
+        self.reference_cache_size = reference_cache_size
+        self.reference_quantum = reference_quantum
+        self._reference_cache = OrderedDict()
+        self.reference_hits = 0
+        self.reference_misses = 0
+        if converter_model == 'static':
+            self.converter = BoostConverter(V_out=load_voltage)
+        elif converter_model == 'averaged':
+            options = dict(converter_options or {})
+            options.setdefault('V_bat', load_voltage)
+            self.converter = AveragedBoostConverter(**options)
+        else:
+            raise ValueError(f"Unknown converter model: {converter_model}. "
+                             f"Available: ['static', 'averaged']")
+        self.converter_model = converter_model
+        self.dt = 0.01
 
         # Create MPPT controller
-        if mppt_algorithm == 'P&O':
-            self.mppt = create_mppt_controller('P&O', step_size=0.005)
-        elif mppt_algorithm == 'InCond':
-            self.mppt = create_mppt_controller('InCond', step_size=0.005)
+        options = dict(mppt_options or {})
+        if mppt_algorithm in ('P&O', 'InCond'):
+            options.setdefault('step_size', 0.005)
         elif mppt_algorithm == 'CV':
-            v_mpp, _, _ = panel.find_mpp()
-            self.mppt = create_mppt_controller('CV', v_ref=v_mpp)
-        else:
-            self.mppt = create_mppt_controller(mppt_algorithm)
+            if 'v_ref' not in options and 'v_oc' not in options:
+                v_mpp, _, _ = panel.find_mpp()
+                options['v_ref'] = v_mpp
+        elif mppt_algorithm == 'MPC':
+            options.setdefault('panel', panel)
+            options.setdefault('mpp_surface', mpp_surface)
+            if converter_model == 'averaged':
+                # Steady state of the averaged converter: v_pv = (1 - D) V_bat
+                options.setdefault('v_array', self.converter.V_bat)
+                options.setdefault('voltage_gain', 1.0)
+        self.mppt = create_mppt_controller(mppt_algorithm, **options)
 
         self.algorithm = mppt_algorithm
 
         # Simulation state
+        self._last_current = None
+        self.history = None
         self.time = []
         self.voltage_history = []
         self.current_history = []
@@ -104,6 +319,100 @@ class MPPTSimulator:
         self.duty_cycle_history = []
         self.efficiency_history = []
 
+    def plant_step(self, duty_cycle: float, temperature: float,
+                   irradiance: float) -> Tuple[float, float]:
+        """
+        Operating point of the panel for a commanded duty cycle
+
+        Parameters:
+        -----------
+        duty_cycle : float
+            Converter duty cycle (0-1)
+        temperature : float
+            Cell temperature (°C)
+        irradiance : float
+            Solar irradiance (W/m²)
+
+        Returns:
+        --------
+        Tuple[float, float]
+            PV voltage (V) and current (A)
+        """
+        if self.converter_model == 'averaged':
+            # Linearize the panel at the present PV voltage and integrate the
+            # converter over one simulation step
+            v_start = self.converter.v_pv
+            i_start = self.panel.get_current(v_start, temperature, irradiance,
+                                             initial_guess=self._last_current)
+            g_start = self.panel.get_slope(v_start, i_start, temperature, irradiance)
+            v_operating = self.converter.step(duty_cycle, i_start, g_start, self.dt)
+            self._last_current = i_start
+        else:
+            # Get operating voltage from duty cycle
+            v_operating = self.converter.get_input_voltage(duty_cycle, self.panel.V_oc)
+
+        # Get current from panel, warm-started from the last step
+        current = self.panel.get_current(v_operating, temperature, irradiance,
+                                         initial_guess=self._last_current)
+        self._last_current = current
+
+        return v_operating, current
+
+    def _reset_plant(self, dt: float):
+        """Reset controller, warm start and converter state for a new run"""
+        self.mppt.reset()
+        self._last_current = None
+        self.dt = dt
+        if self.converter_model == 'averaged':
+            self.converter.reset(self.mppt.duty_cycle)
+
+    def reference_power(self, temperature: float, irradiance: float) -> float:
+        """
+        Maximum power at the given conditions, the tracking efficiency reference
+
+        Read from the MPP surface if one is given; otherwise solved at the
+        quantized condition and kept in an LRU cache, so runs at constant
+        or recurring conditions solve each reference only once.
+
+        Parameters:
+        -----------
+        temperature : float
+            Cell temperature (°C)
+        irradiance : float
+            Solar irradiance (W/m²)
+
+        Returns:
+        --------
+        float
+            MPP power (W)
+        """
+        if self.mpp_surface is not None:
+            return self.mpp_surface.query(temperature, irradiance)[2]
+
+        q_T, q_G = self.reference_quantum
+        key = (round(temperature / q_T), round(irradiance / q_G))
+        cache = self._reference_cache
+        p_mpp = cache.get(key)
+
+        if p_mpp is not None:
+            cache.move_to_end(key)
+            self.reference_hits += 1
+            return p_mpp
+
+        self.reference_misses += 1
+        _, _, p_mpp = self.panel.find_mpp(key[0] * q_T, key[1] * q_G)
+        cache[key] = p_mpp
+        if len(cache) > self.reference_cache_size:
+            cache.popitem(last=False)
+
+        return p_mpp
+
+    def clear_reference_cache(self):
+        """Drop all cached reference MPP powers, e.g. after changing the panel"""
+        self._reference_cache.clear()
+        self.reference_hits = 0
+        self.reference_misses = 0
+
     def simulate_step(self, temperature: float, irradiance: float) -> dict:
         """
         Simulate one time step
@@ -120,20 +429,16 @@ class MPPTSimulator:
         dict
             Simulation results for this step
         """
-        # Get operating voltage from duty cycle
-        v_operating = self.converter.get_input_voltage(
-            self.mppt.duty_cycle, self.panel.V_oc
-        )
-
-        # Get current and power from panel
-        current = self.panel.get_current(v_operating, temperature, irradiance)
+        v_operating, current = self.plant_step(self.mppt.duty_cycle, temperature, irradiance)
         power = v_operating * current
 
-        # Update MPPT controller
+        # Update MPPT controller, model-based controllers read the cell temperature
+        if self.mppt.uses_temperature:
+            self.mppt.set_temperature(temperature)
         duty_cycle = self.mppt.update(v_operating, current)
 
         # Calculate tracking efficiency
-        _, _, p_mpp = self.panel.find_mpp(temperature, irradiance)
+        p_mpp = self.reference_power(temperature, irradiance)
         efficiency = (power / p_mpp * 100) if p_mpp > 0 else 0
 
         return {
@@ -147,7 +452,8 @@ class MPPTSimulator:
 
     def run_simulation(self, duration: float = 10.0, dt: float = 0.01,
                       temperature: float = 25.0, irradiance: float = 1000.0,
-                      variable_conditions: bool = False):
+                      variable_conditions: bool = False,
+                      output_dir: Optional[str] = None, weather=None):
         """
         Run MPPT simulation
 
@@ -157,64 +463,215 @@ class MPPTSimulator:
             Simulation duration (seconds)
         dt : float
             Time step (seconds)
-        temperature : float or callable
-            Temperature (°C) - can be constant or function of time
-        irradiance : float or callable
-            Irradiance (W/m²) - can be constant or function of time
+        temperature : float, callable, array_like or str
+            Temperature (°C) - constant, function of time, per-step series
+            (e.g. np.memmap) or path to a .npy/raw float64 file that is
+            memory-mapped
+        irradiance : float, callable, array_like or str
+            Irradiance (W/m²) - same forms as temperature
         variable_conditions : bool
-            Use variable environmental conditions
+            Use variable environmental conditions (the 'sine_cloud' profile)
+        output_dir : str, optional
+            Write the histories to memory-mapped .npy files in this
+            directory instead of keeping them in memory
+        weather : WeatherProfile or str, optional
+            Weather profile replacing temperature and irradiance: a
+            WeatherProfile, a built-in profile name or a .csv/.npy/.npz
+            file, resampled to dt once before the run
         """
-        # Reset simulation
-        self.mppt.reset()
-        self.time = []
-        self.voltage_history = []
-        self.current_history = []
-        self.power_history = []
-        self.duty_cycle_history = []
-        self.efficiency_history = []
+        n_steps = int(np.floor(duration / dt + 1e-9)) + 1
+        conditions = self._conditions(n_steps, dt, temperature, irradiance,
+                                      variable_conditions, weather)
+
+        histories = allocate_arrays(HISTORY_FIELDS, n_steps, output_dir)
+        self.time = histories['time']
+        self.voltage_history = histories['voltage']
+        self.current_history = histories['current']
+        self.power_history = histories['power']
+        self.duty_cycle_history = histories['duty_cycle']
+        self.efficiency_history = histories['efficiency']
 
         # Run simulation
-        t = 0
-        while t <= duration:
-            # Get environmental conditions
-            if variable_conditions:
-                # Simulate varying irradiance (cloud passing)
-                G = 1000.0 * (0.7 + 0.3 * np.sin(2 * np.pi * t / 5.0))
-                # Simulate varying temperature
-                T = 25.0 + 10.0 * np.sin(2 * np.pi * t / 20.0)
-            else:
-                if callable(temperature):
-                    T = temperature(t)
-                else:
-                    T = temperature
-
-                if callable(irradiance):
-                    G = irradiance(t)
-                else:
-                    G = irradiance
-
+        for k, t, T, G in conditions:
             # Simulate one step
             result = self.simulate_step(T, G)
 
             # Store results
-            self.time.append(t)
-            self.voltage_history.append(result['voltage'])
-            self.current_history.append(result['current'])
-            self.power_history.append(result['power'])
-            self.duty_cycle_history.append(result['duty_cycle'])
-            self.efficiency_history.append(result['efficiency'])
-
-            t += dt
-
-        # Convert to numpy arrays
-        self.time = np.array(self.time)
-        self.voltage_history = np.array(self.voltage_history)
-        self.current_history = np.array(self.current_history)
-        self.power_history = np.array(self.power_history)
-        self.duty_cycle_history = np.array(self.duty_cycle_history)
-        self.efficiency_history = np.array(self.efficiency_history)
-
-    def plot_results(self, save_path: str = None):
+            self.time[k] = t
+            self.voltage_history[k] = result['voltage']
+            self.current_history[k] = result['current']
+            self.power_history[k] = result['power']
+            self.duty_cycle_history[k] = result['duty_cycle']
+            self.efficiency_history[k] = result['efficiency']
+
+        flush_arrays(histories)
+
+    def run_trajectory(self, temperature, irradiance, dt: float = 0.01) -> dict:
+        """
+        Run a whole condition profile through the controller's trajectory kernel
+
+        Produces the same voltages, currents, powers and duty cycles as
+        calling ``simulate_step`` for every step, without per-step result
+        dicts; the MPP reference and tracking efficiency are computed for
+        all steps at once afterwards.
+
+        Parameters:
+        -----------
+        temperature : float or array_like
+            Cell temperature per step (°C)
+        irradiance : float or array_like
+            Solar irradiance per step (W/m²)
+        dt : float
+            Time step (seconds), used by the averaged converter model
+
+        Returns:
+        --------
+        dict
+            Arrays of voltage, current, power, duty_cycle, efficiency (%)
+            and p_mpp (W) per step
+        """
+        self._reset_plant(dt)
+
+        T, G = np.broadcast_arrays(np.asarray(temperature, dtype=float),
+                                   np.asarray(irradiance, dtype=float))
+        result = self.mppt.run_trajectory(self.plant_step, T, G)
+
+        if self.mpp_surface is not None:
+            _, _, p_mpp = self.mpp_surface.query(T, G)
+        else:
+            _, _, p_mpp = self.panel.find_mpp_batch(T, G)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result['efficiency'] = np.where(p_mpp > 0, result['power'] / p_mpp * 100, 0.0)
+        result['p_mpp'] = p_mpp
+
+        return result
+
+    def iter_simulation(self, duration: float = 10.0, dt: float = 0.01,
+                        temperature: float = 25.0, irradiance: float = 1000.0,
+                        variable_conditions: bool = False,
+                        block_size: Optional[int] = None,
+                        history_length: Optional[int] = None,
+                        weather=None) -> Iterator[dict]:
+        """
+        Run MPPT simulation incrementally
+
+        Generator version of ``run_simulation``: results are yielded as they
+        are computed instead of being stored for the whole horizon, so
+        consumers such as live dashboards or multi-day runs use constant
+        memory.
+
+        Parameters:
+        -----------
+        duration : float
+            Simulation duration (seconds)
+        dt : float
+            Time step (seconds)
+        temperature : float, callable, array_like or str
+            Temperature (°C), same forms as in ``run_simulation``
+        irradiance : float, callable, array_like or str
+            Irradiance (W/m²), same forms as in ``run_simulation``
+        variable_conditions : bool
+            Use variable environmental conditions
+        block_size : int, optional
+            Yield dicts of arrays of up to ``block_size`` steps instead of
+            one record per step
+        history_length : int, optional
+            Keep the most recent ``history_length`` steps in a RingBuffer
+            available as ``self.history``
+        weather : WeatherProfile or str, optional
+            Weather profile, as in ``run_simulation``
+
+        Yields:
+        -------
+        dict
+            Step record (time plus the ``simulate_step`` results) or a block
+            of ``HISTORY_FIELDS`` arrays
+        """
+        n_steps = int(np.floor(duration / dt + 1e-9)) + 1
+        conditions = self._conditions(n_steps, dt, temperature, irradiance,
+                                      variable_conditions, weather)
+
+        self.history = None if history_length is None else \
+            RingBuffer(HISTORY_FIELDS, history_length)
+
+        if block_size is None:
+            for k, t, T, G in conditions:
+                record = self.simulate_step(T, G)
+                record['time'] = t
+                if self.history is not None:
+                    self.history.append(record)
+                yield record
+            return
+
+        if block_size < 1:
+            raise ValueError("block_size must be at least 1")
+
+        for start in range(0, n_steps, block_size):
+            size = min(block_size, n_steps - start)
+            block = {field: np.empty(size) for field in HISTORY_FIELDS}
+
+            for j in range(size):
+                k, t, T, G = next(conditions)
+                record = self.simulate_step(T, G)
+                block['time'][j] = t
+                for field in HISTORY_FIELDS[1:]:
+                    block[field][j] = record[field]
+
+            if self.history is not None:
+                self.history.extend(block)
+            yield block
+
+    def _conditions(self, n_steps: int, dt: float, temperature, irradiance,
+                    variable_conditions: bool, weather=None) -> Iterator[Tuple[int, float, float, float]]:
+        """
+        Reset the simulation and generate (k, t, T, G) for every step
+
+        All inputs are turned into per-step arrays up front (profiles are
+        resampled and functions of time sampled once), so the simulation
+        loop only reads values. Inputs are validated before any step is
+        simulated, so ``run_simulation`` fails before allocating its output
+        arrays.
+        """
+        # Reset simulation
+        self._reset_plant(dt)
+
+        if weather is not None:
+            T, G = profile_arrays(weather, n_steps, dt)
+        elif variable_conditions:
+            # Simulate varying irradiance (cloud passing) and temperature
+            T, G = sine_cloud_profile(n_steps, dt)
+        else:
+            T = self._condition_series('temperature', temperature, n_steps, dt)
+            G = self._condition_series('irradiance', irradiance, n_steps, dt)
+
+        return self._condition_steps(n_steps, dt, T, G)
+
+    @staticmethod
+    def _condition_steps(n_steps, dt, temperature, irradiance, chunk_size: int = 4096):
+        """Generator behind ``_conditions``"""
+        # Convert one chunk at a time, so memory-mapped series stay on disk
+        for start in range(0, n_steps, chunk_size):
+            stop = min(start + chunk_size, n_steps)
+            T_chunk = np.asarray(temperature[start:stop], dtype=float).tolist()
+            G_chunk = np.asarray(irradiance[start:stop], dtype=float).tolist()
+            for k, T, G in zip(range(start, stop), T_chunk, G_chunk):
+                yield k, k * dt, T, G
+
+    @staticmethod
+    def _condition_series(name: str, source, n_steps: int, dt: float) -> np.ndarray:
+        """Per-step array of a constant, callable, series or file input"""
+        source = open_series(source)
+        if callable(source):
+            return sample_function(source, n_steps, dt)
+        if np.ndim(source) == 0:
+            return np.broadcast_to(float(source), (n_steps,))
+        if len(source) < n_steps:
+            raise ValueError(f"{name} series has {len(source)} samples, "
+                             f"simulation needs {n_steps}")
+        return source
+
+    def plot_results(self, save_path: str = None, show: Optional[bool] = None):
         """
         Plot simulation results
 
@@ -222,7 +679,12 @@ class MPPTSimulator:
         -----------
         save_path : str, optional
             Path to save the plot
+        show : bool, optional
+            Show the figure; defaults to True unless MPPT_HEADLESS is set
         """
+        plt = _pyplot()
+        from matplotlib.gridspec import GridSpec
+
         fig = plt.figure(figsize=(14, 10))
         gs = GridSpec(3, 2, figure=fig, hspace=0.3, wspace=0.3)
 
@@ -270,11 +732,7 @@ class MPPTSimulator:
         fig.suptitle(f'MPPT Simulation Results - {self.algorithm} Algorithm',
                     fontsize=16, fontweight='bold')
 
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            print(f"Plot saved to {save_path}")
-
-        plt.show()
+        _finish_figure(plt, fig, save_path, show)
 
         # Print statistics
         print(f"\n{self.algorithm} Algorithm Performance:")
@@ -284,8 +742,19 @@ class MPPTSimulator:
         print(f"  Max Efficiency: {np.max(self.efficiency_history):.2f}%")
 
 
-def compare_algorithms():
-    """Compare different MPPT algorithms"""
+def compare_algorithms(output_dir: Optional[str] = None, show: Optional[bool] = None):
+    """
+    Compare different MPPT algorithms
+
+    Parameters:
+    -----------
+    output_dir : str, optional
+        Directory for the comparison plot, default ``default_output_dir()``
+    show : bool, optional
+        Show the figure; defaults to True unless MPPT_HEADLESS is set
+    """
+    plt = _pyplot()
+
     print("Comparing MPPT Algorithms")
     print("=" * 50)
 
@@ -353,9 +822,8 @@ def compare_algorithms():
     ax4.grid(True, alpha=0.3)
 
     plt.tight_layout()
-    plt.savefig('/home/user/Chapman/mppt_comparison.png', dpi=300, bbox_inches='tight')
-    print("\nComparison plot saved to mppt_comparison.png")
-    plt.show()
+    _finish_figure(plt, fig, os.path.join(output_dir or default_output_dir(),
+                                          'mppt_comparison.png'), show)
 
     # Print comparison statistics
     print("\n" + "=" * 50)
@@ -367,8 +835,19 @@ def compare_algorithms():
         print(f"  Avg Efficiency: {np.mean(results[algo].efficiency_history):.2f}%")
 
 
-def demo_pv_characteristics():
-    """Demonstrate PV panel characteristics"""
+def demo_pv_characteristics(output_dir: Optional[str] = None, show: Optional[bool] = None):
+    """
+    Demonstrate PV panel characteristics
+
+    Parameters:
+    -----------
+    output_dir : str, optional
+        Directory for the characteristics plot, default ``default_output_dir()``
+    show : bool, optional
+        Show the figure; defaults to True unless MPPT_HEADLESS is set
+    """
+    plt = _pyplot()
+
     print("\nDemonstrating PV Panel Characteristics")
     print("=" * 50)
 
@@ -411,9 +890,8 @@ def demo_pv_characteristics():
     ax2.grid(True, alpha=0.3)
 
     plt.tight_layout()
-    plt.savefig('/home/user/Chapman/pv_characteristics.png', dpi=300, bbox_inches='tight')
-    print("PV characteristics plot saved to pv_characteristics.png")
-    plt.show()
+    _finish_figure(plt, fig, os.path.join(output_dir or default_output_dir(),
+                                          'pv_characteristics.png'), show)
 
 
 if __name__ == "__main__":
@@ -430,7 +908,7 @@ if __name__ == "__main__":
     panel = create_standard_panel('generic')
     sim = MPPTSimulator(panel, mppt_algorithm='P&O')
     sim.run_simulation(duration=5.0, dt=0.01, variable_conditions=True)
-    sim.plot_results(save_path='/home/user/Chapman/mppt_po_simulation.png')
+    sim.plot_results(save_path=os.path.join(default_output_dir(), 'mppt_po_simulation.png'))
 
     # Demo 3: Algorithm comparison
     print("\n" + "=" * 70)
@@ -0,0 +1,250 @@
+"""
+Parallel MPPT Parameter Sweeps
+
+This module runs grids of MPPTSimulator cases on a process pool:
+- Algorithms x step sizes x panel types x weather profiles
+- Each case runs in trajectory mode with controller telemetry
+- Results are collected into one columnar summary (dict of arrays)
+
+Author: MPPT Sweep Engine
+Date: 2026-10-18
+"""
+
+import time
+import itertools
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+from solar_panel import MPPSurface, create_standard_panel
+from mppt_simulation import MPPTSimulator
+from weather_profiles import profile_arrays
+
+
+# Controller parameter that the step size axis of a sweep sets; algorithms
+# not listed have no step size and run once per step size axis
+STEP_PARAMETERS = {
+    'P&O': 'step_size',
+    'InCond': 'step_size',
+    'Fuzzy': 'step_size',
+    'GlobalScan': 'step_size',
+    'VS-P&O': 'step_max',
+    'VS-InCond': 'step_max',
+}
+
+SUMMARY_FIELDS = ('algorithm', 'step_size', 'panel_type', 'weather', 'mean_power',
+                  'energy', 'mean_efficiency', 'min_efficiency', 'convergence_time',
+                  'reversal_rate', 'runtime')
+
+
+def build_cases(algorithms: Sequence[str], step_sizes: Sequence[float],
+                panel_types: Sequence[str], weather_profiles: Sequence[str],
+                duration: float = 5.0, dt: float = 0.01,
+                cache_dir: Optional[str] = None,
+                converter_model: str = 'static') -> List[dict]:
+    """
+    Expand a sweep grid into a list of cases
+
+    Parameters:
+    -----------
+    algorithms : sequence of str
+        Controller names accepted by ``create_mppt_controller``
+    step_sizes : sequence of float
+        Step sizes, applied to the parameter in ``STEP_PARAMETERS``
+    panel_types : sequence of str
+        Panel names accepted by ``create_standard_panel``
+    weather_profiles : sequence of str
+        Built-in profile names or .csv/.npy/.npz weather files, see
+        ``weather_profiles.profile_arrays``
+    duration : float
+        Simulated time per case (s)
+    dt : float
+        Time step (s)
+    cache_dir : str, optional
+        Directory of cached MPP surfaces for model-based controllers
+    converter_model : str
+        Converter model of MPPTSimulator, 'static' or 'averaged'
+
+    Returns:
+    --------
+    list of dict
+        One picklable case description per simulation
+    """
+    n_steps = int(np.floor(duration / dt + 1e-9)) + 1
+    for name in weather_profiles:
+        profile_arrays(name, n_steps, dt)   # Fail early on unknown or short profiles
+
+    cases = []
+    for panel_type, weather, algorithm in itertools.product(
+            panel_types, weather_profiles, algorithms):
+        steps = step_sizes if algorithm in STEP_PARAMETERS else [None]
+        for step_size in steps:
+            cases.append({
+                'algorithm': algorithm,
+                'step_size': step_size,
+                'panel_type': panel_type,
+                'weather': weather,
+                'duration': duration,
+                'dt': dt,
+                'cache_dir': cache_dir,
+                'converter_model': converter_model,
+            })
+    return cases
+
+
+def run_case(case: dict) -> dict:
+    """
+    Simulate one sweep case
+
+    Parameters:
+    -----------
+    case : dict
+        Case description from ``build_cases``
+
+    Returns:
+    --------
+    dict
+        One summary row, see ``SUMMARY_FIELDS``
+    """
+    start = time.perf_counter()
+
+    algorithm = case['algorithm']
+    panel = create_standard_panel(case['panel_type'])
+    n_steps = int(np.floor(case['duration'] / case['dt'] + 1e-9)) + 1
+    T, G = profile_arrays(case['weather'], n_steps, case['dt'])
+
+    options = {}
+    if case['step_size'] is not None:
+        options[STEP_PARAMETERS[algorithm]] = case['step_size']
+
+    mpp_surface = None
+    if algorithm == 'MPC':
+        mpp_surface = MPPSurface.for_model(panel, case['cache_dir'])
+
+    sim = MPPTSimulator(panel, algorithm, mpp_surface=mpp_surface, mppt_options=options,
+                        converter_model=case['converter_model'])
+    sim.mppt.enable_telemetry(dt=case['dt'])
+    result = sim.run_trajectory(T, G, dt=case['dt'])
+    telemetry = sim.mppt.get_telemetry()
+
+    convergence_times = telemetry['convergence_times']
+    return {
+        'algorithm': algorithm,
+        'step_size': np.nan if case['step_size'] is None else case['step_size'],
+        'panel_type': case['panel_type'],
+        'weather': case['weather'],
+        'mean_power': float(np.mean(result['power'])),
+        'energy': float(np.sum(result['power']) * case['dt']),
+        'mean_efficiency': float(np.mean(result['efficiency'])),
+        'min_efficiency': float(np.min(result['efficiency'])),
+        'convergence_time': float(np.mean(convergence_times)) if convergence_times else np.nan,
+        'reversal_rate': telemetry['reversal_rate'],
+        'runtime': time.perf_counter() - start,
+    }
+
+
+def collect_rows(rows: Sequence[dict]) -> Dict[str, np.ndarray]:
+    """
+    Turn summary rows into columns
+
+    Parameters:
+    -----------
+    rows : sequence of dict
+        Rows from ``run_case``
+
+    Returns:
+    --------
+    dict
+        One array per field of ``SUMMARY_FIELDS``; text fields are string
+        arrays, the others float arrays
+    """
+    columns = {}
+    for field in SUMMARY_FIELDS:
+        values = [row[field] for row in rows]
+        if values and isinstance(values[0], str):
+            columns[field] = np.array(values, dtype=str)
+        else:
+            columns[field] = np.array(values, dtype=float)
+    return columns
+
+
+def run_sweep(algorithms: Sequence[str] = ('P&O', 'InCond'),
+              step_sizes: Sequence[float] = (0.005,),
+              panel_types: Sequence[str] = ('generic',),
+              weather_profiles: Sequence[str] = ('sine_cloud',),
+              duration: float = 5.0, dt: float = 0.01,
+              max_workers: Optional[int] = None,
+              cache_dir: Optional[str] = None,
+              converter_model: str = 'static') -> Dict[str, np.ndarray]:
+    """
+    Run a full sweep grid on a process pool
+
+    Parameters:
+    -----------
+    algorithms : sequence of str
+        Controller names
+    step_sizes : sequence of float
+        Step sizes of the controllers that have one
+    panel_types : sequence of str
+        Standard panel names
+    weather_profiles : sequence of str
+        Built-in profile names or .csv/.npy/.npz weather files, see
+        ``weather_profiles.profile_arrays``
+    duration : float
+        Simulated time per case (s)
+    dt : float
+        Time step (s)
+    max_workers : int, optional
+        Number of worker processes, default one per CPU; 1 runs all cases
+        in the calling process
+    cache_dir : str, optional
+        Directory of cached MPP surfaces for model-based controllers, so
+        workers build each surface only once
+    converter_model : str
+        Converter model of MPPTSimulator; with 'averaged' the converter
+        dynamics make the results depend on dt
+
+    Returns:
+    --------
+    dict
+        Columnar summary, one array entry per case, see ``collect_rows``
+    """
+    cases = build_cases(algorithms, step_sizes, panel_types, weather_profiles,
+                        duration, dt, cache_dir, converter_model)
+
+    if max_workers == 1:
+        rows = [run_case(case) for case in cases]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            rows = list(executor.map(run_case, cases))
+
+    return collect_rows(rows)
+
+
+def print_summary(summary: Dict[str, np.ndarray]):
+    """
+    Print a columnar summary as a table
+
+    Parameters:
+    -----------
+    summary : dict
+        Result of ``run_sweep``
+    """
+    print(f"{'Algorithm':<11}{'Step':>8}  {'Panel':<22}{'Weather':<13}"
+          f"{'Power (W)':>10}{'Eff (%)':>9}{'Conv (s)':>10}")
+    for k in range(len(summary['algorithm'])):
+        print(f"{summary['algorithm'][k]:<11}{summary['step_size'][k]:>8.4f}  "
+              f"{summary['panel_type'][k]:<22}{summary['weather'][k]:<13}"
+              f"{summary['mean_power'][k]:>10.2f}{summary['mean_efficiency'][k]:>9.2f}"
+              f"{summary['convergence_time'][k]:>10.3f}")
+
+
+if __name__ == "__main__":
+    # Example usage: algorithm and step size comparison
+    print("MPPT Parameter Sweep")
+    print("=" * 50)
+
+    summary = run_sweep(algorithms=['InCond', 'VS-InCond', 'Fuzzy', 'MPC'],
+                        step_sizes=[0.002, 0.005, 0.01],
+                        panel_types=['generic', 'sunpower_e20'],
+                        weather_profiles=['sine_cloud', 'cloud_edges'])
+    print_summary(summary)
@@ -0,0 +1,184 @@
+"""
+Simulation Input/Output Helpers
+
+This module provides memory-mapped access to long simulation inputs and
+outputs:
+- Weather series from .npy files or raw binary files, opened with np.memmap
+- Preallocated result arrays, optionally backed by .npy files on disk
+- Fixed-capacity ring buffers for bounded-memory histories of long runs
+
+Author: Simulation I/O
+Date: 2026-10-18
+"""
+
+import os
+import numpy as np
+from typing import Dict, Optional, Sequence
+
+
+def open_series(source, dtype=np.float64):
+    """
+    Open a time series without loading it into memory
+
+    Parameters:
+    -----------
+    source : str, os.PathLike, array_like, float or callable
+        Path to a .npy file (memory-mapped read-only), path to a raw
+        binary file of ``dtype`` values (memory-mapped with np.memmap),
+        an array (returned as is) or a constant/callable (returned
+        unchanged)
+    dtype : data-type
+        Element type of raw binary files
+
+    Returns:
+    --------
+    np.ndarray, float or callable
+        Indexable series, or the unchanged constant/callable
+    """
+    if isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+        if path.endswith('.npy'):
+            return np.load(path, mmap_mode='r')
+        return np.memmap(path, dtype=dtype, mode='r')
+
+    if callable(source) or np.ndim(source) == 0:
+        return source
+
+    return np.asarray(source)
+
+
+def allocate_arrays(fields: Sequence[str], length: int,
+                    output_dir: Optional[str] = None,
+                    dtype=np.float64) -> Dict[str, np.ndarray]:
+    """
+    Preallocate one result array per field
+
+    Parameters:
+    -----------
+    fields : sequence of str
+        Field names
+    length : int
+        Number of elements per array
+    output_dir : str, optional
+        If given, each array is a memory-mapped ``<field>.npy`` file in this
+        directory that can be reopened with ``np.load(path, mmap_mode='r')``
+    dtype : data-type
+        Element type
+
+    Returns:
+    --------
+    dict
+        Arrays keyed by field name
+    """
+    if output_dir is None:
+        return {field: np.empty(length, dtype=dtype) for field in fields}
+
+    os.makedirs(output_dir, exist_ok=True)
+    return {field: np.lib.format.open_memmap(os.path.join(output_dir, f"{field}.npy"),
+                                             mode='w+', dtype=dtype, shape=(length,))
+            for field in fields}
+
+
+def flush_arrays(arrays: Dict[str, np.ndarray]):
+    """
+    Write memory-mapped arrays back to disk
+
+    Parameters:
+    -----------
+    arrays : dict
+        Arrays from ``allocate_arrays``; in-memory arrays are ignored
+    """
+    for array in arrays.values():
+        if isinstance(array, np.memmap):
+            array.flush()
+
+
+class RingBuffer:
+    """
+    Fixed-capacity history of the most recent samples of several fields
+
+    Memory stays constant however long the run is; once full, each new
+    sample overwrites the oldest one.
+    """
+
+    def __init__(self, fields: Sequence[str], capacity: int, dtype=np.float64):
+        """
+        Initialize Ring Buffer
+
+        Parameters:
+        -----------
+        fields : sequence of str
+            Field names
+        capacity : int
+            Number of samples kept per field
+        dtype : data-type
+            Element type
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.fields = tuple(fields)
+        self.capacity = capacity
+        self._data = {field: np.empty(capacity, dtype=dtype) for field in self.fields}
+        self._next = 0        # Index of the next write
+        self.total = 0        # Samples appended since the last clear
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+
+    def clear(self):
+        """Drop all samples"""
+        self._next = 0
+        self.total = 0
+
+    def append(self, record: dict):
+        """
+        Add one sample
+
+        Parameters:
+        -----------
+        record : dict
+            One value per field; other keys are ignored
+        """
+        k = self._next
+        for field in self.fields:
+            self._data[field][k] = record[field]
+        self._next = (k + 1) % self.capacity
+        self.total += 1
+
+    def extend(self, block: dict):
+        """
+        Add a block of samples
+
+        Parameters:
+        -----------
+        block : dict
+            Equal-length arrays, one per field; other keys are ignored
+        """
+        n = len(block[self.fields[0]])
+        skip = max(n - self.capacity, 0)   # Samples overwritten within the block
+        count = n - skip
+
+        first = min(count, self.capacity - self._next)
+        for field in self.fields:
+            values = np.asarray(block[field])[skip:]
+            data = self._data[field]
+            data[self._next:self._next + first] = values[:first]
+            data[:count - first] = values[first:]
+
+        self._next = (self._next + count) % self.capacity
+        self.total += n
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Samples currently held, oldest first
+
+        Returns:
+        --------
+        dict
+            One array copy per field
+        """
+        if self.total < self.capacity:
+            return {field: data[:self._next].copy() for field, data in self._data.items()}
+        return {field: np.concatenate([data[self._next:], data[:self._next]])
+                for field, data in self._data.items()}
@@ -11,11 +11,371 @@ Author: Solar Panel Model Implementation
 Date: 2025-11-05
 """
 
+import math
 import numpy as np
-from typing import Tuple, Optional
+from typing import Tuple, Optional, NamedTuple
+from bisect import bisect_right
+from collections import OrderedDict
+import hashlib
+import os
 import warnings
 
 
+SOLVERS = ('newton', 'lambertw')
+
+# Physical constants
+_Q = 1.602176634e-19   # Elementary charge (C)
+_K_B = 1.380649e-23    # Boltzmann constant (J/K)
+
+_INV_PHI = (np.sqrt(5.0) - 1) / 2  # Inverse golden ratio
+
+# Default MPP surface grid: -20..80 °C in 5 °C steps, 100..1400 W/m² in 25 W/m²
+# steps and denser points down to 0.5 W/m² where V_mpp bends sharply
+_MPP_TEMPERATURES = np.linspace(-20.0, 80.0, 21)
+_MPP_IRRADIANCES = np.concatenate([[0.5, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.5, 10.0, 12.5,
+                                    15.0, 17.5, 20.0, 25.0, 30.0, 35.0, 40.0, 50.0,
+                                    60.0, 70.0, 80.0, 90.0],
+                                   np.linspace(100.0, 1400.0, 53)])
+
+
+class OperatingCondition(NamedTuple):
+    """Diode parameters at one (temperature, irradiance) operating condition"""
+    nV_t: float   # Modified thermal voltage n*V_t (V)
+    I_ph: float   # Photocurrent (A)
+    I_0: float    # Reverse saturation current (A)
+
+
+def _diode_parameters(temperature, irradiance, N_s, n, T_nom, G_nom,
+                      I_ph_nom, K_i, I_0_nom):
+    """
+    Temperature and irradiance dependent single diode parameters
+
+    Works on scalars and on broadcastable arrays of conditions and
+    panel parameters.
+
+    Parameters:
+    -----------
+    temperature, irradiance : array_like
+        Cell temperature (°C) and solar irradiance (W/m²)
+    N_s, n, T_nom, G_nom, I_ph_nom, K_i, I_0_nom : array_like
+        Cells in series, ideality factor, reference temperature (°C) and
+        irradiance (W/m²), reference photocurrent (A), current temperature
+        coefficient (A/°C) and reference saturation current (A)
+
+    Returns:
+    --------
+    tuple
+        Modified thermal voltage n*V_t (V), photocurrent I_ph (A) and
+        reverse saturation current I_0 (A)
+    """
+    T_K = temperature + 273.15
+    T_nom_K = T_nom + 273.15
+    V_t = N_s * _K_B * T_K / _Q
+
+    dT = temperature - T_nom
+    I_ph = (I_ph_nom + K_i * dT) * (irradiance / G_nom)
+
+    I_0 = I_0_nom * (T_K / T_nom_K) ** 3 * \
+          np.exp(_Q * 1.12 / (n * _K_B) * (1 / T_nom_K - 1 / T_K))
+
+    return n * V_t, I_ph, I_0
+
+
+def _newton_solve(voltage, I_ph, I_0, nV_t, R_s, R_sh,
+                  initial_guess=None, tol: float = 1e-6,
+                  max_iter: int = 50) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized Newton-Raphson solve of the single diode equation
+
+    All inputs are broadcast against each other. Each element iterates
+    until the error bound of its latest iterate falls below ``tol``;
+    converged elements are dropped from the working set so the remaining
+    iterations only touch the points that still need them.
+
+    Newton converges quadratically on this equation with
+    |f''/(2 f')| < R_s/(2 n*V_t), so after an update of size dI the new
+    iterate is within R_s/(2 n*V_t) * dI**2 of the root. Stopping on that
+    bound instead of on dI itself saves the confirming iteration, which
+    lets a good initial guess converge in a single step.
+
+    Parameters:
+    -----------
+    voltage : array_like
+        Terminal voltage (V)
+    I_ph, I_0, nV_t, R_s, R_sh : array_like
+        Photocurrent (A), saturation current (A), modified thermal
+        voltage n*V_t (V), series and shunt resistance (Ω)
+    initial_guess : array_like, optional
+        Starting current (A), defaults to I_ph
+    tol : float
+        Convergence tolerance on the current update (A)
+    max_iter : int
+        Maximum number of iterations
+
+    Returns:
+    --------
+    Tuple[np.ndarray, np.ndarray]
+        Current (A, not clipped) and number of iterations per element
+    """
+    if initial_guess is None:
+        initial_guess = I_ph
+    arrays = np.broadcast_arrays(*[np.asarray(x, dtype=float) for x in
+                                   (voltage, I_ph, I_0, nV_t, R_s, R_sh,
+                                    initial_guess)])
+    shape = arrays[0].shape
+    V, I_ph, I_0, nV_t, R_s, R_sh, I = [a.ravel() for a in arrays]
+    I = I.copy()
+
+    current = I.copy()
+    iterations = np.zeros(current.size, dtype=int)
+    idx = np.arange(current.size)
+
+    for k in range(max_iter):
+        if idx.size == 0:
+            break
+
+        V_d = V + I * R_s
+        e = np.exp(V_d / nV_t)
+
+        # Current equation and its derivative
+        f = I_ph - I - I_0 * (e - 1) - V_d / R_sh
+        df = -1 - I_0 * R_s / nV_t * e - R_s / R_sh
+
+        I_new = I - f / df
+        dI = np.abs(I_new - I)
+        done = R_s / (2 * nV_t) * dI * dI < tol
+
+        current[idx] = I_new
+        iterations[idx] = k + 1
+
+        keep = ~done
+        if not keep.all():
+            idx = idx[keep]
+            V, I_ph, I_0, nV_t, R_s, R_sh = (V[keep], I_ph[keep], I_0[keep],
+                                             nV_t[keep], R_s[keep], R_sh[keep])
+            I_new = I_new[keep]
+        I = I_new
+
+    return current.reshape(shape), iterations.reshape(shape)
+
+
+def _lambertw_exp(x):
+    """
+    Principal branch of the Lambert W function evaluated at exp(x)
+
+    Uses ``scipy.special.lambertw`` where exp(x) is representable and a
+    fixed number of Newton steps on w + ln(w) = x above that, so the
+    result stays finite for arbitrarily large arguments.
+
+    Parameters:
+    -----------
+    x : array_like
+        Logarithm of the Lambert W argument
+
+    Returns:
+    --------
+    np.ndarray
+        W(exp(x))
+    """
+    # Imported here so that Newton-only users never load scipy
+    from scipy.special import lambertw
+
+    x = np.asarray(x, dtype=float)
+    w = np.empty_like(x)
+
+    small = x < 500.0
+    w[small] = lambertw(np.exp(x[small])).real
+
+    big = ~small
+    if big.any():
+        xb = x[big]
+        wb = xb - np.log(xb)
+        for _ in range(4):
+            wb = wb * (1 + xb - np.log(wb)) / (1 + wb)
+        w[big] = wb
+
+    return w
+
+
+def _lambertw_solve(voltage, I_ph, I_0, nV_t, R_s, R_sh) -> np.ndarray:
+    """
+    Explicit solution of the single diode equation for the current
+
+    I = (R_sh*(I_ph + I_0) - V)/(R_s + R_sh) - nV_t/R_s * W(theta)
+
+    with the Lambert W argument handled in log space to avoid overflow
+    near and above open circuit voltage. Requires R_s > 0.
+
+    Parameters:
+    -----------
+    voltage : array_like
+        Terminal voltage (V)
+    I_ph, I_0, nV_t, R_s, R_sh : array_like
+        Photocurrent (A), saturation current (A), modified thermal
+        voltage n*V_t (V), series and shunt resistance (Ω)
+
+    Returns:
+    --------
+    np.ndarray
+        Current (A, not clipped)
+    """
+    voltage = np.asarray(voltage, dtype=float)
+    R_total = R_s + R_sh
+
+    log_theta = np.log(R_s * R_sh * I_0 / (nV_t * R_total)) + \
+                R_sh * (R_s * (I_ph + I_0) + voltage) / (nV_t * R_total)
+
+    return (R_sh * (I_ph + I_0) - voltage) / R_total - \
+           nV_t / R_s * _lambertw_exp(log_theta)
+
+
+def _lambertw_voltage(current, I_ph, I_0, nV_t, R_s, R_sh) -> np.ndarray:
+    """
+    Explicit solution of the single diode equation for the voltage
+
+    V = (I_ph + I_0 - I)*R_sh - I*R_s - nV_t * W(psi)
+
+    with the Lambert W argument handled in log space.
+
+    Parameters:
+    -----------
+    current : array_like
+        Terminal current (A)
+    I_ph, I_0, nV_t, R_s, R_sh : array_like
+        Photocurrent (A), saturation current (A), modified thermal
+        voltage n*V_t (V), series and shunt resistance (Ω)
+
+    Returns:
+    --------
+    np.ndarray
+        Voltage (V); negative when the current exceeds the photocurrent
+    """
+    current = np.asarray(current, dtype=float)
+    log_psi = np.log(I_0 * R_sh / nV_t) + R_sh * (I_ph + I_0 - current) / nV_t
+
+    return (I_ph + I_0 - current) * R_sh - current * R_s - \
+           nV_t * _lambertw_exp(log_psi)
+
+
+def _golden_section_max(func, lo, hi, tol: float = 1e-3) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized golden-section search for the maximum of unimodal functions
+
+    Every element of the broadcast of ``lo`` and ``hi`` is an independent
+    bracket. All brackets are narrowed together, one function evaluation
+    per iteration, until the widest one is below ``tol``.
+
+    Parameters:
+    -----------
+    func : callable
+        Function of an array shaped like the brackets
+    lo, hi : array_like
+        Lower and upper bracket limits
+    tol : float
+        Final bracket width
+
+    Returns:
+    --------
+    Tuple[np.ndarray, np.ndarray]
+        Location of the maximum and the function value there
+    """
+    lo, hi = np.broadcast_arrays(np.asarray(lo, dtype=float),
+                                 np.asarray(hi, dtype=float))
+    lo, hi = lo.copy(), hi.copy()
+
+    c = hi - _INV_PHI * (hi - lo)
+    d = lo + _INV_PHI * (hi - lo)
+    fc = func(c)
+    fd = func(d)
+
+    width = max(float(np.max(hi - lo, initial=0.0)), tol)
+    n_iter = int(np.ceil(np.log(width / tol) / np.log(1 / _INV_PHI)))
+
+    for _ in range(n_iter):
+        # Ties go left so a flat zero-power region above V_oc is discarded
+        left = fc >= fd
+
+        hi = np.where(left, d, hi)
+        lo = np.where(left, lo, c)
+
+        x_new = np.where(left, hi - _INV_PHI * (hi - lo), lo + _INV_PHI * (hi - lo))
+        f_new = func(x_new)
+
+        c, d = np.where(left, x_new, d), np.where(left, c, x_new)
+        fc, fd = np.where(left, f_new, fd), np.where(left, fc, f_new)
+
+    best = fc >= fd
+    return np.where(best, c, d), np.where(best, fc, fd)
+
+
+def _mpp_newton(I_ph: float, I_0: float, nV_t: float, R_s: float, R_sh: float,
+                tol: float = 1e-3, max_iter: int = 50) -> Tuple[float, float, float, int]:
+    """
+    Maximum power point of one operating condition by Newton on dP/dV_d = 0
+
+    In terms of the diode voltage V_d = V + I*R_s the single diode equation
+    is explicit, I = I_ph - I_0*(exp(V_d/nV_t) - 1) - V_d/R_sh and
+    V = V_d - I*R_s, so every evaluation of P(V_d) and its derivatives is a
+    single exponential on plain floats. The maximum is bracketed by V_d = 0
+    (dP/dV_d > 0) and the ideal open-circuit diode voltage (I < 0,
+    dP/dV_d < 0); Newton steps leaving the bracket fall back to bisection.
+
+    Parameters:
+    -----------
+    I_ph, I_0, nV_t, R_s, R_sh : float
+        Photocurrent (A), saturation current (A), modified thermal voltage
+        n*V_t (V), series and shunt resistance (Ω)
+    tol : float
+        Voltage tolerance of the MPP (V)
+    max_iter : int
+        Maximum number of Newton iterations
+
+    Returns:
+    --------
+    Tuple[float, float, float, int]
+        MPP voltage (V), current (A), power (W) and the number of
+        evaluations of the P-V curve
+    """
+    if I_ph <= 0:
+        return 0.0, 0.0, 0.0, 0
+
+    lo = 0.0
+    hi = nV_t * math.log(I_ph / I_0 + 1)
+    x = hi - nV_t * math.log(1 + hi / nV_t)   # Classic V_mpp estimate
+
+    evaluations = 0
+    for _ in range(max_iter):
+        evaluations += 1
+        E = math.exp(x / nV_t)
+        I = I_ph - I_0 * (E - 1) - x / R_sh
+        V = x - I * R_s
+
+        # First and second derivative of P = V*I with respect to V_d
+        g = I_0 / nV_t * E + 1 / R_sh
+        dg = I_0 / (nV_t * nV_t) * E
+        dP = (1 + R_s * g) * I - V * g
+        d2P = R_s * dg * I - 2 * (1 + R_s * g) * g - V * dg
+
+        if dP > 0:
+            lo = x
+        else:
+            hi = x
+
+        x_new = x - dP / d2P if d2P < 0 else lo - 1.0
+        if not lo < x_new < hi:
+            x_new = 0.5 * (lo + hi)
+
+        step = abs(x_new - x) * (1 + R_s * g)
+        x = x_new
+        if step < tol:
+            break
+
+    evaluations += 1
+    I = I_ph - I_0 * (math.exp(x / nV_t) - 1) - x / R_sh
+    V = x - I * R_s
+    return V, I, V * I, evaluations
+
+
 class SolarPanel:
     """
     Solar Panel Model using Single Diode Equivalent Circuit
@@ -37,6 +397,9 @@ class SolarPanel:
                  G_nom: float = 1000.0,   # Nominal irradiance (W/m²)
                  K_v: float = -0.0032,    # Temperature coefficient for voltage (V/°C)
                  K_i: float = 0.0005,     # Temperature coefficient for current (A/°C)
+                 solver: str = 'newton',  # Diode equation solver
+                 condition_cache_size: int = 128,  # Memoized (T, G) conditions
+                 warm_start: bool = False,  # Start Newton from the last solution
                  ):
         """
         Initialize Solar Panel Model
@@ -61,7 +424,19 @@ class SolarPanel:
             Temperature coefficient for voltage (V/°C)
         K_i : float
             Temperature coefficient for current (A/°C)
+        solver : str
+            Single diode equation solver: 'newton' (iterative) or
+            'lambertw' (explicit, no iteration)
+        condition_cache_size : int
+            Number of (temperature, irradiance) operating conditions whose
+            diode parameters are memoized for scalar queries
+        warm_start : bool
+            Start each scalar Newton solve from the previous solution
+            instead of the photocurrent
         """
+        if solver not in SOLVERS:
+            raise ValueError(f"Unknown solver: {solver}. Available: {list(SOLVERS)}")
+
         self.V_oc = V_oc
         self.I_sc = I_sc
         self.V_mp = V_mp
@@ -72,10 +447,20 @@ class SolarPanel:
         self.G_nom = G_nom
         self.K_v = K_v
         self.K_i = K_i
+        self.solver = solver
+        self.condition_cache_size = condition_cache_size
+        self.warm_start = warm_start
+
+        # Newton solver statistics
+        self._last_current = None
+        self.last_iterations = 0
+        self.last_mpp_evaluations = 0
+        self.solver_calls = 0
+        self.solver_iterations = 0
 
         # Physical constants
-        self.q = 1.602176634e-19  # Elementary charge (C)
-        self.k = 1.380649e-23      # Boltzmann constant (J/K)
+        self.q = _Q    # Elementary charge (C)
+        self.k = _K_B  # Boltzmann constant (J/K)
         self.T_nom_K = T_nom + 273.15  # Nominal temperature in Kelvin
 
         # Calculate model parameters
@@ -101,14 +486,122 @@ class SolarPanel:
         # Photocurrent at STC
         self.I_ph_nom = self.I_sc
 
+        # Diode parameters depend on the values above, start a fresh cache
+        self._condition_cache = OrderedDict()
+
+    def parameter_key(self) -> str:
+        """
+        Stable hash of the model parameters
+
+        Two panels with the same key produce identical I-V curves, so the
+        key can be used to name cached results on disk.
+
+        Returns:
+        --------
+        str
+            Hexadecimal digest of the panel parameters
+        """
+        params = (self.V_oc, self.I_sc, self.V_mp, self.I_mp, self.N_s,
+                  self.T_nom, self.G_nom, self.K_v, self.K_i,
+                  self.n, self.R_s, self.R_sh)
+        return hashlib.sha1(repr(tuple(float(x) for x in params)).encode()).hexdigest()[:16]
+
+    def _diode_parameters(self, temperature, irradiance):
+        """
+        Temperature and irradiance dependent diode parameters
+
+        Works on scalars and on broadcastable arrays.
+
+        Parameters:
+        -----------
+        temperature : float or array_like
+            Cell temperature (°C)
+        irradiance : float or array_like
+            Solar irradiance (W/m²)
+
+        Returns:
+        --------
+        tuple
+            Modified thermal voltage n*V_t (V), photocurrent I_ph (A)
+            and reverse saturation current I_0 (A)
+        """
+        return _diode_parameters(temperature, irradiance, self.N_s, self.n,
+                                 self.T_nom, self.G_nom, self.I_ph_nom,
+                                 self.K_i, self.I_0)
+
+    def operating_condition(self, temperature: float = 25.0,
+                            irradiance: float = 1000.0) -> OperatingCondition:
+        """
+        Memoized diode parameters for one operating condition
+
+        The last ``condition_cache_size`` conditions are kept in an LRU
+        cache, so repeated queries at the same (T, G) with different
+        voltages skip the exponential and power evaluations.
+
+        Parameters:
+        -----------
+        temperature : float
+            Cell temperature (°C)
+        irradiance : float
+            Solar irradiance (W/m²)
+
+        Returns:
+        --------
+        OperatingCondition
+            Modified thermal voltage, photocurrent and saturation current
+        """
+        # Hashable for 0-d arrays; 25, 25.0 and np.float64(25) share a slot
+        key = (float(temperature), float(irradiance))
+        cache = self._condition_cache
+        condition = cache.get(key)
+
+        if condition is not None:
+            cache.move_to_end(key)
+            return condition
+
+        condition = OperatingCondition(
+            *(float(x) for x in self._diode_parameters(*key)))
+        cache[key] = condition
+        if len(cache) > self.condition_cache_size:
+            cache.popitem(last=False)
+
+        return condition
+
+    def clear_condition_cache(self):
+        """Drop all memoized operating conditions"""
+        self._condition_cache.clear()
+
+    def average_iterations(self) -> float:
+        """
+        Average number of Newton iterations per solved point
+
+        Returns:
+        --------
+        float
+            Iterations per point since the last ``reset_solver_stats``
+        """
+        return self.solver_iterations / self.solver_calls if self.solver_calls else 0.0
+
+    def reset_solver_stats(self):
+        """Reset the Newton iteration counters and the warm-start current"""
+        self._last_current = None
+        self.last_iterations = 0
+        self.last_mpp_evaluations = 0
+        self.solver_calls = 0
+        self.solver_iterations = 0
+
     def get_current(self, voltage: float, temperature: float = 25.0,
-                    irradiance: float = 1000.0) -> float:
+                    irradiance: float = 1000.0,
+                    initial_guess: Optional[float] = None) -> float:
         """
         Calculate panel current for given voltage and environmental conditions
 
         Uses the single diode equation:
         I = I_ph - I_0 * (exp((V + I*R_s)/(n*V_t)) - 1) - (V + I*R_s)/R_sh
 
+        solved by Newton-Raphson iteration or, with ``solver='lambertw'``,
+        explicitly through the Lambert W function.
+
         Parameters:
         -----------
         voltage : float
@@ -117,50 +610,185 @@ class SolarPanel:
             Cell temperature (°C)
         irradiance : float
             Solar irradiance (W/m²)
+        initial_guess : float, optional
+            Starting current for the Newton iteration (A), e.g. the solution
+            of the previous time step. Defaults to the previous solution when
+            ``warm_start`` is enabled, otherwise to the photocurrent.
 
         Returns:
         --------
         float
             Panel current (A)
         """
-        # Temperature in Kelvin
-        T_K = temperature + 273.15
-
-        # Thermal voltage
-        V_t = self.N_s * self.k * T_K / self.q
+        # Thermal voltage, photocurrent and saturation current (memoized)
+        nV_t, I_ph, I_0 = self.operating_condition(temperature, irradiance)
 
-        # Photocurrent (scales with irradiance and temperature)
-        dT = temperature - self.T_nom
-        I_ph = (self.I_ph_nom + self.K_i * dT) * (irradiance / self.G_nom)
-
-        # Reverse saturation current (temperature dependent)
-        I_0 = self.I_0 * (T_K / self.T_nom_K) ** 3 * \
-              np.exp(self.q * 1.12 / (self.n * self.k) * (1 / self.T_nom_K - 1 / T_K))
+        if self.solver == 'lambertw':
+            I = float(_lambertw_solve(voltage, I_ph, I_0, nV_t, self.R_s, self.R_sh))
+            self.last_iterations = 0
+            self.solver_calls += 1
+            return max(0, I)
 
         # Solve for current iteratively (Newton-Raphson method)
-        I = I_ph  # Initial guess
+        if initial_guess is None:
+            initial_guess = self._last_current if self.warm_start else None
+        I = I_ph if initial_guess is None else initial_guess
+
+        # Quadratic convergence factor, bounds the error after a Newton step
+        q = self.R_s / (2 * nV_t)
 
+        iterations = 0
         for _ in range(50):  # Maximum iterations
+            iterations += 1
+
+            V_d = voltage + I * self.R_s
+            e = np.exp(V_d / nV_t)
+
             # Current equation
-            f = I_ph - I - I_0 * (np.exp((voltage + I * self.R_s) / (self.n * V_t)) - 1) - \
-                (voltage + I * self.R_s) / self.R_sh
+            f = I_ph - I - I_0 * (e - 1) - V_d / self.R_sh
 
             # Derivative
-            df = -1 - I_0 * self.R_s / (self.n * V_t) * \
-                 np.exp((voltage + I * self.R_s) / (self.n * V_t)) - self.R_s / self.R_sh
+            df = -1 - I_0 * self.R_s / nV_t * e - self.R_s / self.R_sh
 
             # Newton-Raphson update
             I_new = I - f / df
 
-            # Check convergence
-            if abs(I_new - I) < 1e-6:
+            # Check convergence on the error bound of the new iterate
+            dI = I_new - I
+            if q * dI * dI < 1e-6:
                 I = I_new
                 break
 
             I = I_new
 
+        self._last_current = I
+        self.last_iterations = iterations
+        self.solver_calls += 1
+        self.solver_iterations += iterations
+
         return max(0, I)  # Current cannot be negative
 
+    def get_current_batch(self, voltage, temperature=25.0,
+                          irradiance=1000.0, initial_guess=None,
+                          return_iterations: bool = False):
+        """
+        Vectorized panel current for arrays of operating conditions
+
+        Solves the same single diode equation as ``get_current`` for every
+        element of the broadcast of ``voltage``, ``temperature`` and
+        ``irradiance`` at once, with a per-element convergence mask.
+
+        Parameters:
+        -----------
+        voltage : array_like
+            Panel terminal voltage (V)
+        temperature : array_like
+            Cell temperature (°C)
+        irradiance : array_like
+            Solar irradiance (W/m²)
+        initial_guess : array_like, optional
+            Starting current for the Newton iteration (A), e.g. the solution
+            of a previous time step; defaults to the photocurrent
+        return_iterations : bool
+            Also return the number of Newton iterations per element
+
+        Returns:
+        --------
+        np.ndarray or Tuple[np.ndarray, np.ndarray]
+            Panel current (A), shaped like the broadcast inputs, and the
+            iteration counts if ``return_iterations`` is set
+        """
+        voltage = np.asarray(voltage, dtype=float)
+
+        if np.ndim(temperature) == 0 and np.ndim(irradiance) == 0:
+            # Single condition, e.g. a voltage sweep: reuse memoized parameters
+            nV_t, I_ph, I_0 = self.operating_condition(float(temperature), float(irradiance))
+        else:
+            nV_t, I_ph, I_0 = self._diode_parameters(np.asarray(temperature, dtype=float),
+                                                     np.asarray(irradiance, dtype=float))
+
+        if self.solver == 'lambertw':
+            I = _lambertw_solve(*np.broadcast_arrays(voltage, I_ph, I_0, nV_t),
+                                self.R_s, self.R_sh)
+            iterations = np.zeros(I.shape, dtype=int)
+        else:
+            I, iterations = _newton_solve(voltage, I_ph, I_0, nV_t, self.R_s, self.R_sh,
+                                          initial_guess)
+
+        self.solver_calls += iterations.size
+        self.solver_iterations += int(iterations.sum())
+
+        I = np.maximum(I, 0)  # Current cannot be negative
+        if return_iterations:
+            return I, iterations
+        return I
+
+    def get_voltage_batch(self, current, temperature=25.0,
+                          irradiance=1000.0) -> np.ndarray:
+        """
+        Vectorized panel voltage for arrays of currents and conditions
+
+        Inverse of ``get_current_batch``, solved explicitly with the
+        Lambert W function. Currents above the photocurrent give the
+        negative (reverse biased) voltage of the unprotected panel.
+
+        Parameters:
+        -----------
+        current : array_like
+            Panel current (A)
+        temperature : array_like
+            Cell temperature (°C)
+        irradiance : array_like
+            Solar irradiance (W/m²)
+
+        Returns:
+        --------
+        np.ndarray
+            Panel voltage (V), shaped like the broadcast inputs
+        """
+        nV_t, I_ph, I_0 = self._diode_parameters(np.asarray(temperature, dtype=float),
+                                                 np.asarray(irradiance, dtype=float))
+        return _lambertw_voltage(*np.broadcast_arrays(current, I_ph, I_0, nV_t),
+                                 self.R_s, self.R_sh)
+
+    def get_slope(self, voltage, current, temperature=25.0, irradiance=1000.0):
+        """
+        Slope dI/dV of the I-V curve at a solved operating point
+
+        Implicit derivative of the single diode equation, so it costs one
+        exponential per point and no extra solve. Used to linearize the
+        panel current in dynamic converter models.
+
+        Parameters:
+        -----------
+        voltage : float or array_like
+            Panel terminal voltage (V)
+        current : float or array_like
+            Panel current at that voltage (A), e.g. from ``get_current``
+        temperature : float or array_like
+            Cell temperature (°C)
+        irradiance : float or array_like
+            Solar irradiance (W/m²)
+
+        Returns:
+        --------
+        float or np.ndarray
+            dI/dV (A/V), zero where the current is clipped at zero
+        """
+        if np.ndim(temperature) == 0 and np.ndim(irradiance) == 0:
+            nV_t, I_ph, I_0 = self.operating_condition(float(temperature), float(irradiance))
+        else:
+            nV_t, I_ph, I_0 = self._diode_parameters(np.asarray(temperature, dtype=float),
+                                                     np.asarray(irradiance, dtype=float))
+
+        # Differential conductance of diode and shunt branch
+        g_d = I_0 / nV_t * np.exp((voltage + current * self.R_s) / nV_t) + 1 / self.R_sh
+        slope = -g_d / (1 + self.R_s * g_d)
+
+        if np.ndim(slope) == 0:
+            return float(slope) if current > 0 else 0.0
+        return np.where(np.asarray(current) > 0, slope, 0.0)
+
     def get_power(self, voltage: float, temperature: float = 25.0,
                   irradiance: float = 1000.0) -> float:
         """
@@ -203,8 +831,7 @@ class SolarPanel:
             Voltage array (V) and Current array (A)
         """
         voltages = np.linspace(0, self.V_oc * 1.1, num_points)
-        currents = np.array([self.get_current(v, temperature, irradiance)
-                            for v in voltages])
+        currents = self.get_current_batch(voltages, temperature, irradiance)
         return voltages, currents
 
     def get_pv_curve(self, temperature: float = 25.0, irradiance: float = 1000.0,
@@ -230,27 +857,64 @@ class SolarPanel:
         powers = voltages * currents
         return voltages, powers
 
-    def find_mpp(self, temperature: float = 25.0, irradiance: float = 1000.0) -> Tuple[float, float, float]:
+    def find_mpp(self, temperature: float = 25.0, irradiance: float = 1000.0,
+                 tol: float = 1e-3) -> Tuple[float, float, float]:
         """
         Find the Maximum Power Point
 
+        Safeguarded Newton iteration on dP/dV = 0 in plain floats, usually
+        4-6 evaluations of the P-V curve (``last_mpp_evaluations``).
+
         Parameters:
         -----------
         temperature : float
             Cell temperature (°C)
         irradiance : float
             Solar irradiance (W/m²)
+        tol : float
+            Voltage tolerance of the MPP (V)
 
         Returns:
         --------
         Tuple[float, float, float]
             MPP voltage (V), MPP current (A), MPP power (W)
         """
-        voltages, powers = self.get_pv_curve(temperature, irradiance, 200)
-        mpp_idx = np.argmax(powers)
-        v_mpp = voltages[mpp_idx]
-        p_mpp = powers[mpp_idx]
-        i_mpp = self.get_current(v_mpp, temperature, irradiance)
+        nV_t, I_ph, I_0 = self.operating_condition(float(temperature), float(irradiance))
+        v_mpp, i_mpp, p_mpp, self.last_mpp_evaluations = _mpp_newton(
+            I_ph, I_0, nV_t, self.R_s, self.R_sh, tol)
+        return v_mpp, i_mpp, p_mpp
+
+    def find_mpp_batch(self, temperature=25.0, irradiance=1000.0,
+                       tol: float = 1e-3) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Find the Maximum Power Point for arrays of conditions at once
+
+        Golden-section search on the P-V curve between 0 and 1.1 * V_oc.
+
+        Parameters:
+        -----------
+        temperature : array_like
+            Cell temperature (°C)
+        irradiance : array_like
+            Solar irradiance (W/m²)
+        tol : float
+            Voltage tolerance of the MPP (V)
+
+        Returns:
+        --------
+        Tuple[np.ndarray, np.ndarray, np.ndarray]
+            MPP voltage (V), MPP current (A) and MPP power (W), shaped like
+            the broadcast of temperature and irradiance
+        """
+        temperature, irradiance = np.broadcast_arrays(
+            np.asarray(temperature, dtype=float), np.asarray(irradiance, dtype=float))
+
+        def power(v):
+            return v * self.get_current_batch(v, temperature, irradiance)
+
+        v_mpp, p_mpp = _golden_section_max(power, np.zeros(temperature.shape),
+                                           self.V_oc * 1.1, tol)
+        i_mpp = self.get_current_batch(v_mpp, temperature, irradiance)
 
         return v_mpp, i_mpp, p_mpp
 
@@ -284,8 +948,21 @@ class SolarArray:
         self.I_mp = panel.I_mp * N_parallel
         self.P_max = panel.P_max * N_series * N_parallel
 
+    def parameter_key(self) -> str:
+        """
+        Stable hash of the panel parameters and array configuration
+
+        Returns:
+        --------
+        str
+            Hexadecimal digest of the array parameters
+        """
+        key = f"{self.panel.parameter_key()}-{self.N_series}x{self.N_parallel}"
+        return hashlib.sha1(key.encode()).hexdigest()[:16]
+
     def get_current(self, voltage: float, temperature: float = 25.0,
-                    irradiance: float = 1000.0) -> float:
+                    irradiance: float = 1000.0,
+                    initial_guess: Optional[float] = None) -> float:
         """
         Calculate array current
 
@@ -297,6 +974,9 @@ class SolarArray:
             Cell temperature (°C)
         irradiance : float
             Solar irradiance (W/m²)
+        initial_guess : float, optional
+            Starting array current for the Newton iteration (A), e.g. the
+            solution of the previous time step
 
         Returns:
         --------
@@ -306,12 +986,63 @@ class SolarArray:
         # Voltage per panel in series string
         v_panel = voltage / self.N_series
 
-        # Current from one series string
-        i_string = self.panel.get_current(v_panel, temperature, irradiance)
+        # Current from one series string, warm-started per string
+        if initial_guess is not None:
+            initial_guess = initial_guess / self.N_parallel
+        i_string = self.panel.get_current(v_panel, temperature, irradiance,
+                                          initial_guess=initial_guess)
 
         # Total array current (parallel strings)
         return i_string * self.N_parallel
 
+    def get_current_batch(self, voltage, temperature=25.0,
+                          irradiance=1000.0) -> np.ndarray:
+        """
+        Vectorized array current for arrays of operating conditions
+
+        Parameters:
+        -----------
+        voltage : array_like
+            Array terminal voltage (V)
+        temperature : array_like
+            Cell temperature (°C)
+        irradiance : array_like
+            Solar irradiance (W/m²)
+
+        Returns:
+        --------
+        np.ndarray
+            Array current (A), shaped like the broadcast inputs
+        """
+        v_panel = np.asarray(voltage, dtype=float) / self.N_series
+        i_string = self.panel.get_current_batch(v_panel, temperature, irradiance)
+        return i_string * self.N_parallel
+
+    def get_slope(self, voltage, current, temperature=25.0, irradiance=1000.0):
+        """
+        Slope dI/dV of the array I-V curve at a solved operating point
+
+        Parameters:
+        -----------
+        voltage : float or array_like
+            Array terminal voltage (V)
+        current : float or array_like
+            Array current at that voltage (A), e.g. from ``get_current``
+        temperature : float or array_like
+            Cell temperature (°C)
+        irradiance : float or array_like
+            Solar irradiance (W/m²)
+
+        Returns:
+        --------
+        float or np.ndarray
+            dI/dV (A/V), zero where the current is clipped at zero
+        """
+        v_panel = np.asarray(voltage, dtype=float) / self.N_series
+        i_string = np.asarray(current, dtype=float) / self.N_parallel
+        slope = self.panel.get_slope(v_panel, i_string, temperature, irradiance)
+        return slope * self.N_parallel / self.N_series
+
     def get_power(self, voltage: float, temperature: float = 25.0,
                   irradiance: float = 1000.0) -> float:
         """
@@ -354,8 +1085,7 @@ class SolarArray:
             Voltage array (V) and Current array (A)
         """
         voltages = np.linspace(0, self.V_oc * 1.1, num_points)
-        currents = np.array([self.get_current(v, temperature, irradiance)
-                            for v in voltages])
+        currents = self.get_current_batch(voltages, temperature, irradiance)
         return voltages, currents
 
     def get_pv_curve(self, temperature: float = 25.0, irradiance: float = 1000.0,
@@ -381,7 +1111,8 @@ class SolarArray:
         powers = voltages * currents
         return voltages, powers
 
-    def find_mpp(self, temperature: float = 25.0, irradiance: float = 1000.0) -> Tuple[float, float, float]:
+    def find_mpp(self, temperature: float = 25.0, irradiance: float = 1000.0,
+                 tol: float = 1e-3) -> Tuple[float, float, float]:
         """
         Find the Maximum Power Point of the array
 
@@ -391,22 +1122,805 @@ class SolarArray:
             Cell temperature (°C)
         irradiance : float
             Solar irradiance (W/m²)
+        tol : float
+            Voltage tolerance of the MPP (V)
 
         Returns:
         --------
         Tuple[float, float, float]
             MPP voltage (V), MPP current (A), MPP power (W)
         """
-        voltages, powers = self.get_pv_curve(temperature, irradiance, 200)
-        mpp_idx = np.argmax(powers)
-        v_mpp = voltages[mpp_idx]
-        p_mpp = powers[mpp_idx]
+        v_mpp, i_mpp, p_mpp = self.panel.find_mpp(temperature, irradiance,
+                                                  tol / self.N_series)
+        return (v_mpp * self.N_series, i_mpp * self.N_parallel,
+                p_mpp * self.N_series * self.N_parallel)
+
+    def find_mpp_batch(self, temperature=25.0, irradiance=1000.0,
+                       tol: float = 1e-3) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Find the array Maximum Power Point for arrays of conditions at once
+
+        All panels are identical, so the array MPP is the panel MPP scaled
+        by the series and parallel counts.
+
+        Parameters:
+        -----------
+        temperature : array_like
+            Cell temperature (°C)
+        irradiance : array_like
+            Solar irradiance (W/m²)
+        tol : float
+            Voltage tolerance of the MPP (V)
+
+        Returns:
+        --------
+        Tuple[np.ndarray, np.ndarray, np.ndarray]
+            MPP voltage (V), MPP current (A) and MPP power (W)
+        """
+        v_mpp, i_mpp, p_mpp = self.panel.find_mpp_batch(temperature, irradiance,
+                                                        tol / self.N_series)
+        return (v_mpp * self.N_series, i_mpp * self.N_parallel,
+                p_mpp * self.N_series * self.N_parallel)
+
+
+class ShadedSolarArray(SolarArray):
+    """
+    Solar Array Model with per-module conditions and bypass diodes
+
+    Every module has its own temperature and irradiance. Modules in a
+    string carry the same current, and a module driven past its own
+    photocurrent is clamped by its bypass diode at -V_bypass. Strings
+    share the array voltage, so the array current is the sum of string
+    currents, each found by a safeguarded Newton solve of
+    sum(V_module(I)) = V_string. All modules, strings and voltage points
+    are solved together.
+
+    Under partial shading the P-V curve has several local maxima;
+    ``find_mpp`` locates the global one.
+    """
+
+    def __init__(self, panel: SolarPanel, N_series: int = 1, N_parallel: int = 1,
+                 bypass_diodes: bool = True, V_bypass: float = 0.5):
+        """
+        Initialize Shaded Solar Array
+
+        Parameters:
+        -----------
+        panel : SolarPanel
+            Base solar panel model
+        N_series : int
+            Number of panels in series
+        N_parallel : int
+            Number of panels in parallel
+        bypass_diodes : bool
+            Whether each module has a bypass diode
+        V_bypass : float
+            Bypass diode forward voltage drop (V)
+        """
+        super().__init__(panel, N_series, N_parallel)
+        self.bypass_diodes = bypass_diodes
+        self.V_bypass = V_bypass
+
+    def parameter_key(self) -> str:
+        """
+        Stable hash of the panel parameters, array configuration and bypass diodes
+
+        Returns:
+        --------
+        str
+            Hexadecimal digest of the array parameters
+        """
+        key = f"{super().parameter_key()}-shaded-{bool(self.bypass_diodes)}-{float(self.V_bypass)!r}"
+        return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+    def _module_parameters(self, temperature, irradiance):
+        """Diode parameters broadcast to the (N_parallel, N_series) module grid"""
+        shape = (self.N_parallel, self.N_series)
+        temperature = np.broadcast_to(np.asarray(temperature, dtype=float), shape)
+        irradiance = np.broadcast_to(np.asarray(irradiance, dtype=float), shape)
+        return self.panel._diode_parameters(temperature, irradiance)
+
+    def _string_voltage(self, current, nV_t, I_ph, I_0):
+        """
+        String voltage and its derivative for string currents
+
+        ``current`` has shape (n,) and the module parameters (n, N_series);
+        the module axis is summed out.
+        """
+        R_s, R_sh = self.panel.R_s, self.panel.R_sh
+        current = current[:, None]
+        v_module = _lambertw_voltage(current, I_ph, I_0, nV_t, R_s, R_sh)
+
+        # dV/dI = -R_s - 1/g with g the diode plus shunt conductance
+        g = I_0 / nV_t * np.exp((v_module + current * R_s) / nV_t) + 1 / R_sh
+        dv_module = -R_s - 1 / g
+
+        if self.bypass_diodes:
+            bypassed = v_module < -self.V_bypass
+            v_module = np.where(bypassed, -self.V_bypass, v_module)
+            dv_module = np.where(bypassed, 0.0, dv_module)
+
+        return v_module.sum(axis=-1), dv_module.sum(axis=-1)
+
+    def get_string_currents(self, voltage, temperature=25.0, irradiance=1000.0,
+                            tol: float = 1e-6, max_iter: int = 60) -> np.ndarray:
+        """
+        Current of every parallel string at the given array voltages
+
+        Parameters:
+        -----------
+        voltage : array_like
+            Array terminal voltage (V)
+        temperature : array_like
+            Module temperatures (°C), broadcastable to (N_parallel, N_series)
+        irradiance : array_like
+            Module irradiances (W/m²), broadcastable to (N_parallel, N_series)
+        tol : float
+            Current tolerance (A)
+        max_iter : int
+            Maximum number of iterations
+
+        Returns:
+        --------
+        np.ndarray
+            String currents (A) with shape voltage.shape + (N_parallel,)
+        """
+        voltage = np.asarray(voltage, dtype=float)
+        nV_t, I_ph, I_0 = self._module_parameters(temperature, irradiance)
+
+        # One problem per (voltage, string) pair, each with its row of modules
+        n_v = voltage.size
+        V = np.repeat(voltage.ravel(), self.N_parallel)
+        string = np.tile(np.arange(self.N_parallel), n_v)
+        nV_t, I_ph, I_0 = nV_t[string], I_ph[string], I_0[string]
+
+        # Every module is reverse biased above its photocurrent, so the
+        # string voltage is negative above the largest one
+        lo = np.zeros(V.size)
+        hi = I_ph.max(axis=1) * 1.05 + 1e-3
+
+        current = np.zeros(V.size)
+
+        # Strings whose open circuit voltage is below V carry no current
+        v_zero, _ = self._string_voltage(lo, nV_t, I_ph, I_0)
+        idx = np.flatnonzero(v_zero > V)
+        V, lo, hi = V[idx], lo[idx], hi[idx]
+        nV_t, I_ph, I_0 = nV_t[idx], I_ph[idx], I_0[idx]
+
+        I = 0.5 * (lo + hi)
+        for _ in range(max_iter):
+            if idx.size == 0:
+                break
+
+            v, dv = self._string_voltage(I, nV_t, I_ph, I_0)
+            h = v - V                                  # decreasing in I
+
+            lo = np.where(h > 0, I, lo)
+            hi = np.where(h > 0, hi, I)
+
+            # Newton step, falling back to bisection outside the bracket
+            with np.errstate(divide='ignore', invalid='ignore'):
+                I_new = I - h / dv
+            outside = ~((I_new > lo) & (I_new < hi))
+            I_new = np.where(outside, 0.5 * (lo + hi), I_new)
+
+            current[idx] = I_new
+
+            # Drop converged problems from the working set
+            keep = np.abs(I_new - I) >= tol
+            if not keep.all():
+                idx, V, lo, hi, I_new = idx[keep], V[keep], lo[keep], hi[keep], I_new[keep]
+                nV_t, I_ph, I_0 = nV_t[keep], I_ph[keep], I_0[keep]
+            I = I_new
+
+        return current.reshape(voltage.shape + (self.N_parallel,))
+
+    def get_current(self, voltage: float, temperature=25.0,
+                    irradiance=1000.0, initial_guess: Optional[float] = None) -> float:
+        """
+        Calculate array current
+
+        Parameters:
+        -----------
+        voltage : float
+            Array terminal voltage (V)
+        temperature : array_like
+            Module temperatures (°C), broadcastable to (N_parallel, N_series)
+        irradiance : array_like
+            Module irradiances (W/m²), broadcastable to (N_parallel, N_series)
+        initial_guess : float, optional
+            Accepted for interface compatibility with ``SolarArray``; the
+            string solve starts from its own bracket and ignores it
+
+        Returns:
+        --------
+        float
+            Array current (A)
+        """
+        return float(self.get_current_batch(voltage, temperature, irradiance))
+
+    def get_current_batch(self, voltage, temperature=25.0,
+                          irradiance=1000.0) -> np.ndarray:
+        """
+        Vectorized array current for an array of voltages
+
+        Parameters:
+        -----------
+        voltage : array_like
+            Array terminal voltage (V)
+        temperature : array_like
+            Module temperatures (°C), broadcastable to (N_parallel, N_series)
+        irradiance : array_like
+            Module irradiances (W/m²), broadcastable to (N_parallel, N_series)
+
+        Returns:
+        --------
+        np.ndarray
+            Array current (A), shaped like ``voltage``
+        """
+        return self.get_string_currents(voltage, temperature, irradiance).sum(axis=-1)
+
+    def get_slope(self, voltage, current, temperature=25.0, irradiance=1000.0):
+        """
+        Slope dI/dV of the array I-V curve at an operating point
+
+        The string currents are solved again at ``voltage``; each string
+        contributes the inverse of its dV/dI, and strings that carry no
+        current or whose modules are all bypassed contribute nothing.
+
+        Parameters:
+        -----------
+        voltage : float or array_like
+            Array terminal voltage (V)
+        current : float or array_like
+            Array current at that voltage (A), accepted for interface
+            compatibility with ``SolarArray``
+        temperature : array_like
+            Module temperatures (°C), broadcastable to (N_parallel, N_series)
+        irradiance : array_like
+            Module irradiances (W/m²), broadcastable to (N_parallel, N_series)
+
+        Returns:
+        --------
+        float or np.ndarray
+            dI/dV (A/V), shaped like ``voltage``
+        """
+        voltage = np.asarray(voltage, dtype=float)
+        strings = self.get_string_currents(voltage, temperature, irradiance).ravel()
+        nV_t, I_ph, I_0 = self._module_parameters(temperature, irradiance)
+
+        string = np.tile(np.arange(self.N_parallel), voltage.size)
+        _, dv = self._string_voltage(strings, nV_t[string], I_ph[string], I_0[string])
+
+        with np.errstate(divide='ignore'):
+            g = np.where((strings > 0) & (dv < 0), 1 / dv, 0.0)
+        slope = g.reshape(voltage.shape + (self.N_parallel,)).sum(axis=-1)
+        return float(slope) if slope.ndim == 0 else slope
+
+    def find_mpp(self, temperature=25.0, irradiance=1000.0,
+                 tol: float = 1e-3, num_points: int = 200) -> Tuple[float, float, float]:
+        """
+        Find the global Maximum Power Point of the array
+
+        A coarse scan of the P-V curve picks the highest local peak, which
+        is then refined by golden-section search between its neighbours.
+
+        Parameters:
+        -----------
+        temperature : array_like
+            Module temperatures (°C), broadcastable to (N_parallel, N_series)
+        irradiance : array_like
+            Module irradiances (W/m²), broadcastable to (N_parallel, N_series)
+        tol : float
+            Voltage tolerance of the MPP (V)
+        num_points : int
+            Number of points in the coarse scan
+
+        Returns:
+        --------
+        Tuple[float, float, float]
+            MPP voltage (V), MPP current (A), MPP power (W)
+        """
+        voltages, powers = self.get_pv_curve(temperature, irradiance, num_points)
+        k = int(np.argmax(powers))
+        lo = voltages[max(k - 1, 0)]
+        hi = voltages[min(k + 1, num_points - 1)]
+
+        def power(v):
+            return v * self.get_current_batch(v, temperature, irradiance)
+
+        v_mpp, p_mpp = _golden_section_max(power, lo, hi, tol)
         i_mpp = self.get_current(v_mpp, temperature, irradiance)
 
+        return float(v_mpp), i_mpp, float(p_mpp)
+
+    def find_mpp_batch(self, temperature=25.0, irradiance=1000.0,
+                       tol: float = 1e-3) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Find the global Maximum Power Point for a batch of module conditions
+
+        The last two axes of the inputs are the (N_parallel, N_series)
+        module grid, the leading axes index the conditions; each condition
+        is solved with ``find_mpp``, since every shading pattern has its own
+        set of local maxima.
+
+        Parameters:
+        -----------
+        temperature : array_like
+            Module temperatures (°C), broadcastable to (..., N_parallel, N_series)
+        irradiance : array_like
+            Module irradiances (W/m²), broadcastable to (..., N_parallel, N_series)
+        tol : float
+            Voltage tolerance of the MPP (V)
+
+        Returns:
+        --------
+        Tuple[np.ndarray, np.ndarray, np.ndarray]
+            MPP voltage (V), MPP current (A) and MPP power (W), shaped like
+            the leading (condition) axes
+        """
+        temperature, irradiance = np.broadcast_arrays(np.asarray(temperature, dtype=float),
+                                                      np.asarray(irradiance, dtype=float))
+        grid = (self.N_parallel, self.N_series)
+        try:
+            shape = np.broadcast_shapes(temperature.shape, grid)
+        except ValueError:
+            raise ValueError(f"Module conditions must broadcast to (..., {grid[0]}, {grid[1]}), "
+                             f"got shape {temperature.shape}") from None
+
+        temperature = np.broadcast_to(temperature, shape)
+        irradiance = np.broadcast_to(irradiance, shape)
+
+        v_mpp, i_mpp, p_mpp = (np.empty(shape[:-2]) for _ in range(3))
+        for idx in np.ndindex(*shape[:-2]):
+            v_mpp[idx], i_mpp[idx], p_mpp[idx] = self.find_mpp(temperature[idx],
+                                                               irradiance[idx], tol)
         return v_mpp, i_mpp, p_mpp
 
 
-def create_standard_panel(panel_type: str = 'generic') -> SolarPanel:
+class SolarFleet:
+    """
+    Struct-of-arrays model of many independent PV modules
+
+    Module parameters are stored in contiguous NumPy arrays, one element
+    per module, instead of one SolarPanel object per module. Bulk
+    operations evaluate the whole fleet at once, and indexing returns a
+    fleet over a subset of modules (a view for slices).
+    """
+
+    PARAMETERS = ('V_oc', 'I_sc', 'V_mp', 'I_mp', 'N_s', 'T_nom', 'G_nom',
+                  'K_v', 'K_i', 'n', 'R_s', 'R_sh', 'I_0')
+
+    def __init__(self, V_oc, I_sc, V_mp, I_mp, N_s,
+                 T_nom=25.0, G_nom=1000.0, K_v=-0.0032, K_i=0.0005,
+                 n=1.3, R_s=0.221, R_sh=415.405, I_0=None,
+                 solver: str = 'newton'):
+        """
+        Initialize Solar Fleet
+
+        All parameters are broadcast to one value per module; the meaning
+        of each matches the SolarPanel parameter of the same name.
+
+        Parameters:
+        -----------
+        V_oc, I_sc, V_mp, I_mp : array_like
+            STC open circuit voltage (V), short circuit current (A) and
+            maximum power point voltage (V) and current (A)
+        N_s : array_like
+            Number of cells in series
+        T_nom, G_nom : array_like
+            Reference temperature (°C) and irradiance (W/m²)
+        K_v, K_i : array_like
+            Temperature coefficients for voltage (V/°C) and current (A/°C)
+        n, R_s, R_sh : array_like
+            Ideality factor, series and shunt resistance (Ω)
+        I_0 : array_like, optional
+            Reference saturation current (A), derived from V_oc and I_sc
+            like in SolarPanel if omitted
+        solver : str
+            Single diode equation solver: 'newton' or 'lambertw'
+        """
+        if solver not in SOLVERS:
+            raise ValueError(f"Unknown solver: {solver}. Available: {list(SOLVERS)}")
+
+        if I_0 is None:
+            V_t = np.asarray(N_s) * _K_B * (np.asarray(T_nom) + 273.15) / _Q
+            I_0 = np.asarray(I_sc) / (np.exp(np.asarray(V_oc) / (np.asarray(n) * V_t)) - 1)
+
+        values = np.broadcast_arrays(*[np.asarray(x, dtype=float) for x in
+                                       (V_oc, I_sc, V_mp, I_mp, N_s, T_nom, G_nom,
+                                        K_v, K_i, n, R_s, R_sh, I_0)])
+        for name, value in zip(self.PARAMETERS, values):
+            setattr(self, name, np.ascontiguousarray(np.atleast_1d(value)))
+
+        self.solver = solver
+
+    @classmethod
+    def from_panels(cls, panels) -> 'SolarFleet':
+        """
+        Build a fleet from a sequence of SolarPanel objects
+
+        Parameters:
+        -----------
+        panels : sequence of SolarPanel
+            Panels to collect
+
+        Returns:
+        --------
+        SolarFleet
+            Fleet with one module per panel
+        """
+        panels = list(panels)
+        params = {name: [getattr(p, name) for p in panels] for name in cls.PARAMETERS}
+        return cls(solver=panels[0].solver if panels else 'newton', **params)
+
+    @classmethod
+    def from_panel(cls, panel: SolarPanel, count: int) -> 'SolarFleet':
+        """
+        Build a fleet of identical modules
+
+        Parameters:
+        -----------
+        panel : SolarPanel
+            Module model
+        count : int
+            Number of modules
+
+        Returns:
+        --------
+        SolarFleet
+            Fleet of ``count`` copies of ``panel``
+        """
+        params = {name: np.full(count, float(getattr(panel, name)))
+                  for name in cls.PARAMETERS}
+        return cls(solver=panel.solver, **params)
+
+    def __len__(self) -> int:
+        return self.V_oc.shape[0]
+
+    def __getitem__(self, index) -> 'SolarFleet':
+        """
+        Fleet over a subset of modules
+
+        Basic slices share memory with this fleet; index arrays and
+        boolean masks copy the selected parameters.
+        """
+        if isinstance(index, (int, np.integer)):
+            index = slice(index, index + 1 or None)
+
+        subset = SolarFleet.__new__(SolarFleet)
+        for name in self.PARAMETERS:
+            setattr(subset, name, getattr(self, name)[index])
+        subset.solver = self.solver
+        return subset
+
+    def _diode_parameters(self, temperature, irradiance):
+        """Diode parameters with the module axis last"""
+        return _diode_parameters(np.asarray(temperature, dtype=float),
+                                 np.asarray(irradiance, dtype=float),
+                                 self.N_s, self.n, self.T_nom, self.G_nom,
+                                 self.I_sc, self.K_i, self.I_0)
+
+    def get_current(self, voltage, temperature=25.0, irradiance=1000.0) -> np.ndarray:
+        """
+        Current of every module
+
+        Inputs broadcast against the module axis, which is the last one:
+        a voltage of shape (len(fleet),) gives one point per module, and a
+        shape (N, 1) gives N points for every module.
+
+        Parameters:
+        -----------
+        voltage : array_like
+            Module terminal voltage (V)
+        temperature : array_like
+            Cell temperature (°C)
+        irradiance : array_like
+            Solar irradiance (W/m²)
+
+        Returns:
+        --------
+        np.ndarray
+            Module current (A)
+        """
+        nV_t, I_ph, I_0 = self._diode_parameters(temperature, irradiance)
+
+        if self.solver == 'lambertw':
+            I = _lambertw_solve(*np.broadcast_arrays(voltage, I_ph, I_0, nV_t),
+                                self.R_s, self.R_sh)
+        else:
+            I, _ = _newton_solve(voltage, I_ph, I_0, nV_t, self.R_s, self.R_sh)
+
+        return np.maximum(I, 0)  # Current cannot be negative
+
+    def get_power(self, voltage, temperature=25.0, irradiance=1000.0) -> np.ndarray:
+        """
+        Power of every module
+
+        Parameters:
+        -----------
+        voltage : array_like
+            Module terminal voltage (V)
+        temperature : array_like
+            Cell temperature (°C)
+        irradiance : array_like
+            Solar irradiance (W/m²)
+
+        Returns:
+        --------
+        np.ndarray
+            Module power (W)
+        """
+        return voltage * self.get_current(voltage, temperature, irradiance)
+
+    def find_mpp(self, temperature=25.0, irradiance=1000.0,
+                 tol: float = 1e-3) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Maximum Power Point of every module
+
+        Parameters:
+        -----------
+        temperature : array_like
+            Cell temperature (°C), broadcast against the module axis
+        irradiance : array_like
+            Solar irradiance (W/m²), broadcast against the module axis
+        tol : float
+            Voltage tolerance of the MPP (V)
+
+        Returns:
+        --------
+        Tuple[np.ndarray, np.ndarray, np.ndarray]
+            MPP voltage (V), MPP current (A) and MPP power (W) per module
+        """
+        shape = np.broadcast_shapes(np.shape(temperature), np.shape(irradiance),
+                                    self.V_oc.shape)
+        temperature = np.broadcast_to(np.asarray(temperature, dtype=float), shape)
+        irradiance = np.broadcast_to(np.asarray(irradiance, dtype=float), shape)
+
+        def power(v):
+            return self.get_power(v, temperature, irradiance)
+
+        v_mpp, p_mpp = _golden_section_max(power, np.zeros(shape), self.V_oc * 1.1, tol)
+        i_mpp = self.get_current(v_mpp, temperature, irradiance)
+
+        return v_mpp, i_mpp, p_mpp
+
+
+class MPPSurface:
+    """
+    Precomputed Maximum Power Point surface over temperature and irradiance
+
+    The MPP is solved once on a (T, G) grid and bilinearly interpolated at
+    query time, which turns a reference MPP lookup into a few arithmetic
+    operations. Temperatures outside the grid are extrapolated linearly
+    from the edge cells, where MPP voltage and current are close to linear
+    in T. Irradiances above the grid are clamped to its edge; below the
+    lowest irradiance MPP voltage and current shrink in proportion to G as
+    in the shunt-dominated low-light regime.
+
+    MPP voltage and current are interpolated and the power is their
+    product; interpolating the power table itself overestimates it where
+    P grows like G² at low irradiance.
+    """
+
+    def __init__(self, model, temperatures: Optional[np.ndarray] = None,
+                 irradiances: Optional[np.ndarray] = None, tol: float = 1e-3):
+        """
+        Build the MPP surface
+
+        Parameters:
+        -----------
+        model : SolarPanel or SolarArray
+            Model providing ``find_mpp_batch`` and ``parameter_key``
+        temperatures : np.ndarray, optional
+            Increasing temperature grid (°C), default -20 to 80 °C in 5 °C steps
+        irradiances : np.ndarray, optional
+            Increasing, positive irradiance grid (W/m²), default 0.5 to
+            1400 W/m², 25 W/m² steps above 100 W/m² and refined below
+        tol : float
+            Voltage tolerance of the MPP search (V)
+        """
+        self.temperatures = np.asarray(
+            _MPP_TEMPERATURES if temperatures is None else temperatures, dtype=float)
+        self.irradiances = np.asarray(
+            _MPP_IRRADIANCES if irradiances is None else irradiances, dtype=float)
+        self.key = self.grid_key(model, self.temperatures, self.irradiances)
+
+        if len(self.temperatures) < 2 or len(self.irradiances) < 2:
+            raise ValueError("MPP surface needs at least two grid points per axis")
+        if self.irradiances[0] <= 0:
+            raise ValueError("MPP surface irradiance grid must start above 0 W/m²")
+
+        self.v_mpp, self.i_mpp, self.p_mpp = model.find_mpp_batch(
+            self.temperatures[:, None], self.irradiances[None, :], tol)
+
+        self._set_lookup_lists()
+
+    def _set_lookup_lists(self):
+        """Keep plain-list copies of the grid for fast scalar queries"""
+        self._t_list = self.temperatures.tolist()
+        self._g_list = self.irradiances.tolist()
+        self._tables = (self.v_mpp.tolist(), self.i_mpp.tolist())
+
+    @staticmethod
+    def grid_key(model, temperatures: np.ndarray, irradiances: np.ndarray) -> str:
+        """
+        Cache key combining the model parameters and the grid
+
+        Parameters:
+        -----------
+        model : SolarPanel or SolarArray
+            Model providing ``parameter_key``
+        temperatures : np.ndarray
+            Temperature grid (°C)
+        irradiances : np.ndarray
+            Irradiance grid (W/m²)
+
+        Returns:
+        --------
+        str
+            Hexadecimal cache key
+        """
+        h = hashlib.sha1(model.parameter_key().encode())
+        h.update(np.ascontiguousarray(temperatures, dtype=float).tobytes())
+        h.update(np.ascontiguousarray(irradiances, dtype=float).tobytes())
+        return h.hexdigest()[:16]
+
+    @classmethod
+    def for_model(cls, model, cache_dir: Optional[str] = None,
+                  temperatures: Optional[np.ndarray] = None,
+                  irradiances: Optional[np.ndarray] = None) -> 'MPPSurface':
+        """
+        Load the surface for a model from disk, or build and save it
+
+        Parameters:
+        -----------
+        model : SolarPanel or SolarArray
+            Model to tabulate
+        cache_dir : str, optional
+            Directory for cached surfaces; nothing is read or written if None
+        temperatures : np.ndarray, optional
+            Temperature grid (°C)
+        irradiances : np.ndarray, optional
+            Irradiance grid (W/m²)
+
+        Returns:
+        --------
+        MPPSurface
+            Surface for the given model and grid
+        """
+        if cache_dir is None:
+            return cls(model, temperatures, irradiances)
+
+        temperatures = np.asarray(
+            _MPP_TEMPERATURES if temperatures is None else temperatures, dtype=float)
+        irradiances = np.asarray(
+            _MPP_IRRADIANCES if irradiances is None else irradiances, dtype=float)
+        key = cls.grid_key(model, temperatures, irradiances)
+
+        path = os.path.join(cache_dir, f"mpp_surface_{key}.npz")
+        if os.path.exists(path):
+            return cls.load(path)
+
+        surface = cls(model, temperatures, irradiances)
+        os.makedirs(cache_dir, exist_ok=True)
+        surface.save(path)
+        return surface
+
+    def save(self, path: str):
+        """
+        Save the surface to a .npz file
+
+        Parameters:
+        -----------
+        path : str
+            Output file path
+        """
+        np.savez(path, key=self.key, temperatures=self.temperatures,
+                 irradiances=self.irradiances, v_mpp=self.v_mpp,
+                 i_mpp=self.i_mpp, p_mpp=self.p_mpp)
+
+    @classmethod
+    def load(cls, path: str) -> 'MPPSurface':
+        """
+        Load a surface saved with ``save``
+
+        Parameters:
+        -----------
+        path : str
+            Input file path
+
+        Returns:
+        --------
+        MPPSurface
+            Loaded surface
+        """
+        surface = cls.__new__(cls)
+        with np.load(path) as data:
+            surface.key = str(data['key'])
+            surface.temperatures = data['temperatures']
+            surface.irradiances = data['irradiances']
+            surface.v_mpp = data['v_mpp']
+            surface.i_mpp = data['i_mpp']
+            surface.p_mpp = data['p_mpp']
+        surface._set_lookup_lists()
+        return surface
+
+    @staticmethod
+    def _cell(grid: list, x: float, extrapolate: bool = False) -> Tuple[int, float]:
+        """
+        Grid cell index and interpolation weight for a scalar
+
+        Outside the grid the edge cell is used, with the weight clamped to
+        [0, 1] or, with ``extrapolate``, continued linearly.
+        """
+        if x <= grid[0]:
+            return 0, (x - grid[0]) / (grid[1] - grid[0]) if extrapolate else 0.0
+        if x >= grid[-1]:
+            j = len(grid) - 2
+            return j, (x - grid[j]) / (grid[j + 1] - grid[j]) if extrapolate else 1.0
+        j = bisect_right(grid, x) - 1
+        return j, (x - grid[j]) / (grid[j + 1] - grid[j])
+
+    def query(self, temperature=25.0, irradiance=1000.0):
+        """
+        Interpolated MPP at the given conditions
+
+        Parameters:
+        -----------
+        temperature : float or array_like
+            Cell temperature (°C)
+        irradiance : float or array_like
+            Solar irradiance (W/m²)
+
+        Returns:
+        --------
+        tuple
+            MPP voltage (V), MPP current (A), MPP power (W); floats for
+            scalar inputs, arrays for array inputs
+        """
+        if np.ndim(temperature) == 0 and np.ndim(irradiance) == 0:
+            G = float(irradiance)
+            j, wt = self._cell(self._t_list, float(temperature), extrapolate=True)
+            k, wg = self._cell(self._g_list, G)
+            result = []
+            for tab in self._tables:
+                lo, hi = tab[j], tab[j + 1]
+                a = lo[k] + wg * (lo[k + 1] - lo[k])
+                b = hi[k] + wg * (hi[k + 1] - hi[k])
+                result.append(a + wt * (b - a))
+            v_mpp, i_mpp = result
+
+            G_min = self._g_list[0]
+            if G < G_min:
+                scale = max(G, 0.0) / G_min
+                v_mpp *= scale
+                i_mpp *= scale
+            return v_mpp, i_mpp, v_mpp * i_mpp
+
+        G_query = np.asarray(irradiance, dtype=float)
+        T = np.asarray(temperature, dtype=float)
+        G = np.clip(G_query, self.irradiances[0], self.irradiances[-1])
+
+        j = np.clip(np.searchsorted(self.temperatures, T, side='right') - 1,
+                    0, len(self.temperatures) - 2)
+        k = np.clip(np.searchsorted(self.irradiances, G, side='right') - 1,
+                    0, len(self.irradiances) - 2)
+        wt = (T - self.temperatures[j]) / (self.temperatures[j + 1] - self.temperatures[j])
+        wg = (G - self.irradiances[k]) / (self.irradiances[k + 1] - self.irradiances[k])
+
+        result = []
+        for tab in (self.v_mpp, self.i_mpp):
+            a = tab[j, k] + wg * (tab[j, k + 1] - tab[j, k])
+            b = tab[j + 1, k] + wg * (tab[j + 1, k + 1] - tab[j + 1, k])
+            result.append(a + wt * (b - a))
+
+        scale = np.clip(G_query / self.irradiances[0], 0.0, 1.0)
+        v_mpp, i_mpp = result[0] * scale, result[1] * scale
+        return v_mpp, i_mpp, v_mpp * i_mpp
+
+
+def create_standard_panel(panel_type: str = 'generic', solver: str = 'newton') -> SolarPanel:
     """
     Factory function to create standard panel types
 
@@ -414,6 +1928,8 @@ def create_standard_panel(panel_type: str = 'generic') -> SolarPanel:
     -----------
     panel_type : str
         Type of panel: 'generic', 'canadian_solar_cs6k', 'sunpower_e20'
+    solver : str
+        Single diode equation solver: 'newton' or 'lambertw'
 
     Returns:
     --------
@@ -448,7 +1964,7 @@ def create_standard_panel(panel_type: str = 'generic') -> SolarPanel:
         warnings.warn(f"Unknown panel type: {panel_type}. Using 'generic'.")
         panel_type = 'generic'
 
-    return SolarPanel(**panels[panel_type])
+    return SolarPanel(solver=solver, **panels[panel_type])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from energy_yield import EnergyYieldEngine, array_chunks
+from solar_panel import SolarArray, create_standard_panel
+
+
+def _weather(days=2):
+    minutes = np.arange(days * 1440)
+    hour = (minutes % 1440) / 60.0
+    irradiance = np.clip(1000.0 * np.sin(np.pi * (hour - 6.0) / 12.0), 0, None)
+    return 15.0 + 0.03 * irradiance, irradiance
+
+
+def test_energy_matches_direct_mpp_sum():
+    model = SolarArray(create_standard_panel('generic'), N_series=2, N_parallel=2)
+    temperature, irradiance = _weather()
+
+    summary = EnergyYieldEngine(model, dt=60.0, chunk_size=1000).run(temperature, irradiance)
+
+    _, _, p_mpp = model.find_mpp_batch(temperature, irradiance)
+    assert summary['n_intervals'] == len(irradiance)
+    assert summary['energy'] == pytest.approx(np.sum(p_mpp) * 60.0 / 3600.0, rel=1e-9)
+    assert summary['peak_power'] == pytest.approx(np.max(p_mpp))
+    assert summary['producing_hours'] == pytest.approx(np.count_nonzero(p_mpp > 0) / 60.0)
+
+
+@pytest.mark.parametrize('chunk_size', [97, 777, 1440, 10000])
+def test_result_does_not_depend_on_chunk_size(chunk_size):
+    panel = create_standard_panel('generic')
+    temperature, irradiance = _weather()
+    reference = EnergyYieldEngine(panel, chunk_size=2880).run(temperature, irradiance,
+                                                              period=1440)
+
+    summary = EnergyYieldEngine(panel, chunk_size=chunk_size).run(temperature, irradiance,
+                                                                  period=1440)
+
+    assert summary['energy'] == pytest.approx(reference['energy'], rel=1e-12)
+    assert summary['period_energy'] == pytest.approx(reference['period_energy'], rel=1e-12)
+    assert summary['period_energy'].sum() == pytest.approx(summary['energy'], rel=1e-12)
+
+
+def test_constant_temperature_and_chunk_stream():
+    panel = create_standard_panel('generic')
+    _, irradiance = _weather(days=1)
+    engine = EnergyYieldEngine(panel, chunk_size=500)
+
+    chunks = list(array_chunks(25.0, irradiance, 500))
+    assert [len(G) for _, G in chunks] == [500, 500, 440]
+    assert all(np.all(T == 25.0) for T, _ in chunks)
+
+    from_arrays = engine.run(25.0, irradiance)['energy']
+    assert engine.run(iter(chunks))['energy'] == pytest.approx(from_arrays, rel=1e-12)
+
+
+def test_chunk_size_must_be_positive():
+    with pytest.raises(ValueError):
+        EnergyYieldEngine(create_standard_panel('generic'), chunk_size=0)
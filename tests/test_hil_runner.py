@@ -0,0 +1,25 @@
+import pytest
+
+from hil_runner import HILRunner, ModelPlant
+from mppt_controller import create_mppt_controller
+from solar_panel import ShadedSolarArray, SolarArray, SolarPanel
+
+
+@pytest.mark.parametrize('array_type', [SolarArray, ShadedSolarArray])
+def test_model_plant_runs_on_arrays(array_type):
+    runner = HILRunner(create_mppt_controller('InCond', step_size=0.005),
+                       ModelPlant(array_type(SolarPanel(), 2, 1)), rate=2000.0)
+    report = runner.run(duration=0.05)
+
+    assert report['ticks'] > 0
+    assert report['mean_power'] > 0
+
+
+def test_model_based_controller_reads_plant_temperature():
+    panel = SolarPanel()
+    controller = create_mppt_controller('MPC', panel=panel)
+    plant = ModelPlant(panel, temperature=lambda t: 60.0 + t)
+    HILRunner(controller, plant, rate=2000.0).run(duration=0.02)
+
+    assert plant.last_temperature >= 60.0
+    assert controller.temperature == plant.last_temperature
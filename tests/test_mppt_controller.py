@@ -0,0 +1,252 @@
+import copy
+import json
+import pickle
+
+import numpy as np
+import pytest
+
+from mppt_controller import (ConvergenceMonitor, create_mppt_controller,
+                             create_mppt_controller_bank)
+from mppt_simulation import BoostConverter, MPPTSimulator
+from solar_panel import ShadedSolarArray, SolarPanel, create_standard_panel
+
+
+@pytest.mark.parametrize('algorithm', ['VS-P&O', 'VS-InCond'])
+def test_variable_step_tracks_mpp_at_stc(algorithm):
+    sim = MPPTSimulator(create_standard_panel('generic'), algorithm)
+    sim.run_simulation(duration=5.0, dt=0.01, temperature=25.0, irradiance=1000.0)
+
+    assert sim.efficiency_history.mean() > 95.0
+    assert 0.1 < sim.duty_cycle_history[-1] < 0.9
+    assert sim.mppt.get_convergence_metrics()['settled']
+
+
+def _track_shaded_array(algorithm, irradiance, steps=300):
+    # Per-module irradiance does not fit the simulator's condition series,
+    # so close the loop over its plant directly
+    sim = MPPTSimulator(ShadedSolarArray(SolarPanel(), 3, 1), algorithm)
+    sim._reset_plant(0.01)
+    power = []
+    for _ in range(steps):
+        voltage, current = sim.plant_step(sim.mppt.duty_cycle, 25.0, irradiance)
+        sim.mppt.update(voltage, current)
+        power.append(voltage * current)
+    return np.mean(power[-50:]), sim.panel.find_mpp(25.0, irradiance)[2]
+
+
+def test_global_scan_finds_global_peak_under_shading():
+    # One module at 25 % irradiance: local peak near 100 V, global near 60 V
+    irradiance = np.array([[1000.0, 1000.0, 250.0]])
+
+    p_global, p_mpp = _track_shaded_array('GlobalScan', irradiance)
+    p_local, _ = _track_shaded_array('InCond', irradiance)
+
+    assert p_global > 0.98 * p_mpp
+    assert p_local < 0.5 * p_mpp
+
+
+def test_monitor_ignores_samples_at_duty_limit():
+    monitor = ConvergenceMonitor(settle_threshold=0.002, settle_count=5)
+    for _ in range(20):
+        monitor.update(100.0, 0.001, saturated=True)
+    assert not monitor.settled
+    assert monitor.convergence_steps == []
+
+    for _ in range(5):
+        monitor.update(100.0, 0.001)
+    assert monitor.settled
+
+
+def test_pinned_controller_is_not_settled():
+    # A plant whose voltage rises with the duty cycle drives the boost
+    # convention controller into its lower limit
+    mppt = create_mppt_controller('VS-P&O')
+    panel = create_standard_panel('generic')
+    for _ in range(200):
+        v = panel.V_oc * mppt.duty_cycle
+        mppt.update(v, panel.get_current(v))
+
+    assert mppt.duty_cycle == pytest.approx(0.1)
+    assert not mppt.get_convergence_metrics()['settled']
+
+
+def _drive(mppt, n_steps=50):
+    panel = create_standard_panel('generic')
+    for _ in range(n_steps):
+        v = panel.V_oc * 1.8 * (1 - mppt.duty_cycle)
+        mppt.update(v, panel.get_current(v))
+
+
+@pytest.mark.parametrize('algorithm', ['InCond', 'VS-InCond', 'GlobalScan'])
+def test_controller_with_telemetry_pickles(algorithm):
+    mppt = create_mppt_controller(algorithm)
+    mppt.enable_telemetry(dt=0.01)
+    _drive(mppt)
+
+    restored = pickle.loads(pickle.dumps(mppt))
+    assert restored.get_telemetry() == mppt.get_telemetry()
+    assert copy.deepcopy(mppt).get_telemetry() == mppt.get_telemetry()
+
+    # The restored controller keeps recording on its own counters
+    _drive(restored, 10)
+    assert restored.get_telemetry()['updates'] == 60
+    assert mppt.get_telemetry()['updates'] == 50
+
+
+def test_telemetry_counts_super_update_once():
+    mppt = create_mppt_controller('VS-InCond')
+    mppt.enable_telemetry()
+    _drive(mppt, 20)
+    assert mppt.get_telemetry()['updates'] == 20
+
+    mppt.disable_telemetry()
+    _drive(mppt, 5)
+    assert mppt.get_telemetry() is None
+    assert 'update' not in vars(mppt)
+
+
+def test_bank_with_telemetry_pickles():
+    bank = create_mppt_controller_bank('InCond', 3)
+    bank.enable_telemetry()
+    for k in range(10):
+        bank.update(np.full(3, 30.0 + k % 2), np.full(3, 7.0))
+
+    restored = pickle.loads(pickle.dumps(bank))
+    assert restored.get_telemetry()['updates'] == 10
+
+
+@pytest.mark.parametrize('step_size', [0.005, 0.01, 0.05])
+def test_fuzzy_lookup_table_matches_rule_base(step_size):
+    rules = create_mppt_controller('Fuzzy', step_size=step_size)
+    table = create_mppt_controller('Fuzzy', step_size=step_size,
+                                   use_lookup_table=True).lookup_table
+    assert table.max_error <= 0.25 * step_size
+
+    rng = np.random.default_rng(0)
+    points = np.concatenate([rng.uniform(-1, 1, (2000, 2)),
+                             rng.uniform(-0.2, 0.2, (2000, 2))])
+    for E, CE in points.tolist():
+        assert table(E, CE) == pytest.approx(rules.fuzzy_inference(E, CE),
+                                             abs=0.25 * step_size)
+
+
+BANK_CASES = [('P&O', {'step_size': 0.005}), ('InCond', {'step_size': 0.005}),
+              ('CV', {'v_ref': 30.0}), ('Fuzzy', {}), ('Fuzzy', {'use_lookup_table': True})]
+
+
+@pytest.mark.parametrize('algorithm, options', BANK_CASES)
+def test_bank_matches_scalar_controllers_exactly(algorithm, options):
+    panel = create_standard_panel('generic')
+    converter = BoostConverter()
+    temperature = [25.0, 40.0, 10.0, 60.0]
+    irradiance = [1000.0, 700.0, 300.0, 850.0]
+
+    def measure(duty_cycle, k):
+        voltage = converter.get_input_voltage(duty_cycle, panel.V_oc)
+        return voltage, panel.get_current(voltage, temperature[k], irradiance[k])
+
+    bank = create_mppt_controller_bank(algorithm, 4, **options)
+    controllers = [create_mppt_controller(algorithm, **options) for _ in range(4)]
+
+    for _ in range(200):
+        voltage, current = zip(*(measure(d, k) for k, d in enumerate(bank.duty_cycle)))
+        duty_bank = bank.update(np.array(voltage), np.array(current))
+        duty_scalar = [c.update(*measure(c.duty_cycle, k)) for k, c in enumerate(controllers)]
+
+        assert np.array_equal(duty_bank, duty_scalar)
+
+
+def test_bank_accepts_per_channel_parameters():
+    steps = np.array([0.002, 0.005, 0.01])
+    bank = create_mppt_controller_bank('InCond', 3, step_size=steps)
+    controllers = [create_mppt_controller('InCond', step_size=s) for s in steps]
+    voltage = np.array([28.0, 29.0, 31.0])
+    current = np.array([8.0, 7.9, 7.5])
+
+    for _ in range(3):
+        duty_bank = bank.update(voltage, current)
+        duty_scalar = [c.update(v, i) for c, v, i in zip(controllers, voltage, current)]
+        assert np.array_equal(duty_bank, duty_scalar)
+        voltage = voltage + 0.3
+
+    with pytest.raises(ValueError, match='Unknown algorithm'):
+        create_mppt_controller_bank('PSO', 3)
+
+
+@pytest.mark.parametrize('temperature, irradiance', [(25.0, 1000.0), (50.0, 350.0), (0.0, 80.0)])
+def test_mpc_estimates_irradiance_from_one_measurement(temperature, irradiance):
+    panel = create_standard_panel('generic')
+    mpc = create_mppt_controller('MPC', panel=panel, temperature=temperature)
+
+    for voltage in (5.0, 25.0, 31.0):
+        current = panel.get_current(voltage, temperature, irradiance)
+        assert mpc.estimate_irradiance(voltage, current) == pytest.approx(irradiance, rel=1e-4)
+
+
+def test_mpc_settles_one_update_after_a_cloud_edge():
+    sim = MPPTSimulator(create_standard_panel('generic'), 'MPC')
+    sim.run_simulation(duration=3.0, dt=0.01, weather='cloud_edges')
+
+    # Irradiance switches every 100 steps; the step measured at an edge
+    # still uses the duty cycle computed before it
+    efficiency = np.asarray(sim.efficiency_history)
+    edges = np.arange(100, len(efficiency), 100)
+    settled = np.setdiff1d(np.arange(1, len(efficiency)), edges)
+    assert efficiency[settled].min() > 99.5
+    assert efficiency.mean() > 99.5
+
+
+def test_mpc_holds_duty_cycle_in_the_dark():
+    mpc = create_mppt_controller('MPC', panel=create_standard_panel('generic'))
+    duty_cycle = mpc.update(30.0, 7.5)
+    assert mpc.update(0.0, 0.0) == duty_cycle
+    assert mpc.g_estimate < mpc.min_irradiance
+
+
+STATE_CASES = [('P&O', {}), ('InCond', {}), ('CV', {'v_ref': 30.0}), ('Fuzzy', {}),
+               ('GlobalScan', {'scan_period': 40}), ('VS-P&O', {}), ('VS-InCond', {}),
+               ('MPC', {'panel': create_standard_panel('generic')})]
+
+
+@pytest.mark.parametrize('algorithm, options', STATE_CASES)
+def test_state_json_round_trip_resumes_identically(algorithm, options):
+    panel = create_standard_panel('generic')
+    converter = BoostConverter()
+
+    def run(controller, steps):
+        duty_cycles = []
+        for k in steps:
+            irradiance = 800.0 + 200.0 * np.sin(0.05 * k)
+            voltage = converter.get_input_voltage(controller.duty_cycle, panel.V_oc)
+            current = panel.get_current(voltage, 25.0, irradiance)
+            if controller.uses_temperature:
+                controller.set_temperature(25.0)
+            duty_cycles.append(controller.update(voltage, current))
+        return duty_cycles
+
+    original = create_mppt_controller(algorithm, **options)
+    run(original, range(100))
+    snapshot = json.loads(json.dumps(original.get_state()))
+
+    restored = create_mppt_controller(algorithm, **options)
+    restored.set_state(snapshot)
+
+    assert run(restored, range(100, 200)) == run(original, range(100, 200))
+    with pytest.raises(ValueError, match='Cannot restore'):
+        create_mppt_controller('InCond' if algorithm != 'InCond' else 'P&O',
+                               step_size=0.01).set_state(snapshot)
+
+
+def test_bank_state_json_round_trip():
+    bank = create_mppt_controller_bank('InCond', 3, step_size=0.005)
+    voltage = np.array([28.0, 29.0, 31.0])
+    current = np.array([8.0, 7.9, 7.5])
+    bank.update(voltage, current)
+
+    restored = create_mppt_controller_bank('InCond', 3, step_size=0.005)
+    restored.set_state(json.loads(json.dumps(bank.get_state())))
+
+    assert np.array_equal(restored.update(voltage + 0.2, current),
+                          bank.update(voltage + 0.2, current))
+    with pytest.raises(ValueError, match='Cannot restore'):
+        create_mppt_controller_bank('InCond', 2).set_state(bank.get_state())
@@ -0,0 +1,218 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from mppt_controller import create_mppt_controller_bank
+from mppt_simulation import AveragedBoostConverter, BoostConverter, MPPTSimulator
+from solar_panel import ShadedSolarArray, SolarArray, SolarPanel, create_standard_panel
+from weather_profiles import sine_cloud_profile
+
+
+@pytest.mark.parametrize('array_type', [SolarArray, ShadedSolarArray])
+def test_simulation_runs_on_arrays(array_type):
+    simulator = MPPTSimulator(array_type(SolarPanel(), 2, 1), mppt_algorithm='InCond')
+    simulator.run_simulation(duration=0.5)
+
+    assert np.all(np.isfinite(simulator.power_history))
+    assert np.mean(simulator.power_history) > 0
+
+
+def test_array_forwards_warm_start_per_string():
+    panel = SolarPanel()
+    array = SolarArray(panel, 2, 3)
+    cold = array.get_current(60.0, 25.0, 1000.0)
+    iterations_cold = panel.last_iterations
+
+    warm = array.get_current(60.0, 25.0, 1000.0, initial_guess=cold)
+
+    assert warm == pytest.approx(cold, abs=1e-6)
+    assert panel.last_iterations < iterations_cold
+
+
+ALGORITHMS = ['P&O', 'InCond', 'CV', 'Fuzzy', 'GlobalScan', 'VS-P&O', 'VS-InCond', 'MPC']
+HISTORIES = {'voltage': 'voltage_history', 'current': 'current_history',
+             'power': 'power_history', 'duty_cycle': 'duty_cycle_history'}
+
+
+@pytest.mark.parametrize('converter_model', ['static', 'averaged'])
+@pytest.mark.parametrize('algorithm', ALGORITHMS)
+def test_trajectory_matches_step_path(algorithm, converter_model):
+    temperature, irradiance = sine_cloud_profile(201, 0.01)
+
+    stepped = MPPTSimulator(create_standard_panel('generic'), algorithm,
+                            converter_model=converter_model)
+    stepped.run_simulation(duration=2.0, dt=0.01, temperature=temperature,
+                           irradiance=irradiance)
+    trajectory = MPPTSimulator(create_standard_panel('generic'), algorithm,
+                               converter_model=converter_model)
+    result = trajectory.run_trajectory(temperature, irradiance, dt=0.01)
+
+    for field, history in HISTORIES.items():
+        assert np.array_equal(result[field], getattr(stepped, history))
+    # The step path reads its reference from the quantized cache
+    assert result['efficiency'] == pytest.approx(stepped.efficiency_history, abs=0.01)
+
+
+def test_bank_trajectory_matches_updates():
+    panel = create_standard_panel('generic')
+    converter = BoostConverter()
+    irradiance = np.array([[1000.0, 600.0, 250.0]]) * np.linspace(1.0, 0.8, 50)[:, None]
+
+    def plant(duty_cycle, temperature, irradiance):
+        voltage = converter.get_input_voltage(duty_cycle, panel.V_oc)
+        return voltage, panel.get_current_batch(voltage, temperature, irradiance)
+
+    bank = create_mppt_controller_bank('InCond', 3, step_size=0.005)
+    result = bank.run_trajectory(plant, 25.0, irradiance)
+
+    stepped = create_mppt_controller_bank('InCond', 3, step_size=0.005)
+    for k in range(len(irradiance)):
+        voltage, current = plant(stepped.duty_cycle.copy(), 25.0, irradiance[k])
+        assert np.array_equal(stepped.update(voltage, current), result['duty_cycle'][k])
+        assert np.array_equal(current, result['current'][k])
+
+
+def test_reference_cache_solves_each_condition_once():
+    sim = MPPTSimulator(create_standard_panel('generic'), 'InCond')
+    sim.run_simulation(duration=1.0, dt=0.01, temperature=25.0, irradiance=1000.0)
+
+    assert sim.reference_misses == 1
+    assert sim.reference_hits == 100
+    assert sim.efficiency_history.shape == (101,)
+
+    sim.clear_reference_cache()
+    assert (sim.reference_hits, sim.reference_misses) == (0, 0)
+
+
+def test_reference_cache_evicts_least_recently_used():
+    sim = MPPTSimulator(create_standard_panel('generic'), 'InCond', reference_cache_size=2)
+    for irradiance in (1000.0, 800.0, 1000.0, 600.0, 1000.0, 800.0):
+        sim.reference_power(25.0, irradiance)
+
+    # 800 W/m² was evicted by 600 W/m², 1000 W/m² stayed in use
+    assert sim.reference_misses == 4
+    assert sim.reference_hits == 2
+
+
+@pytest.mark.parametrize('quantum', [(0.01, 0.01), (1.0, 10.0)])
+def test_reference_quantization_error_bound(quantum):
+    panel = create_standard_panel('generic')
+    sim = MPPTSimulator(panel, 'InCond', reference_quantum=quantum)
+    q_T, q_G = quantum
+    rng = np.random.default_rng(1)
+
+    for temperature, irradiance in zip(rng.uniform(0, 60, 20), rng.uniform(100, 1200, 20)):
+        exact = panel.find_mpp(temperature, irradiance)[2]
+        dP_dT = (panel.find_mpp(temperature + 1.0, irradiance)[2] - exact) / 1.0
+        dP_dG = (panel.find_mpp(temperature, irradiance + 10.0)[2] - exact) / 10.0
+
+        # First-order error of solving at the nearest quantized condition
+        bound = 0.5 * (abs(dP_dT) * q_T + abs(dP_dG) * q_G)
+        assert abs(sim.reference_power(temperature, irradiance) - exact) <= 1.05 * bound + 1e-6
+
+
+def _run_python(code, **env):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return subprocess.run([sys.executable, '-c', code], cwd=root, check=True,
+                          capture_output=True, text=True,
+                          env=dict(os.environ, **env)).stdout
+
+
+def test_import_does_not_load_plotting_or_scipy():
+    loaded = _run_python(
+        "import sys, mppt_simulation, mppt_sweep, energy_yield, hil_runner\n"
+        "from solar_panel import create_standard_panel\n"
+        "create_standard_panel('generic').find_mpp()\n"
+        "print(sorted({m.split('.')[0] for m in sys.modules} & {'matplotlib', 'scipy'}))")
+    assert loaded.strip() == '[]'
+
+
+def test_headless_demo_writes_to_output_dir(tmp_path):
+    pytest.importorskip('matplotlib')
+    figures = _run_python(
+        "import matplotlib.pyplot as plt\n"
+        "from mppt_simulation import demo_pv_characteristics\n"
+        "demo_pv_characteristics()\n"
+        "print(plt.get_backend().lower(), len(plt.get_fignums()))",
+        MPPT_HEADLESS='1', MPPT_OUTPUT_DIR=str(tmp_path))
+
+    assert figures.split()[-2:] == ['agg', '0']
+    assert (tmp_path / 'pv_characteristics.png').exists()
+
+
+def _hold_duty_cycle(converter, panel, duty_cycle, steps=2000, dt=1e-3):
+    converter.reset(duty_cycle)
+    for _ in range(steps):
+        i_pv = panel.get_current(converter.v_pv, 25.0, 1000.0)
+        g_pv = panel.get_slope(converter.v_pv, i_pv, 25.0, 1000.0)
+        converter.step(duty_cycle, i_pv, g_pv, dt)
+    return panel.get_current(converter.v_pv, 25.0, 1000.0)
+
+
+@pytest.mark.parametrize('duty_cycle', [0.3, 0.45, 0.6])
+def test_averaged_converter_steady_state(duty_cycle):
+    panel = create_standard_panel('generic')
+    converter = AveragedBoostConverter(V_bat=48.0)
+    i_pv = _hold_duty_cycle(converter, panel, duty_cycle)
+
+    a = 1 - duty_cycle
+    assert converter.i_L == pytest.approx(i_pv, rel=1e-6)
+    assert converter.v_out == pytest.approx(converter.V_bat + converter.R_bat * a * i_pv,
+                                            rel=1e-6)
+    assert converter.v_pv == pytest.approx(a * converter.v_out + converter.R_L * i_pv,
+                                           rel=1e-6)
+
+    # Without losses the static relation V_pv = (1 - D) V_bat holds
+    ideal = AveragedBoostConverter(V_bat=48.0, R_L=1e-9, R_bat=1e-9)
+    _hold_duty_cycle(ideal, panel, duty_cycle)
+    assert ideal.v_pv == pytest.approx(a * 48.0, rel=1e-6)
+
+
+def test_averaged_converter_channels_match_scalar():
+    panel = create_standard_panel('generic')
+    duty_cycle = np.array([0.3, 0.45, 0.6])
+    bank = AveragedBoostConverter()
+    bank.reset(duty_cycle)
+    singles = [AveragedBoostConverter() for _ in duty_cycle]
+    for converter, d in zip(singles, duty_cycle):
+        converter.reset(d)
+
+    for _ in range(50):
+        i_pv = panel.get_current_batch(bank.v_pv, 25.0, 1000.0)
+        bank.step(duty_cycle, i_pv, panel.get_slope(bank.v_pv, i_pv), 0.01)
+        for converter, d in zip(singles, duty_cycle):
+            i = panel.get_current(converter.v_pv, 25.0, 1000.0)
+            converter.step(d, i, panel.get_slope(converter.v_pv, i), 0.01)
+
+    assert bank.v_pv == pytest.approx([c.v_pv for c in singles], rel=1e-9)
+
+
+@pytest.mark.parametrize('model', [SolarPanel(), SolarArray(SolarPanel(), 2, 1),
+                                   ShadedSolarArray(SolarPanel(), 2, 1)])
+def test_averaged_and_static_converters_settle_at_same_power(model):
+    # The battery must be above the MPP voltage for the boost converter
+    load_voltage = 48.0 * getattr(model, 'N_series', 1)
+    powers = []
+    for converter_model in ('static', 'averaged'):
+        sim = MPPTSimulator(model, 'InCond', converter_model=converter_model,
+                            load_voltage=load_voltage)
+        sim.run_simulation(duration=2.0, dt=0.01)
+        powers.append(np.mean(sim.power_history[-50:]))
+
+    assert powers[1] == pytest.approx(powers[0], rel=0.005)
+    assert powers[1] > 0.995 * sim.reference_power(25.0, 1000.0)
+
+
+def test_array_slope_matches_finite_difference():
+    irradiance = np.array([[1000.0, 1000.0, 250.0], [1000.0, 600.0, 600.0]])
+    for model, G in ((SolarArray(SolarPanel(), 3, 2), 800.0),
+                     (ShadedSolarArray(SolarPanel(), 3, 2), irradiance)):
+        for voltage in (10.0, 70.0, 95.0):
+            current = model.get_current(voltage, 25.0, G)
+            finite_difference = (model.get_current(voltage + 1e-4, 25.0, G) -
+                                 model.get_current(voltage - 1e-4, 25.0, G)) / 2e-4
+            assert model.get_slope(voltage, current, 25.0, G) == pytest.approx(
+                finite_difference, rel=1e-4)
@@ -0,0 +1,32 @@
+import pytest
+
+from mppt_sweep import build_cases, run_case, run_sweep
+
+
+def _case(dt, converter_model='averaged'):
+    # Same number of steps and constant weather, so only dt differs
+    case, = build_cases(['InCond'], [0.005], ['generic'], ['constant'],
+                        duration=500 * dt, dt=dt, converter_model=converter_model)
+    return case
+
+
+def test_case_dt_reaches_simulation():
+    fast = run_case(_case(0.001))
+    slow = run_case(_case(0.004))
+
+    assert fast['mean_power'] != pytest.approx(slow['mean_power'], rel=1e-6)
+    assert fast['energy'] == pytest.approx(fast['mean_power'] * 501 * 0.001)
+
+
+def test_static_converter_does_not_depend_on_dt():
+    fast = run_case(_case(0.001, 'static'))
+    slow = run_case(_case(0.004, 'static'))
+    assert fast['mean_power'] == pytest.approx(slow['mean_power'])
+
+
+def test_serial_sweep_summary():
+    summary = run_sweep(['InCond', 'MPC'], [0.005, 0.01], ['generic'], ['constant'],
+                        duration=1.0, max_workers=1)
+
+    assert list(summary['algorithm']) == ['InCond', 'InCond', 'MPC']
+    assert summary['mean_efficiency'].min() > 95.0
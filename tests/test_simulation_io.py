@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+
+from mppt_simulation import HISTORY_FIELDS, MPPTSimulator
+from simulation_io import RingBuffer, allocate_arrays, flush_arrays, open_series
+from solar_panel import create_standard_panel
+
+
+def test_open_series_memory_maps_files(tmp_path):
+    values = np.linspace(0.0, 1.0, 11)
+    np.save(tmp_path / 'series.npy', values)
+    values.tofile(tmp_path / 'series.bin')
+
+    npy = open_series(str(tmp_path / 'series.npy'))
+    raw = open_series(tmp_path / 'series.bin')
+
+    assert isinstance(npy, np.memmap) and isinstance(raw, np.memmap)
+    assert np.array_equal(npy, values) and np.array_equal(raw, values)
+    assert open_series(25.0) == 25.0
+    assert np.array_equal(open_series([1.0, 2.0]), [1.0, 2.0])
+
+
+def test_allocate_arrays_round_trip(tmp_path):
+    arrays = allocate_arrays(('a', 'b'), 5, str(tmp_path))
+    arrays['a'][:] = np.arange(5)
+    arrays['b'][:] = -np.arange(5)
+    flush_arrays(arrays)
+
+    assert np.array_equal(np.load(tmp_path / 'a.npy', mmap_mode='r'), np.arange(5))
+    assert np.array_equal(np.load(tmp_path / 'b.npy'), -np.arange(5))
+    assert allocate_arrays(('a',), 3)['a'].shape == (3,)
+
+
+def test_run_simulation_from_and_to_files(tmp_path):
+    n_steps = 101
+    t = np.arange(n_steps) * 0.01
+    temperature = 25.0 + 5.0 * np.sin(t)
+    irradiance = 800.0 + 200.0 * np.cos(3.0 * t)
+    np.save(tmp_path / 'temperature.npy', temperature)
+    irradiance.tofile(tmp_path / 'irradiance.bin')
+
+    in_memory = MPPTSimulator(create_standard_panel('generic'), 'InCond')
+    in_memory.run_simulation(duration=1.0, dt=0.01, temperature=temperature,
+                             irradiance=irradiance)
+
+    on_disk = MPPTSimulator(create_standard_panel('generic'), 'InCond')
+    on_disk.run_simulation(duration=1.0, dt=0.01,
+                           temperature=str(tmp_path / 'temperature.npy'),
+                           irradiance=str(tmp_path / 'irradiance.bin'),
+                           output_dir=str(tmp_path / 'out'))
+
+    assert isinstance(on_disk.power_history, np.memmap)
+    for field, history in zip(HISTORY_FIELDS, ('time', 'voltage_history', 'current_history',
+                                               'power_history', 'duty_cycle_history',
+                                               'efficiency_history')):
+        saved = np.load(tmp_path / 'out' / f'{field}.npy')
+        assert np.array_equal(saved, getattr(in_memory, history))
+
+
+def test_series_shorter_than_simulation():
+    sim = MPPTSimulator(create_standard_panel('generic'), 'InCond')
+    with pytest.raises(ValueError, match='samples'):
+        sim.run_simulation(duration=1.0, dt=0.01, irradiance=np.full(50, 1000.0))
+
+
+def test_ring_buffer_wraps_around():
+    buffer = RingBuffer(('x', 'y'), capacity=4)
+    for k in range(6):
+        buffer.append({'x': k, 'y': -k, 'ignored': 0})
+
+    assert len(buffer) == 4 and buffer.total == 6
+    assert np.array_equal(buffer.arrays()['x'], [2, 3, 4, 5])
+
+    buffer.extend({'x': np.arange(10, 13), 'y': np.zeros(3)})
+    assert np.array_equal(buffer.arrays()['x'], [5, 10, 11, 12])
+
+    # A block longer than the capacity keeps only its tail
+    buffer.extend({'x': np.arange(20, 29), 'y': np.zeros(9)})
+    assert np.array_equal(buffer.arrays()['x'], [25, 26, 27, 28])
+
+    buffer.clear()
+    buffer.extend({'x': np.arange(2), 'y': np.zeros(2)})
+    assert np.array_equal(buffer.arrays()['x'], [0, 1])
+    with pytest.raises(ValueError):
+        RingBuffer(('x',), capacity=0)
+
+
+def _histories(sim):
+    return {'time': sim.time, 'voltage': sim.voltage_history,
+            'current': sim.current_history, 'power': sim.power_history,
+            'duty_cycle': sim.duty_cycle_history, 'efficiency': sim.efficiency_history}
+
+
+@pytest.mark.parametrize('block_size', [None, 1, 17, 1000])
+def test_iter_simulation_matches_run_simulation(block_size):
+    reference = MPPTSimulator(create_standard_panel('generic'), 'InCond')
+    reference.run_simulation(duration=2.0, dt=0.01, variable_conditions=True)
+    expected = _histories(reference)
+
+    sim = MPPTSimulator(create_standard_panel('generic'), 'InCond')
+    results = list(sim.iter_simulation(duration=2.0, dt=0.01, variable_conditions=True,
+                                       block_size=block_size, history_length=50))
+
+    for field in HISTORY_FIELDS:
+        if block_size is None:
+            streamed = np.array([record[field] for record in results])
+        else:
+            streamed = np.concatenate([block[field] for block in results])
+        assert np.array_equal(streamed, expected[field])
+        assert np.array_equal(sim.history.arrays()[field], expected[field][-50:])
+    assert sim.history.total == len(expected['time'])
@@ -0,0 +1,220 @@
+import numpy as np
+import pytest
+
+from solar_panel import (MPPSurface, ShadedSolarArray, SolarArray, SolarFleet,
+                         SolarPanel, create_standard_panel)
+
+
+SCAN_POINTS = 200   # Evaluations of the original find_mpp P-V scan
+
+
+@pytest.mark.parametrize('panel_type', ['generic', 'sunpower_e20'])
+@pytest.mark.parametrize('temperature', [-20.0, 25.0, 80.0])
+@pytest.mark.parametrize('irradiance', [1.0, 200.0, 1000.0, 1400.0])
+def test_find_mpp_matches_dense_scan(panel_type, temperature, irradiance):
+    panel = create_standard_panel(panel_type)
+    v_mpp, i_mpp, p_mpp = panel.find_mpp(temperature, irradiance)
+
+    voltages = np.linspace(0, panel.V_oc * 1.1, 20001)
+    p_scan = np.max(voltages * panel.get_current_batch(voltages, temperature, irradiance))
+
+    assert p_mpp >= p_scan * (1 - 1e-7)
+    assert p_mpp == pytest.approx(v_mpp * i_mpp)
+    assert i_mpp == pytest.approx(panel.get_current(v_mpp, temperature, irradiance), abs=1e-6)
+
+
+def test_find_mpp_uses_fewer_evaluations_than_scan():
+    panel = create_standard_panel('generic')
+    for temperature in np.linspace(-20.0, 80.0, 11):
+        for irradiance in (0.5, 10.0, 100.0, 500.0, 1000.0, 1400.0):
+            panel.find_mpp(temperature, irradiance)
+            assert 0 < panel.last_mpp_evaluations <= 10 < SCAN_POINTS
+
+
+def test_find_mpp_without_light():
+    panel = create_standard_panel('generic')
+    assert panel.find_mpp(25.0, 0.0) == (0.0, 0.0, 0.0)
+
+
+def _shaded_array(**kwargs):
+    return ShadedSolarArray(create_standard_panel('generic'), N_series=3, N_parallel=2, **kwargs)
+
+
+def test_shaded_find_mpp_batch_matches_find_mpp():
+    array = _shaded_array()
+    G = np.full((2, 3), 1000.0)
+    G[:, 0] = 300.0
+    patterns = np.stack([G, 0.5 * G, np.full((2, 3), 800.0)])
+
+    v_mpp, i_mpp, p_mpp = array.find_mpp_batch(25.0, patterns)
+
+    assert p_mpp.shape == (3,)
+    for k in range(3):
+        assert p_mpp[k] == pytest.approx(array.find_mpp(25.0, patterns[k])[2])
+
+    # Shading must not be averaged away into the uniformly lit array's MPP
+    p_uniform = SolarArray(array.panel, 3, 2).find_mpp(25.0, 1000.0)[2]
+    assert p_mpp[0] < 0.9 * p_uniform
+
+
+def test_shaded_find_mpp_batch_rejects_conditions_without_module_axes():
+    with pytest.raises(ValueError):
+        _shaded_array().find_mpp_batch(np.full(5, 25.0), np.full(5, 1000.0))
+
+
+def test_shaded_parameter_key_includes_bypass_diodes():
+    keys = {_shaded_array().parameter_key(),
+            _shaded_array(bypass_diodes=False).parameter_key(),
+            _shaded_array(V_bypass=0.7).parameter_key()}
+    assert len(keys) == 3
+
+
+@pytest.mark.parametrize('panel_type', ['generic', 'sunpower_e20'])
+def test_mpp_surface_low_irradiance_accuracy(panel_type):
+    panel = create_standard_panel(panel_type)
+    surface = MPPSurface(panel)
+
+    T, G = np.meshgrid(np.linspace(-17.5, 77.5, 20), np.geomspace(0.05, 150.0, 60))
+    v_true, i_true, p_true = panel.find_mpp_batch(T, G)
+    v_mpp, i_mpp, p_mpp = surface.query(T, G)
+
+    assert np.max(np.abs(p_mpp / p_true - 1)) < 0.01
+    assert np.max(np.abs(v_mpp / v_true - 1)) < 0.02
+
+    # Scalar path agrees with the array path
+    assert surface.query(10.0, 3.0)[2] == pytest.approx(panel.find_mpp(10.0, 3.0)[2], rel=0.01)
+    assert surface.query(12.3, 0.2) == pytest.approx(
+        tuple(x[0] for x in surface.query(np.array([12.3]), np.array([0.2]))))
+
+
+def test_mpp_surface_without_light():
+    surface = MPPSurface(create_standard_panel('generic'))
+    assert surface.query(25.0, 0.0) == (0.0, 0.0, 0.0)
+    with pytest.raises(ValueError):
+        MPPSurface(create_standard_panel('generic'), irradiances=np.array([0.0, 500.0, 1000.0]))
+
+
+def test_operating_condition_cache_hits_and_eviction():
+    panel = SolarPanel(condition_cache_size=2)
+
+    first = panel.operating_condition(25, 1000)
+    assert panel.operating_condition(25.0, 1000.0) is first
+    assert panel.operating_condition(np.float64(25), np.array(1000.0)) is first
+
+    panel.operating_condition(30.0, 1000.0)
+    panel.operating_condition(25.0, 1000.0)      # refresh, 30 °C is now oldest
+    panel.operating_condition(35.0, 1000.0)
+
+    assert list(panel._condition_cache) == [(25.0, 1000.0), (35.0, 1000.0)]
+    assert panel.operating_condition(25.0, 1000.0) is first
+
+
+def test_get_current_accepts_0d_array_conditions():
+    panel = SolarPanel()
+    expected = panel.get_current(30.0, 25.0, 1000.0)
+    assert panel.get_current(30.0, np.array(25.0), np.array(1000.0)) == expected
+
+
+@pytest.mark.parametrize('temperature', [-40.0, -30.0, 90.0, 100.0])
+def test_mpp_surface_extrapolates_temperature(temperature):
+    panel = create_standard_panel('generic')
+    surface = MPPSurface(panel)
+
+    for irradiance in (20.0, 200.0, 1000.0):
+        _, _, p_true = panel.find_mpp(temperature, irradiance)
+        _, _, p_scalar = surface.query(temperature, irradiance)
+        _, _, p_array = surface.query(np.array([temperature]), np.array([irradiance]))
+
+        assert p_scalar == pytest.approx(p_true, rel=0.01)
+        assert p_array[0] == pytest.approx(p_scalar, rel=1e-12)
+
+
+def test_get_current_batch_matches_scalar():
+    panel = create_standard_panel('generic')
+    voltage = np.linspace(0.0, 1.1 * panel.V_oc, 23)[:, None, None]
+    temperature = np.array([-10.0, 25.0, 60.0])[None, :, None]
+    irradiance = np.array([50.0, 400.0, 1000.0, 1300.0])[None, None, :]
+
+    batch, iterations = panel.get_current_batch(voltage, temperature, irradiance,
+                                                return_iterations=True)
+
+    assert batch.shape == iterations.shape == (23, 3, 4)
+    for idx in np.ndindex(batch.shape):
+        v, T, G = voltage[idx[0], 0, 0], temperature[0, idx[1], 0], irradiance[0, 0, idx[2]]
+        assert batch[idx] == pytest.approx(panel.get_current(v, T, G), abs=1e-6)
+
+
+def test_array_get_current_batch_matches_scalar():
+    array = SolarArray(create_standard_panel('generic'), N_series=3, N_parallel=2)
+    voltage = np.linspace(0.0, array.V_oc, 15)
+
+    batch = array.get_current_batch(voltage, 40.0, 800.0)
+
+    assert batch.shape == voltage.shape
+    assert batch == pytest.approx([array.get_current(v, 40.0, 800.0) for v in voltage],
+                                  abs=1e-6)
+
+
+def test_lambertw_solver_matches_newton():
+    newton = create_standard_panel('generic')
+    lambertw = create_standard_panel('generic', solver='lambertw')
+    voltage = np.linspace(0.0, 1.1 * newton.V_oc, 40)[:, None]
+    irradiance = np.array([20.0, 200.0, 1000.0])
+
+    expected = newton.get_current_batch(voltage, 25.0, irradiance)
+    assert lambertw.get_current_batch(voltage, 25.0, irradiance) == pytest.approx(expected,
+                                                                                  abs=1e-6)
+    for v in voltage[:, 0]:
+        assert lambertw.get_current(v, 45.0, 700.0) == pytest.approx(
+            newton.get_current(v, 45.0, 700.0), abs=1e-6)
+    assert lambertw.last_iterations == 0
+
+
+def test_lambertw_voltage_inverts_current():
+    panel = create_standard_panel('generic', solver='lambertw')
+    voltage = np.linspace(1.0, 0.95 * panel.V_oc, 20)
+    current = panel.get_current_batch(voltage, 25.0, 800.0)
+    assert panel.get_voltage_batch(current, 25.0, 800.0) == pytest.approx(voltage, abs=1e-6)
+
+
+def test_unknown_solver():
+    with pytest.raises(ValueError, match="Unknown solver"):
+        SolarPanel(solver='bisection')
+
+
+def _mixed_panels():
+    return [create_standard_panel(name)
+            for name in ('generic', 'canadian_solar_cs6k', 'sunpower_e20', 'generic')]
+
+
+def test_fleet_matches_per_panel_results():
+    panels = _mixed_panels()
+    fleet = SolarFleet.from_panels(panels)
+    voltage = np.array([10.0, 30.0, 55.0, 36.0])
+    temperature = np.array([25.0, 40.0, 10.0, 60.0])
+    irradiance = np.array([1000.0, 600.0, 200.0, 900.0])
+
+    current = fleet.get_current(voltage, temperature, irradiance)
+    v_mpp, i_mpp, p_mpp = fleet.find_mpp(temperature, irradiance)
+
+    assert len(fleet) == 4
+    for k, panel in enumerate(panels):
+        assert current[k] == pytest.approx(
+            panel.get_current(voltage[k], temperature[k], irradiance[k]), abs=1e-6)
+        assert p_mpp[k] == pytest.approx(panel.find_mpp(temperature[k], irradiance[k])[2],
+                                         rel=1e-6)
+        assert v_mpp[k] * i_mpp[k] == pytest.approx(p_mpp[k], rel=1e-6)
+
+
+def test_fleet_broadcasts_points_per_module_and_subsets():
+    panels = _mixed_panels()
+    fleet = SolarFleet.from_panels(panels)
+    voltage = np.linspace(0.0, 40.0, 5)[:, None]
+
+    current = fleet.get_current(voltage, 25.0, 800.0)
+
+    assert current.shape == (5, 4)
+    assert fleet[1:3].get_current(voltage, 25.0, 800.0) == pytest.approx(current[:, 1:3])
+    assert fleet[2].get_current(voltage, 25.0, 800.0)[:, 0] == pytest.approx(current[:, 2])
+    assert SolarFleet.from_panel(panels[0], 4).get_current(voltage, 25.0, 800.0) == \
+        pytest.approx(np.repeat(current[:, :1], 4, axis=1))
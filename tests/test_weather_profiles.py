@@ -0,0 +1,111 @@
+import math
+
+import numpy as np
+import pytest
+
+from mppt_simulation import MPPTSimulator
+from solar_panel import create_standard_panel
+from weather_profiles import (BUILTIN_PROFILES, WeatherProfile, profile_arrays,
+                              sample_function)
+
+
+def _write_csv(path, rows, header='time,temperature,irradiance'):
+    path.write_text(header + '\n' + '\n'.join(','.join(map(str, row)) for row in rows) + '\n')
+    return str(path)
+
+
+def test_csv_loading_and_resampling(tmp_path):
+    path = _write_csv(tmp_path / 'day.csv', [(0, 20.0, 100.0), (1, 30.0, 300.0),
+                                            (3, 30.0, 700.0)])
+    profile = WeatherProfile.load(path, time_scale=60.0)
+
+    assert profile.name == 'day.csv'
+    assert profile.duration == 180.0
+
+    T, G = profile.resample(30.0)
+    assert np.allclose(T, [20.0, 25.0, 30.0, 30.0, 30.0, 30.0, 30.0])
+    assert np.allclose(G, [100.0, 200.0, 300.0, 400.0, 500.0, 600.0, 700.0])
+    assert profile.resample(30.0) is profile._resampled[(30.0, 7)]
+
+    with pytest.raises(ValueError, match='covers'):
+        profile.resample(30.0, n_steps=8)
+
+
+def test_csv_without_temperature_column(tmp_path):
+    path = _write_csv(tmp_path / 'g.csv', [(0, 500.0), (10, 900.0)], header='t,ghi')
+
+    profile = WeatherProfile.from_csv(path, time_column='t', irradiance_column='ghi',
+                                      temperature_column=None, temperature=35.0)
+    T, G = profile.resample(5.0)
+    assert np.allclose(T, 35.0) and np.allclose(G, [500.0, 700.0, 900.0])
+
+    with pytest.raises(ValueError, match='Unknown column'):
+        WeatherProfile.from_csv(path, time_column='t')
+
+
+@pytest.mark.parametrize('layout', ['npz', 'structured', 'columns'])
+def test_numpy_layouts(tmp_path, layout):
+    time = np.array([0.0, 1.0, 2.0])
+    temperature = np.array([20.0, 22.0, 24.0])
+    irradiance = np.array([100.0, 500.0, 900.0])
+
+    if layout == 'npz':
+        path = tmp_path / 'w.npz'
+        np.savez(path, time=time, temperature=temperature, irradiance=irradiance)
+    elif layout == 'structured':
+        path = tmp_path / 'w.npy'
+        data = np.zeros(3, dtype=[('time', float), ('temperature', float),
+                                  ('irradiance', float)])
+        data['time'], data['temperature'], data['irradiance'] = time, temperature, irradiance
+        np.save(path, data)
+    else:
+        path = tmp_path / 'w.npy'
+        np.save(path, np.column_stack([time, temperature, irradiance]))
+
+    T, G = WeatherProfile.load(str(path)).resample(0.5)
+    assert np.allclose(T, np.interp(np.arange(5) * 0.5, time, temperature))
+    assert np.allclose(G, np.interp(np.arange(5) * 0.5, time, irradiance))
+
+
+def test_profile_validation():
+    with pytest.raises(ValueError, match='strictly increasing'):
+        WeatherProfile([0.0, 2.0, 1.0], 25.0, [1.0, 2.0, 3.0])
+    with pytest.raises(ValueError, match='equal length'):
+        WeatherProfile([0.0, 1.0], 25.0, [1.0, 2.0, 3.0])
+    with pytest.raises(ValueError, match='Unknown weather file format'):
+        WeatherProfile.load('weather.xlsx')
+
+
+def test_profile_arrays_sources(tmp_path):
+    for name in BUILTIN_PROFILES:
+        T, G = profile_arrays(name, 50, 0.1)
+        assert T.shape == G.shape == (50,)
+
+    path = _write_csv(tmp_path / 'w.csv', [(0, 25.0, 1000.0), (10, 25.0, 500.0)])
+    assert np.allclose(profile_arrays(path, 3, 5.0)[1], [1000.0, 750.0, 500.0])
+
+    with pytest.raises(ValueError, match='Unknown weather profile'):
+        profile_arrays('monsoon', 10, 0.1)
+
+
+def test_sample_function_vectorized_and_scalar():
+    assert np.allclose(sample_function(lambda t: 2 * t, 4, 0.5), [0.0, 1.0, 2.0, 3.0])
+    assert np.allclose(sample_function(lambda t: 7.0, 3, 1.0), 7.0)
+
+    def step(t):
+        return 1000.0 if t < 1.0 else 200.0
+
+    assert np.allclose(sample_function(step, 4, 0.5), [1000.0, 1000.0, 200.0, 200.0])
+    assert np.allclose(sample_function(lambda t: math.exp(-t), 3, 1.0), np.exp(-np.arange(3)))
+
+
+def test_simulation_with_weather_profile_matches_arrays():
+    profile = WeatherProfile([0.0, 1.0, 2.0], [25.0, 30.0, 28.0], [1000.0, 400.0, 800.0])
+    T, G = profile.resample(0.01)
+
+    from_profile = MPPTSimulator(create_standard_panel('generic'), 'InCond')
+    from_profile.run_simulation(duration=2.0, dt=0.01, weather=profile)
+    from_arrays = MPPTSimulator(create_standard_panel('generic'), 'InCond')
+    from_arrays.run_simulation(duration=2.0, dt=0.01, temperature=T, irradiance=G)
+
+    assert np.array_equal(from_profile.power_history, from_arrays.power_history)
@@ -0,0 +1,295 @@
+"""
+Weather Profile Library
+
+This module provides temperature and irradiance profiles as per-step
+arrays for the simulators:
+- Measured series loaded from CSV, NPY or NPZ files
+- One-time vectorized resampling to the simulation time step
+- Built-in synthetic profiles (constant, sine cloud, cloud edges)
+
+Author: Weather Profiles
+Date: 2026-10-18
+"""
+
+import os
+import numpy as np
+from typing import Optional, Tuple
+
+
+def constant_profile(n_steps: int, dt: float, temperature: float = 25.0,
+                     irradiance: float = 1000.0) -> Tuple[np.ndarray, np.ndarray]:
+    """Constant conditions, per-step temperature (°C) and irradiance (W/m²)"""
+    return np.full(n_steps, temperature), np.full(n_steps, irradiance)
+
+
+def sine_cloud_profile(n_steps: int, dt: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Slow sinusoidal irradiance (5 s period) and temperature (20 s period)"""
+    t = np.arange(n_steps) * dt
+    G = 1000.0 * (0.7 + 0.3 * np.sin(2 * np.pi * t / 5.0))
+    T = 25.0 + 10.0 * np.sin(2 * np.pi * t / 20.0)
+    return T, G
+
+
+def cloud_edge_profile(n_steps: int, dt: float, period: float = 1.0,
+                       high: float = 1000.0, low: float = 300.0) -> Tuple[np.ndarray, np.ndarray]:
+    """Irradiance switching between ``high`` and ``low`` every ``period`` seconds"""
+    t = np.arange(n_steps) * dt
+    G = np.where(np.floor(t / period + 1e-9) % 2 == 0, high, low)
+    return np.full(n_steps, 25.0), G
+
+
+BUILTIN_PROFILES = {
+    'constant': constant_profile,
+    'sine_cloud': sine_cloud_profile,
+    'cloud_edges': cloud_edge_profile,
+}
+
+
+class WeatherProfile:
+    """
+    Measured temperature and irradiance series on their own time base
+
+    The samples may be irregular; ``resample`` interpolates them linearly
+    onto a fixed simulation step in one vectorized pass.
+    """
+
+    def __init__(self, time, temperature, irradiance, name: Optional[str] = None):
+        """
+        Initialize Weather Profile
+
+        Parameters:
+        -----------
+        time : array_like
+            Increasing sample times (s)
+        temperature : array_like or float
+            Cell temperature per sample (°C), or a constant
+        irradiance : array_like
+            Solar irradiance per sample (W/m²)
+        name : str, optional
+            Profile name, e.g. the source file
+        """
+        self.time = np.asarray(time, dtype=float)
+        self.irradiance = np.asarray(irradiance, dtype=float)
+        self.temperature = np.broadcast_to(np.asarray(temperature, dtype=float),
+                                           self.time.shape)
+        self.name = name
+
+        if self.time.ndim != 1 or self.irradiance.shape != self.time.shape:
+            raise ValueError("time and irradiance must be 1-D arrays of equal length")
+        if len(self.time) > 1 and np.any(np.diff(self.time) <= 0):
+            raise ValueError("time must be strictly increasing")
+
+        self._resampled = {}
+
+    @property
+    def duration(self) -> float:
+        """Time covered by the samples (s)"""
+        return float(self.time[-1] - self.time[0])
+
+    @classmethod
+    def from_csv(cls, path: str, time_column: str = 'time',
+                 temperature_column: Optional[str] = 'temperature',
+                 irradiance_column: str = 'irradiance', time_scale: float = 1.0,
+                 temperature: float = 25.0, delimiter: str = ',') -> 'WeatherProfile':
+        """
+        Load a profile from a CSV file with a header row
+
+        Parameters:
+        -----------
+        path : str
+            CSV file path
+        time_column : str
+            Column of numeric sample times
+        temperature_column : str, optional
+            Column of cell temperatures (°C); None to use ``temperature``
+        irradiance_column : str
+            Column of irradiances (W/m²)
+        time_scale : float
+            Seconds per time unit, e.g. 60 for times in minutes
+        temperature : float
+            Constant temperature (°C) if there is no temperature column
+        delimiter : str
+            Field delimiter
+
+        Returns:
+        --------
+        WeatherProfile
+            Loaded profile
+        """
+        data = np.genfromtxt(path, delimiter=delimiter, names=True, dtype=float,
+                             encoding='utf-8')
+        data = np.atleast_1d(data)
+        columns = data.dtype.names
+
+        for column in (time_column, irradiance_column, temperature_column):
+            if column is not None and column not in columns:
+                raise ValueError(f"Unknown column: {column}. Available: {list(columns)}")
+
+        if temperature_column is not None:
+            temperature = data[temperature_column]
+
+        return cls(data[time_column] * time_scale, temperature, data[irradiance_column],
+                   name=os.path.basename(path))
+
+    @classmethod
+    def from_npy(cls, path: str, time_scale: float = 1.0,
+                 temperature: float = 25.0) -> 'WeatherProfile':
+        """
+        Load a profile from a NumPy file
+
+        Accepted layouts are an .npz archive or a structured .npy array with
+        ``time``, ``irradiance`` and optionally ``temperature`` fields, or a
+        plain .npy array with columns (time, temperature, irradiance) or
+        (time, irradiance).
+
+        Parameters:
+        -----------
+        path : str
+            .npy or .npz file path
+        time_scale : float
+            Seconds per time unit
+        temperature : float
+            Constant temperature (°C) if the file has none
+
+        Returns:
+        --------
+        WeatherProfile
+            Loaded profile
+        """
+        data = np.load(path)
+        name = os.path.basename(path)
+
+        if isinstance(data, np.lib.npyio.NpzFile):
+            with data:
+                fields = {key: data[key] for key in data.files}
+        elif data.dtype.names is not None:
+            fields = {key: data[key] for key in data.dtype.names}
+        elif data.ndim == 2 and data.shape[1] in (2, 3):
+            fields = {'time': data[:, 0], 'irradiance': data[:, -1]}
+            if data.shape[1] == 3:
+                fields['temperature'] = data[:, 1]
+        else:
+            raise ValueError("Expected fields time/irradiance[/temperature] or an "
+                             "array with 2 or 3 columns")
+
+        return cls(np.asarray(fields['time']) * time_scale,
+                   fields.get('temperature', temperature), fields['irradiance'], name=name)
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> 'WeatherProfile':
+        """
+        Load a profile, choosing the reader by file extension
+
+        Parameters:
+        -----------
+        path : str
+            .csv, .npy or .npz file path
+        **kwargs
+            Additional parameters for ``from_csv`` or ``from_npy``
+
+        Returns:
+        --------
+        WeatherProfile
+            Loaded profile
+        """
+        extension = os.path.splitext(path)[1].lower()
+        if extension == '.csv':
+            return cls.from_csv(path, **kwargs)
+        if extension in ('.npy', '.npz'):
+            return cls.from_npy(path, **kwargs)
+        raise ValueError(f"Unknown weather file format: {extension}. "
+                         f"Available: ['.csv', '.npy', '.npz']")
+
+    def resample(self, dt: float, n_steps: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Temperature and irradiance at every simulation step
+
+        Linear interpolation of all steps at once; the result is cached per
+        (dt, n_steps), so repeated runs do not resample again.
+
+        Parameters:
+        -----------
+        dt : float
+            Simulation time step (s)
+        n_steps : int, optional
+            Number of steps, default as many as the profile covers
+
+        Returns:
+        --------
+        Tuple[np.ndarray, np.ndarray]
+            Temperature (°C) and irradiance (W/m²) per step
+        """
+        covered = int(np.floor(self.duration / dt + 1e-9)) + 1
+        if n_steps is None:
+            n_steps = covered
+        elif n_steps > covered:
+            raise ValueError(f"Weather profile covers {self.duration:g} s, "
+                             f"simulation needs {(n_steps - 1) * dt:g} s")
+
+        key = (dt, n_steps)
+        if key not in self._resampled:
+            t = self.time[0] + np.arange(n_steps) * dt
+            self._resampled[key] = (np.interp(t, self.time, self.temperature),
+                                    np.interp(t, self.time, self.irradiance))
+        return self._resampled[key]
+
+
+def sample_function(func, n_steps: int, dt: float) -> np.ndarray:
+    """
+    Values of a function of time at every simulation step
+
+    The function is first called once with the whole time array; functions
+    that only accept scalars (e.g. using ``math`` or ``if``) are evaluated
+    point by point instead, still before the simulation starts.
+
+    Parameters:
+    -----------
+    func : callable
+        Function of time (s)
+    n_steps : int
+        Number of simulation steps
+    dt : float
+        Simulation time step (s)
+
+    Returns:
+    --------
+    np.ndarray
+        Function value per step
+    """
+    t = np.arange(n_steps) * dt
+    try:
+        values = np.asarray(func(t), dtype=float)
+        if values.shape in ((), t.shape):
+            return np.broadcast_to(values, t.shape)
+    except (TypeError, ValueError):
+        pass
+    return np.array([func(tk) for tk in t.tolist()], dtype=float)
+
+
+def profile_arrays(profile, n_steps: int, dt: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-step arrays of a built-in, loaded or file profile
+
+    Parameters:
+    -----------
+    profile : str or WeatherProfile
+        Name in ``BUILTIN_PROFILES``, a .csv/.npy/.npz file path or a
+        WeatherProfile
+    n_steps : int
+        Number of simulation steps
+    dt : float
+        Simulation time step (s)
+
+    Returns:
+    --------
+    Tuple[np.ndarray, np.ndarray]
+        Temperature (°C) and irradiance (W/m²) per step
+    """
+    if isinstance(profile, WeatherProfile):
+        return profile.resample(dt, n_steps)
+    if profile in BUILTIN_PROFILES:
+        return BUILTIN_PROFILES[profile](n_steps, dt)
+    if os.path.exists(profile):
+        return WeatherProfile.load(profile).resample(dt, n_steps)
+    raise ValueError(f"Unknown weather profile: {profile}. "
+                     f"Available: {list(BUILTIN_PROFILES.keys())} or a .csv/.npy/.npz file")